@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Round-trip benchmark for the bulk fetch helper (batchGetRelatedDocuments).
+
+Counts the MongoDB commands issued by the previous per-attempt lookup loops
+and by their bulk-join replacements for:
+- update_interview_scores
+- get_user_feedback_history
+- the paginated attempts route in sessions.py
+
+Requires a reachable MongoDB in CONNECTION_STRING_DB. Everything is written
+to a throwaway database which is dropped at the end.
+"""
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+from datetime import timezone, datetime, timedelta
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from decouple import config
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+
+from crud.interviews.attempts import (
+    get_attempt_feedback, get_user_feedback_history,
+    get_interview_attempts, get_interview_attempts_paginated, get_attempts_feedback
+)
+from crud.interviews.interviews import get_interview, update_interview, update_interview_scores
+
+CONNECTION_STRING_DB = config("CONNECTION_STRING_DB", cast=str)
+BENCHMARK_DB_NAME = "benchmark_bulk_fetch"
+USER_ID = "benchmark-user"
+INTERVIEW_ID = "interview-0"
+ATTEMPT_COUNTS = [10, 50, 200]
+PAGE_SIZE = 10
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Counts commands sent to the server"""
+
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        if event.command_name not in ("endSessions", "hello", "isMaster", "ping"):
+            self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+async def seed(db, total_attempts: int):
+    """Seed one interview with attempts and feedback for the benchmark user"""
+    await db.interviews.delete_many({})
+    await db.interview_attempts.delete_many({})
+    await db.interview_feedback.delete_many({})
+
+    now = datetime.now(timezone.utc)
+    await db.interviews.insert_one({
+        "_id": INTERVIEW_ID,
+        "user_id": USER_ID,
+        "interview_type": "General Interview",
+        "company": "Benchmark Co",
+        "role_title": "Engineer",
+        "created_at": now,
+        "updated_at": now
+    })
+    await db.interview_attempts.insert_many([
+        {
+            "_id": f"attempt-{i}",
+            "interview_id": INTERVIEW_ID,
+            "user_id": USER_ID,
+            "status": "graded",
+            "started_at": now - timedelta(minutes=i),
+            "created_at": now - timedelta(minutes=i),
+            "updated_at": now
+        }
+        for i in range(total_attempts)
+    ])
+    await db.interview_feedback.insert_many([
+        {
+            "_id": f"feedback-{i}",
+            "attempt_id": f"attempt-{i}",
+            "interview_id": INTERVIEW_ID,
+            "user_id": USER_ID,
+            "interview_type": "General Interview",
+            "overall_score": i % 100,
+            "detailed_feedback": "",
+            "created_at": now - timedelta(minutes=i),
+            "updated_at": now
+        }
+        for i in range(total_attempts)
+    ])
+
+
+async def legacy_interview_scores(req):
+    """Previous update_interview_scores: one feedback query per attempt, then the update"""
+    attempts = await get_interview_attempts(req, INTERVIEW_ID)
+    scores = []
+    for attempt in attempts:
+        feedback = await get_attempt_feedback(req, attempt.id)
+        if feedback:
+            scores.append(feedback.overall_score)
+    await update_interview(
+        req, INTERVIEW_ID,
+        best_score=max(scores),
+        average_score=round(sum(scores) / len(scores), 1),
+        total_attempts=len(attempts),
+        last_attempt_date=attempts[0].created_at.isoformat()
+    )
+
+
+async def legacy_feedback_history(req, limit: int):
+    """Previous get_user_feedback_history: feedback and interview per attempt"""
+    attempts = await req.app.mongodb.interview_attempts.find().limit(limit * 2).to_list(length=None)
+    for attempt in attempts:
+        if await get_attempt_feedback(req, attempt["_id"]):
+            await get_interview(req, attempt["interview_id"])
+
+
+async def legacy_attempts_page(req):
+    """Previous paginated attempts route: one feedback query per attempt on the page"""
+    result = await get_interview_attempts_paginated(req, INTERVIEW_ID, PAGE_SIZE, 0)
+    for attempt in result["attempts"]:
+        await get_attempt_feedback(req, attempt.id)
+
+
+async def bulk_attempts_page(req):
+    result = await get_interview_attempts_paginated(req, INTERVIEW_ID, PAGE_SIZE, 0)
+    await get_attempts_feedback(req, result["attempts"])
+
+
+async def measure(counter, fn):
+    """Return (round trips, wall time in ms) for a single call of fn()"""
+    counter.count = 0
+    start = time.perf_counter()
+    await fn()
+    return counter.count, (time.perf_counter() - start) * 1000
+
+
+async def main():
+    counter = CommandCounter()
+    client = AsyncIOMotorClient(
+        CONNECTION_STRING_DB, tz_aware=True, tzinfo=timezone.utc,
+        event_listeners=[counter]
+    )
+    db = client[BENCHMARK_DB_NAME]
+    req = SimpleNamespace(app=SimpleNamespace(mongodb=db))
+
+    cases = [
+        ("update_interview_scores", lambda: legacy_interview_scores(req),
+         lambda: update_interview_scores(req, INTERVIEW_ID)),
+        ("get_user_feedback_history", lambda: legacy_feedback_history(req, 100),
+         lambda: get_user_feedback_history(req, USER_ID, 100)),
+        ("sessions attempts page", lambda: legacy_attempts_page(req),
+         lambda: bulk_attempts_page(req)),
+    ]
+
+    print("Bulk Fetch Round-Trip Benchmark")
+    print("=" * 78)
+    print(f"{'call site':<28} {'attempts':>8} {'before':>8} {'after':>8} {'before ms':>11} {'after ms':>10}")
+
+    try:
+        for total_attempts in ATTEMPT_COUNTS:
+            await seed(db, total_attempts)
+            for name, legacy, bulk in cases:
+                before_trips, before_ms = await measure(counter, legacy)
+                after_trips, after_ms = await measure(counter, bulk)
+                print(
+                    f"{name:<28} {total_attempts:>8} {before_trips:>8} {after_trips:>8} "
+                    f"{before_ms:>11.1f} {after_ms:>10.1f}"
+                )
+    finally:
+        await client.drop_database(BENCHMARK_DB_NAME)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Event loop lag benchmark for document extraction.
+
+Generates a multi-page PDF and runs a burst of concurrent CV-style
+extractions (text + 2x page renders) while a ticker coroutine measures how
+late the event loop wakes it up:
+- inline: extraction called directly inside the coroutine (previous behaviour)
+- pool: extraction through the DocumentExtractionPool process pool
+
+Needs PyMuPDF installed. No database or network access.
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+import fitz
+
+from services.document_extraction import DocumentExtractionPool, extract_pdf_content
+
+PAGES = 4
+CONCURRENT_UPLOADS = 8
+TICK_SECONDS = 0.01
+
+
+def build_pdf() -> bytes:
+    doc = fitz.open()
+    for page_num in range(PAGES):
+        page = doc.new_page()
+        text = f"Page {page_num + 1} - Senior Engineer, 8 years of Python, FastAPI and MongoDB. " * 4
+        for line in range(6):
+            page.insert_text((40, 40 + line * 18), text[:95], fontsize=9)
+    content = doc.tobytes()
+    doc.close()
+    return content
+
+
+async def measure_lag(run_extraction, content: bytes) -> dict:
+    """Run the burst while ticking every TICK_SECONDS, return wall time, worst lag and ticks served"""
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(TICK_SECONDS)
+            lags.append((time.perf_counter() - start - TICK_SECONDS) * 1000)
+
+    ticker_task = asyncio.create_task(ticker())
+    await asyncio.sleep(TICK_SECONDS * 2)
+    start = time.perf_counter()
+    await asyncio.gather(*[run_extraction(content) for _ in range(CONCURRENT_UPLOADS)])
+    wall_ms = (time.perf_counter() - start) * 1000
+    done.set()
+    await ticker_task
+
+    return {"wall_ms": wall_ms, "max_lag_ms": max(lags), "ticks": len(lags)}
+
+
+async def main():
+    content = build_pdf()
+    pool = DocumentExtractionPool()
+
+    async def inline(content: bytes):
+        return extract_pdf_content(content)
+
+    async def pooled(content: bytes):
+        return await pool.run(extract_pdf_content, content)
+
+    print(f"Document Extraction Benchmark ({CONCURRENT_UPLOADS} concurrent {PAGES}-page PDFs, "
+          f"{pool.workers} workers, {os.cpu_count()} CPUs)")
+    print("=" * 72)
+    try:
+        pool.start()
+        # Warm up the worker processes so spawn cost isn't counted
+        await asyncio.gather(*[pooled(content) for _ in range(pool.workers)])
+
+        print(f"{'mode':<8} {'wall ms':>10} {'max lag ms':>12} {'ticks':>8}")
+        for name, run_extraction in (("inline", inline), ("pool", pooled)):
+            stats = await measure_lag(run_extraction, content)
+            print(f"{name:<8} {stats['wall_ms']:>10.1f} {stats['max_lag_ms']:>12.1f} {stats['ticks']:>8}")
+    finally:
+        pool.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
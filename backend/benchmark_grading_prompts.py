@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Grading prompt benchmark.
+
+Build time: prompt and feedback defaults for every interview type, built
+- per grade: get_interview_config, template format and defaults rebuilt on
+  every call (previous behaviour)
+- compiled: the GRADING_PROMPTS registry built at import
+
+Prompt cache hit rate (only with --live and a real OPENAI_API_KEY): grades
+a few attempts of the same interview through the OpenAI API and reports the
+cached share of prompt tokens from the usage fields. OpenAI only caches
+prompts of 1024 tokens or more, so the hit rate depends on how long the
+job details and transcripts are.
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from config.interview_configs import INTERVIEW_CONFIGS, get_interview_config
+from config.grading_prompts import get_grading_prompt
+from models.interviews.interview_types import InterviewType
+
+ITERATIONS = 2000
+LIVE_ATTEMPTS = 4
+
+FIELDS = {
+    "role": "Senior Backend Engineer",
+    "company": "Northwind",
+    "difficulty": "senior",
+    "requirements": "\n".join(f"• Requirement {index}: 5+ years with distributed systems" for index in range(12)),
+    "transcript": "\n".join(f"AGENT: Question {index}?\nUSER: A detailed answer number {index}." for index in range(20)),
+    "company_values": "Innovation, Collaboration, Integrity, Customer Focus"
+}
+
+
+def per_grade(interview_type: InterviewType):
+    config = get_interview_config(interview_type)
+    prompt = config.prompt_template.format(**FIELDS)
+    expected_rubric_keys = [criteria.key for criteria in config.rubric_criteria]
+    defaults = {
+        "overall_score": 75,
+        "strengths": [f"Demonstrated understanding of {config.display_name} expectations"],
+        "improvement_areas": [
+            f"Could provide more specific examples relevant to {config.display_name}",
+            f"Opportunity to deepen skills in {config.improvement_focus[0]}",
+            f"Consider preparing more for {config.improvement_focus[1]}"
+        ],
+        "detailed_feedback": f"The candidate completed the {config.display_name}. {config.description}.",
+        "rubric_scores": {key: 75 for key in expected_rubric_keys}
+    }
+    return prompt, defaults
+
+
+def compiled(interview_type: InterviewType):
+    compiled_prompt = get_grading_prompt(interview_type)
+    return compiled_prompt.build(**FIELDS), compiled_prompt.default_feedback
+
+
+def time_builds(build) -> float:
+    """Microseconds per prompt build"""
+    types = list(INTERVIEW_CONFIGS)
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        for interview_type in types:
+            build(interview_type)
+    return (time.perf_counter() - start) * 1e6 / (ITERATIONS * len(types))
+
+
+async def live_cache_hit_rate():
+    from services.grading_service import GradingPromptCacheMetrics, record_prompt_cache_usage
+    from services.http_clients import http_clients, post_chat_completion
+
+    http_clients.open()
+    try:
+        for attempt in range(LIVE_ATTEMPTS):
+            fields = {**FIELDS, "transcript": f"USER: Attempt {attempt}.\n" + FIELDS["transcript"]}
+            prompt = get_grading_prompt(InterviewType.TECHNICAL_SCREENING_CALL).build(**fields)
+            response = await post_chat_completion({
+                "model": "gpt-4o-mini",
+                "messages": [{"role": "user", "content": prompt}],
+                "response_format": {"type": "json_object"},
+                "temperature": 0.3
+            }, timeout=60.0)
+            response.raise_for_status()
+            record_prompt_cache_usage(response.json().get("usage") or {})
+    finally:
+        await http_clients.close()
+    return GradingPromptCacheMetrics
+
+
+def main():
+    print(f"Grading Prompt Benchmark ({len(INTERVIEW_CONFIGS)} interview types x {ITERATIONS} builds)")
+    print("=" * 72)
+    for name, build in (("per grade", per_grade), ("compiled", compiled)):
+        print(f"{name:<10} {time_builds(build):>8.2f} us per prompt")
+
+    # The compiled prompt only moves the job details and transcript after the instructions
+    for interview_type in INTERVIEW_CONFIGS:
+        old_prompt, _ = per_grade(interview_type)
+        new_prompt, _ = compiled(interview_type)
+        assert FIELDS["transcript"] in new_prompt and FIELDS["requirements"] in new_prompt
+        assert abs(len(new_prompt) - len(old_prompt)) < 100, interview_type
+
+    if "--live" in sys.argv:
+        metrics = asyncio.run(live_cache_hit_rate())
+        rate = metrics["cached_tokens"] / metrics["prompt_tokens"] if metrics["prompt_tokens"] else 0.0
+        print(f"\nPrompt cache over {metrics['requests']} grades: "
+              f"{metrics['cached_tokens']}/{metrics['prompt_tokens']} prompt tokens cached ({rate:.0%})")
+    else:
+        print("\nRun with --live and a real OPENAI_API_KEY to report the prompt cache hit rate")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+End-to-end latency benchmark for POST /app/jobs/create/url.
+
+Serves job postings from a local stub site and answers the OpenAI and
+Brandfetch calls from local mocks, each with a fixed delay, then creates
+jobs through the route (auth overridden, no lifespan) with the job
+pipeline stages:
+- sequential: every stage waits for the one before it (previous behaviour)
+- concurrent: the Brandfetch lookup and stage detection run side by side
+
+Every job uses a new posting and company so no cache short-circuits a stage.
+Requires a reachable MongoDB in CONNECTION_STRING_DB. Everything is written
+to a throwaway database which is dropped at the end.
+"""
+import asyncio
+import json
+import os
+import re
+import sys
+import threading
+import time
+from dataclasses import replace
+from datetime import timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+SITE_PORT = 8771
+OPENAI_PORT = 8772
+BRANDFETCH_PORT = 8773
+# Must be set before the shared clients are configured
+os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{OPENAI_PORT}/v1"
+os.environ["OPENAI_API_KEY"] = "benchmark-key"
+os.environ["BRANDFETCH_BASE_URL"] = f"http://127.0.0.1:{BRANDFETCH_PORT}/v2"
+os.environ.setdefault("BRANDFETCH_API_KEY", "benchmark-client")
+
+import httpx
+from decouple import config
+from motor.motor_asyncio import AsyncIOMotorClient
+
+import crud.jobs.jobs as jobs_crud
+from crud._generic.indexes import ensureIndexes
+from main import app
+from routers.app.jobs.jobs import auth
+from services.http_clients import http_clients
+from utils.concurrency.task_graph import run_task_graph
+
+CONNECTION_STRING_DB = config("CONNECTION_STRING_DB", cast=str)
+BENCHMARK_DB_NAME = "benchmark_job_pipeline"
+SITE_DELAY_SECONDS = 0.1
+EXTRACTION_DELAY_SECONDS = 0.8
+STAGE_DETECTION_DELAY_SECONDS = 0.6
+BRANDFETCH_DELAY_SECONDS = 0.5
+JOBS = 5
+
+
+class StubSiteHandler(BaseHTTPRequestHandler):
+    """Job posting pages"""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        time.sleep(SITE_DELAY_SECONDS)
+        posting = self.path.rstrip('/').split('/')[-1]
+        payload = (f"<html><body><h1>Backend Engineer</h1><p>Posting {posting} at Company {posting}. "
+                   f"Interview process: phone screen, technical interview, final round.</p></body></html>").encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockOpenAIHandler(BaseHTTPRequestHandler):
+    """Chat completions for job extraction and interview stage detection"""
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        prompt = body["messages"][0]["content"]
+        if "interview stages" in prompt:
+            time.sleep(STAGE_DETECTION_DELAY_SECONDS)
+            content = json.dumps({
+                "detected_stages": ["phone screen", "technical interview", "final round"],
+                "confidence_score": 0.9,
+                "raw_text": "Interview process: phone screen, technical interview, final round.",
+                "detection_method": "explicit"
+            })
+        else:
+            time.sleep(EXTRACTION_DELAY_SECONDS)
+            posting = re.search(r"Posting (\S+)", prompt).group(1)
+            content = json.dumps({
+                "company": f"Company {posting}",
+                "role_title": "Backend Engineer",
+                "location": "Remote",
+                "experience_level": "senior",
+                "job_description": {"summary": "Build APIs", "requirements": ["Python"], "tech_stack": ["FastAPI"]},
+                "metadata": {"source": "company_website", "confidence_score": 0.9}
+            })
+        payload = json.dumps({"choices": [{"message": {"content": content}}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockBrandfetchHandler(BaseHTTPRequestHandler):
+    """Brandfetch search returning one match per company"""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        time.sleep(BRANDFETCH_DELAY_SECONDS)
+        posting = self.path.split('?')[0].rstrip('/').split('%20')[-1]
+        payload = json.dumps([{"name": f"Company {posting}", "domain": f"company-{posting}.com"}]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+async def run_sequentially(stages):
+    """The task graph with every stage depending on all the stages before it"""
+    chained = [replace(stage, depends_on=[previous.name for previous in stages[:index]])
+               for index, stage in enumerate(stages)]
+    return await run_task_graph(chained)
+
+
+async def create_jobs(client: httpx.AsyncClient, mode: str) -> list:
+    timings = []
+    for index in range(JOBS):
+        job_url = f"http://127.0.0.1:{SITE_PORT}/jobs/{mode}{index}"
+        start = time.perf_counter()
+        response = await client.post("/app/jobs/create/url", json={"job_url": job_url})
+        timings.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 201, response.text
+        job = response.json()["job"]
+        assert job["brandfetch_identifier_value"] == f"company-{mode}{index}.com", job
+        assert len(response.json()["interviews"]) >= 1
+    return sorted(timings)
+
+
+async def main():
+    servers = [
+        ThreadingHTTPServer(("127.0.0.1", SITE_PORT), StubSiteHandler),
+        ThreadingHTTPServer(("127.0.0.1", OPENAI_PORT), MockOpenAIHandler),
+        ThreadingHTTPServer(("127.0.0.1", BRANDFETCH_PORT), MockBrandfetchHandler),
+    ]
+    for server in servers:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    mongodb_client = AsyncIOMotorClient(CONNECTION_STRING_DB, tz_aware=True, tzinfo=timezone.utc)
+    app.mongodb_client = mongodb_client
+    app.mongodb = mongodb_client[BENCHMARK_DB_NAME]
+    app.dependency_overrides[auth.auth_wrapper] = lambda: "benchmark-user"
+    http_clients.open()
+
+    print(f"Job Pipeline Benchmark ({JOBS} jobs per mode, site {SITE_DELAY_SECONDS * 1000:.0f}ms, "
+          f"extraction {EXTRACTION_DELAY_SECONDS * 1000:.0f}ms, stage detection "
+          f"{STAGE_DETECTION_DELAY_SECONDS * 1000:.0f}ms, Brandfetch {BRANDFETCH_DELAY_SECONDS * 1000:.0f}ms)")
+    print("=" * 72)
+    results = {}
+    concurrent_graph = jobs_crud.run_task_graph
+    try:
+        await ensureIndexes(app.mongodb)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=30) as client:
+            for mode, graph in (("sequential", run_sequentially), ("concurrent", concurrent_graph)):
+                jobs_crud.run_task_graph = graph
+                results[mode] = await create_jobs(client, mode)
+    finally:
+        jobs_crud.run_task_graph = concurrent_graph
+        await http_clients.close()
+        await mongodb_client.drop_database(BENCHMARK_DB_NAME)
+        mongodb_client.close()
+        for server in servers:
+            server.shutdown()
+
+    print(f"\n{'mode':<12} {'p50 ms':>10} {'max ms':>10}")
+    for mode, timings in results.items():
+        print(f"{mode:<12} {timings[len(timings) // 2]:>10.1f} {timings[-1]:>10.1f}")
+    print("\nPer-stage timings are in the [JOB-PIPELINE] lines above")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
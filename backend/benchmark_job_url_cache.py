@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Latency and OpenAI call benchmark for the job posting URL cache.
+
+Serves a few job postings from a local stub site and answers extraction
+calls from a local mock of the OpenAI API, each with a fixed delay, then
+ingests a stream of pastes of the same popular postings (tracking
+parameters vary per paste) and a concurrent burst for one posting:
+- uncached: JobProcessingService.process_job_url on every paste
+- cached: get_job_data_for_url (canonical URL cache + request coalescing)
+
+Requires a reachable MongoDB in CONNECTION_STRING_DB. Everything is written
+to a throwaway database which is dropped at the end.
+"""
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from datetime import timezone
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+SITE_PORT = 8767
+OPENAI_PORT = 8768
+# Must be set before the shared clients are configured
+os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{OPENAI_PORT}/v1"
+os.environ["OPENAI_API_KEY"] = "benchmark-key"
+
+from decouple import config
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from crud._generic.indexes import ensureIndexes
+from crud.jobs.job_url_cache import get_job_data_for_url, JobUrlCacheMetrics
+from services.job_processing_service import JobProcessingService
+
+CONNECTION_STRING_DB = config("CONNECTION_STRING_DB", cast=str)
+BENCHMARK_DB_NAME = "benchmark_job_url_cache"
+SITE_DELAY_SECONDS = 0.15
+OPENAI_DELAY_SECONDS = 0.8
+POSTINGS = 3
+PASTES = 30
+BURST = 10
+
+counters = {"openai_calls": 0}
+
+
+class StubSiteHandler(BaseHTTPRequestHandler):
+    """Job posting pages with an ETag"""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        time.sleep(SITE_DELAY_SECONDS)
+        payload = f"<html><body><h1>Engineer</h1><p>Posting {self.path.split('?')[0]}</p></body></html>".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("ETag", '"posting-v1"')
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockOpenAIHandler(BaseHTTPRequestHandler):
+    """Chat completions returning a fixed job extraction"""
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        counters["openai_calls"] += 1
+        time.sleep(OPENAI_DELAY_SECONDS)
+        content = json.dumps({
+            "company": "Benchmark Co",
+            "role_title": "Engineer",
+            "job_description": {"summary": "Build things", "requirements": ["Python"]},
+            "metadata": {"source": "company_website", "confidence_score": 0.9}
+        })
+        payload = json.dumps({"choices": [{"message": {"content": content}}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def paste_url(index: int) -> str:
+    return f"http://127.0.0.1:{SITE_PORT}/jobs/{index % POSTINGS}?utm_source=paste-{index}"
+
+
+async def run(fn) -> tuple[float, int]:
+    """Return (p50 ms per paste, OpenAI calls) for PASTES sequential pastes"""
+    counters["openai_calls"] = 0
+    timings = []
+    for index in range(PASTES):
+        start = time.perf_counter()
+        await fn(paste_url(index))
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2], counters["openai_calls"]
+
+
+async def burst(fn) -> tuple[float, int]:
+    """Return (wall ms, OpenAI calls) for BURST concurrent pastes of a new posting"""
+    counters["openai_calls"] = 0
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        fn(f"http://127.0.0.1:{SITE_PORT}/jobs/burst?ref={index}") for index in range(BURST)
+    ])
+    return (time.perf_counter() - start) * 1000, counters["openai_calls"]
+
+
+async def main():
+    servers = [
+        ThreadingHTTPServer(("127.0.0.1", SITE_PORT), StubSiteHandler),
+        ThreadingHTTPServer(("127.0.0.1", OPENAI_PORT), MockOpenAIHandler),
+    ]
+    for server in servers:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    client = AsyncIOMotorClient(CONNECTION_STRING_DB, tz_aware=True, tzinfo=timezone.utc)
+    db = client[BENCHMARK_DB_NAME]
+    req = SimpleNamespace(app=SimpleNamespace(mongodb=db))
+    job_processor = JobProcessingService()
+
+    async def uncached(url):
+        return await job_processor.process_job_url(url)
+
+    async def cached(url):
+        return await get_job_data_for_url(req, job_processor, url)
+
+    print(f"Job URL Cache Benchmark ({PASTES} pastes of {POSTINGS} postings, "
+          f"site {SITE_DELAY_SECONDS * 1000:.0f}ms, OpenAI {OPENAI_DELAY_SECONDS * 1000:.0f}ms)")
+    print("=" * 72)
+    try:
+        await ensureIndexes(db)
+
+        uncached_p50, uncached_calls = await run(uncached)
+        cached_p50, cached_calls = await run(cached)
+        print(f"{'':<10} {'p50 ms':>10} {'OpenAI calls':>14}")
+        print(f"{'uncached':<10} {uncached_p50:>10.1f} {uncached_calls:>14}")
+        print(f"{'cached':<10} {cached_p50:>10.1f} {cached_calls:>14}")
+
+        uncached_ms, uncached_calls = await burst(uncached)
+        await db.job_url_cache.delete_many({})
+        cached_ms, cached_calls = await burst(cached)
+        print(f"\nBurst of {BURST} concurrent pastes of one new posting")
+        print(f"{'uncached':<10} {uncached_ms:>10.1f} ms {uncached_calls:>8} OpenAI calls")
+        print(f"{'cached':<10} {cached_ms:>10.1f} ms {cached_calls:>8} OpenAI calls")
+        print(f"\nCache metrics: {JobUrlCacheMetrics}")
+    finally:
+        await client.drop_database(BENCHMARK_DB_NAME)
+        client.close()
+        for server in servers:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
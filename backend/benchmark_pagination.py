@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Deep-page benchmark for the job list: offset pagination (skip + count)
+against keyset pagination (cursor on created_at, _id).
+
+Seeds a single user with many jobs, then fetches page 1 and a deep page
+with both modes and reports round trips and median latency.
+
+Requires a reachable MongoDB in CONNECTION_STRING_DB. Everything is written
+to a throwaway database which is dropped at the end.
+"""
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+from datetime import timezone, datetime, timedelta
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from decouple import config
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+
+from crud._generic.indexes import ensureIndexes
+from crud.jobs.jobs import get_user_jobs
+
+CONNECTION_STRING_DB = config("CONNECTION_STRING_DB", cast=str)
+BENCHMARK_DB_NAME = "benchmark_pagination"
+USER_ID = "benchmark-user"
+PAGE_SIZE = 10
+PAGES = [1, 100, 500]
+TOTAL_JOBS = PAGE_SIZE * max(PAGES) + 10
+RUNS = 20
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Counts commands sent to the server"""
+
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        if event.command_name not in ("endSessions", "hello", "isMaster", "ping"):
+            self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+async def seed(db):
+    """Seed TOTAL_JOBS jobs for the benchmark user, a few sharing a timestamp"""
+    now = datetime.now(timezone.utc)
+    await db.jobs.insert_many([
+        {
+            "_id": f"job-{i:06d}",
+            "user_id": USER_ID,
+            "company": "Benchmark Co",
+            "role_title": "Engineer",
+            "job_description": "word " * 300,
+            "created_at": now - timedelta(seconds=i // 2),
+            "updated_at": now
+        }
+        for i in range(TOTAL_JOBS)
+    ])
+    await ensureIndexes(db)
+
+
+async def cursor_for_page(req, page_number: int) -> str:
+    """Walk the keyset cursors (untimed) up to the start of page_number"""
+    cursor = ""
+    for _ in range(page_number - 1):
+        cursor = (await get_user_jobs(req, USER_ID, PAGE_SIZE, 0, cursor))["next_cursor"]
+    return cursor
+
+
+async def measure(counter, fn):
+    """Return (round trips per call, median ms) over RUNS calls of fn()"""
+    timings = []
+    counter.count = 0
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        await fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return counter.count / RUNS, timings[len(timings) // 2]
+
+
+async def main():
+    counter = CommandCounter()
+    client = AsyncIOMotorClient(
+        CONNECTION_STRING_DB, tz_aware=True, tzinfo=timezone.utc,
+        event_listeners=[counter]
+    )
+    db = client[BENCHMARK_DB_NAME]
+    req = SimpleNamespace(app=SimpleNamespace(mongodb=db))
+
+    print(f"Pagination Benchmark ({TOTAL_JOBS} jobs, page size {PAGE_SIZE})")
+    print("=" * 72)
+    print(f"{'page':>6} {'offset trips':>13} {'cursor trips':>13} {'offset ms':>10} {'cursor ms':>10}")
+
+    try:
+        await seed(db)
+        for page_number in PAGES:
+            skip = (page_number - 1) * PAGE_SIZE
+            cursor = await cursor_for_page(req, page_number)
+
+            offset_trips, offset_ms = await measure(
+                counter, lambda: get_user_jobs(req, USER_ID, PAGE_SIZE, skip)
+            )
+            cursor_trips, cursor_ms = await measure(
+                counter, lambda: get_user_jobs(req, USER_ID, PAGE_SIZE, 0, cursor)
+            )
+            print(
+                f"{page_number:>6} {offset_trips:>13.0f} {cursor_trips:>13.0f} "
+                f"{offset_ms:>10.2f} {cursor_ms:>10.2f}"
+            )
+    finally:
+        await client.drop_database(BENCHMARK_DB_NAME)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for updateDocument: the default validate-everything path
+(read, simulate, update, read back) against fast=True (validate changed
+fields, single find_one_and_update).
+
+Updates an interview attempt with a realistic transcript, the way
+update_attempt does, and reports round trips and median latency.
+
+Requires a reachable MongoDB in CONNECTION_STRING_DB. Everything is written
+to a throwaway database which is dropped at the end.
+"""
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+from datetime import timezone
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from decouple import config
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+
+from crud._generic._db_actions import createDocument, updateDocument
+from models.interviews.attempts import InterviewAttempt
+
+CONNECTION_STRING_DB = config("CONNECTION_STRING_DB", cast=str)
+BENCHMARK_DB_NAME = "benchmark_update_document"
+TRANSCRIPT_TURNS = [0, 50, 200]
+RUNS = 50
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Counts commands sent to the server"""
+
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        if event.command_name not in ("endSessions", "hello", "isMaster", "ping"):
+            self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+async def time_updates(req, counter, attempt_id: str, fast: bool):
+    """Return (round trips per update, median ms) over RUNS updates"""
+    timings = []
+    counter.count = 0
+    for i in range(RUNS):
+        start = time.perf_counter()
+        await updateDocument(
+            req, "interview_attempts", InterviewAttempt, attempt_id,
+            fast=fast,
+            status="completed",
+            duration_seconds=i
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return counter.count / RUNS, timings[len(timings) // 2]
+
+
+async def main():
+    counter = CommandCounter()
+    client = AsyncIOMotorClient(
+        CONNECTION_STRING_DB, tz_aware=True, tzinfo=timezone.utc,
+        event_listeners=[counter]
+    )
+    db = client[BENCHMARK_DB_NAME]
+    req = SimpleNamespace(app=SimpleNamespace(mongodb=db))
+
+    print("updateDocument Benchmark")
+    print("=" * 72)
+    print(f"{'turns':>6} {'default trips':>14} {'fast trips':>11} {'default ms':>11} {'fast ms':>9}")
+
+    try:
+        for turns in TRANSCRIPT_TURNS:
+            attempt = await createDocument(
+                req, "interview_attempts", InterviewAttempt,
+                InterviewAttempt(
+                    interview_id="benchmark-interview",
+                    user_id="benchmark-user",
+                    status="active",
+                    transcript=[
+                        {"role": "user", "message": "word " * 60, "time_in_call_secs": t}
+                        for t in range(turns)
+                    ]
+                )
+            )
+            default_trips, default_ms = await time_updates(req, counter, attempt.id, fast=False)
+            fast_trips, fast_ms = await time_updates(req, counter, attempt.id, fast=True)
+            print(
+                f"{turns:>6} {default_trips:>14.0f} {fast_trips:>11.0f} "
+                f"{default_ms:>11.2f} {fast_ms:>9.2f}"
+            )
+    finally:
+        await client.drop_database(BENCHMARK_DB_NAME)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
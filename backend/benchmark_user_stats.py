@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the /app/users/stats/average-score engine.
+
+Seeds a scratch database with one user at increasing attempt counts and
+times the single-aggregation stats query against the previous
+per-interview / per-attempt lookup loop.
+
+Requires a reachable MongoDB in CONNECTION_STRING_DB. Everything is written
+to a throwaway database which is dropped at the end.
+"""
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+from datetime import timezone
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from decouple import config
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from crud.users.stats import get_user_score_stats
+
+CONNECTION_STRING_DB = config("CONNECTION_STRING_DB", cast=str)
+BENCHMARK_DB_NAME = "benchmark_user_stats"
+USER_ID = "benchmark-user"
+ATTEMPTS_PER_INTERVIEW = 5
+ATTEMPT_COUNTS = [10, 100, 500, 1000]
+RUNS = 5
+
+
+async def seed(db, total_attempts: int):
+    """Seed interviews, attempts and feedback for the benchmark user"""
+    await db.interviews.delete_many({})
+    await db.interview_attempts.delete_many({})
+    await db.interview_feedback.delete_many({})
+
+    interview_count = max(1, total_attempts // ATTEMPTS_PER_INTERVIEW)
+    interviews = [
+        {"_id": f"interview-{i}", "user_id": USER_ID}
+        for i in range(interview_count)
+    ]
+    attempts = [
+        {
+            "_id": f"attempt-{i}",
+            "interview_id": f"interview-{i % interview_count}",
+            "user_id": USER_ID,
+            "status": "graded"
+        }
+        for i in range(total_attempts)
+    ]
+    feedback = [
+        {
+            "_id": f"feedback-{i}",
+            "attempt_id": f"attempt-{i}",
+            "interview_id": f"interview-{i % interview_count}",
+            "user_id": USER_ID,
+            "overall_score": i % 100
+        }
+        for i in range(total_attempts)
+    ]
+    await db.interviews.insert_many(interviews)
+    await db.interview_attempts.insert_many(attempts)
+    await db.interview_feedback.insert_many(feedback)
+    await db.interview_attempts.create_index("user_id")
+    await db.interview_attempts.create_index("interview_id")
+    await db.interview_feedback.create_index("attempt_id")
+
+
+async def legacy_stats(db):
+    """The previous N+1 lookup: interviews -> attempts -> feedback"""
+    interviews = await db.interviews.find({"user_id": USER_ID}).to_list(length=None)
+    attempts = []
+    for interview in interviews:
+        attempts.extend(await db.interview_attempts.find(
+            {"interview_id": interview["_id"]}
+        ).to_list(length=None))
+    scores = []
+    for attempt in attempts:
+        for feedback in await db.interview_feedback.find(
+            {"attempt_id": attempt["_id"]}
+        ).to_list(length=None):
+            scores.append(feedback["overall_score"])
+    return len(attempts), (round(sum(scores) / len(scores), 1) if scores else None)
+
+
+async def time_call(fn) -> float:
+    """Return the median wall time of fn() in milliseconds"""
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        await fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+async def main():
+    client = AsyncIOMotorClient(CONNECTION_STRING_DB, tz_aware=True, tzinfo=timezone.utc)
+    db = client[BENCHMARK_DB_NAME]
+    req = SimpleNamespace(app=SimpleNamespace(mongodb=db))
+
+    print("User Stats Benchmark")
+    print("=" * 60)
+    print(f"{'attempts':>10} {'legacy (ms)':>14} {'aggregation (ms)':>18}")
+
+    try:
+        for total_attempts in ATTEMPT_COUNTS:
+            await seed(db, total_attempts)
+
+            stats = await get_user_score_stats(req, USER_ID)
+            legacy_attempts, legacy_average = await legacy_stats(db)
+            assert stats["total_attempts"] == legacy_attempts
+            assert stats["average_score"] == legacy_average
+
+            legacy_ms = await time_call(lambda: legacy_stats(db))
+            aggregation_ms = await time_call(lambda: get_user_score_stats(req, USER_ID))
+            print(f"{total_attempts:>10} {legacy_ms:>14.1f} {aggregation_ms:>18.1f}")
+    finally:
+        await client.drop_database(BENCHMARK_DB_NAME)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Vision input size benchmark for CV extraction.
+
+Builds a small corpus of synthetic CVs (text-layer, designed with a sparse
+text layer, scanned without one) and compares the first-page image sent to
+gpt-4o by the previous pipeline (every page rendered at 2x zoom as PNG)
+with the current one (page size based zoom, compressed JPEG/WebP, no
+render at all when classify_pdf_pages routes the CV to the text parse):
+- extraction time
+- request body bytes for the image
+- image tokens, using OpenAI's high detail tiling rules
+
+Needs PyMuPDF and Pillow. No database or network access.
+"""
+import base64
+import io
+import math
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+import fitz
+from PIL import Image
+
+from services.document_extraction import extract_document
+
+RUNS = 5
+LINE = "Led migration of a payments platform to event sourcing, Python, Kafka, MongoDB, AWS. "
+
+
+def text_cv(pages: int = 2) -> bytes:
+    doc = fitz.open()
+    for page_num in range(pages):
+        page = doc.new_page(width=595, height=842)
+        page.insert_text((50, 60), f"Jane Doe - Senior Backend Engineer (page {page_num + 1})", fontsize=16)
+        for line in range(45):
+            page.insert_text((50, 95 + line * 15), LINE[:(line * 7) % 40 + 50], fontsize=9)
+    content = doc.tobytes()
+    doc.close()
+    return content
+
+
+def designed_cv() -> bytes:
+    doc = fitz.open()
+    page = doc.new_page(width=595, height=842)
+    page.draw_rect(fitz.Rect(0, 0, 200, 842), color=None, fill=(0.15, 0.25, 0.4))
+    photo = Image.effect_mandelbrot((240, 240), (-2, -1.5, 1, 1.5), 60).convert("RGB")
+    buffer = io.BytesIO()
+    photo.save(buffer, format="PNG")
+    page.insert_image(fitz.Rect(40, 40, 160, 160), stream=buffer.getvalue())
+    for line in range(8):
+        page.insert_text((220, 80 + line * 60), LINE[:60], fontsize=10)
+    content = doc.tobytes()
+    doc.close()
+    return content
+
+
+def scanned_cv() -> bytes:
+    source = fitz.open(stream=text_cv(1), filetype="pdf")
+    scan = source.load_page(0).get_pixmap(dpi=150).tobytes("png")
+    source.close()
+    doc = fitz.open()
+    page = doc.new_page(width=595, height=842)
+    page.insert_image(page.rect, stream=scan)
+    content = doc.tobytes()
+    doc.close()
+    return content
+
+
+def previous_pipeline(content: bytes) -> list:
+    """Every page at 2x zoom as base64 PNG, as the CV extractor did"""
+    doc = fitz.open(stream=content, filetype="pdf")
+    images = []
+    for page_num in range(len(doc)):
+        page = doc.load_page(page_num)
+        page.get_text()
+        pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))
+        images.append("data:image/png;base64," + base64.b64encode(pix.tobytes("png")).decode("utf-8"))
+    doc.close()
+    return images
+
+
+def current_pipeline(content: bytes) -> list:
+    return extract_document(content, "application/pdf", None, 1).images
+
+
+def image_tokens(data_url: str) -> int:
+    """gpt-4o high detail: fit in 2048x2048, short side to 768, 170 tokens per 512px tile + 85"""
+    width, height = Image.open(io.BytesIO(base64.b64decode(data_url.split(",", 1)[1]))).size
+    scale = min(1.0, 2048 / max(width, height))
+    width, height = width * scale, height * scale
+    scale = min(1.0, 768 / min(width, height))
+    width, height = width * scale, height * scale
+    return 85 + 170 * math.ceil(width / 512) * math.ceil(height / 512)
+
+
+def measure(pipeline, content: bytes) -> dict:
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        images = pipeline(content)
+    elapsed_ms = (time.perf_counter() - start) / RUNS * 1000
+    # Only the first page image goes into the request
+    first = images[0] if images else ""
+    return {
+        "ms": elapsed_ms,
+        "kb": len(first) / 1024,
+        "tokens": image_tokens(first) if first else 0,
+    }
+
+
+def main():
+    corpus = {
+        "text-layer (2p)": text_cv(),
+        "designed": designed_cv(),
+        "scanned": scanned_cv(),
+    }
+    print(f"Vision Input Benchmark ({len(corpus)} sample CVs, {RUNS} runs each)")
+    print("=" * 84)
+    print(f"{'CV':<17} {'pipeline':<9} {'extract ms':>11} {'image KB':>10} {'image tokens':>13}")
+    totals = {"previous": [0.0, 0.0, 0], "current": [0.0, 0.0, 0]}
+    for name, content in corpus.items():
+        route = extract_document(content, "application/pdf", None, 1).parsing_route
+        print(f"{name:<17} routed to {route.route} ({route.reason})")
+        for label, pipeline in (("previous", previous_pipeline), ("current", current_pipeline)):
+            stats = measure(pipeline, content)
+            totals[label][0] += stats["ms"]
+            totals[label][1] += stats["kb"]
+            totals[label][2] += stats["tokens"]
+            print(f"{'':<17} {label:<9} {stats['ms']:>11.1f} {stats['kb']:>10.1f} {stats['tokens']:>13}")
+    print("-" * 84)
+    for label, (ms, kb, tokens) in totals.items():
+        print(f"{'total':<17} {label:<9} {ms:>11.1f} {kb:>10.1f} {tokens:>13}")
+
+
+if __name__ == "__main__":
+    main()
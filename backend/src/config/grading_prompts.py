@@ -0,0 +1,84 @@
+import re
+from dataclasses import dataclass
+from string import Formatter
+from types import MappingProxyType
+from typing import Dict, Mapping, Tuple
+
+from config.interview_configs import INTERVIEW_CONFIGS, InterviewTypeConfig
+from models.interviews.interview_types import InterviewType
+
+# The job details and transcript section of a prompt template, up to the instructions after it
+_DYNAMIC_SECTION = re.compile(r"JOB DETAILS:\n.*?\{transcript\}\n+", re.S)
+_ROLE_AT_COMPANY = "for a {role} position at {company}"
+
+DEFAULT_RUBRIC_SCORE = 75
+
+
+@dataclass(frozen=True)
+class CompiledGradingPrompt:
+    """
+    Grading prompt and rubric metadata of one interview type, built once
+    at import. The prompt is the static prefix (instructions, scoring rules
+    and response format, the same for every attempt of the type) followed
+    by the job details and transcript, so OpenAI prompt caching can reuse
+    the prefix across grades.
+    """
+    config: InterviewTypeConfig
+    static_prefix: str
+    dynamic_template: str           # str.format template for the job details and transcript
+    rubric_keys: Tuple[str, ...]
+    default_feedback: Mapping[str, object]
+
+    def build(self, **fields) -> str:
+        """Prompt for one attempt, fields as in the config prompt templates"""
+        return self.static_prefix + self.dynamic_template.format(**fields)
+
+
+def compile_grading_prompt(config: InterviewTypeConfig) -> CompiledGradingPrompt:
+    template = config.prompt_template
+    dynamic = _DYNAMIC_SECTION.search(template)
+    if not dynamic or _ROLE_AT_COMPANY not in template:
+        raise ValueError(f"Prompt template for {config.type.value} does not have the expected layout")
+
+    static = template[:dynamic.start()] + template[dynamic.end():]
+    static = static.replace(_ROLE_AT_COMPANY, "for the position in the JOB DETAILS below")
+    placeholders = [name for _, name, _, _ in Formatter().parse(static) if name is not None]
+    if placeholders:
+        raise ValueError(f"Static part of the {config.type.value} prompt still uses {placeholders}")
+
+    rubric_keys = tuple(criteria.key for criteria in config.rubric_criteria)
+    default_feedback = MappingProxyType({
+        "overall_score": DEFAULT_RUBRIC_SCORE,
+        "strengths": (
+            f"Demonstrated understanding of {config.display_name} expectations",
+            "Maintained professional communication",
+            "Showed engagement throughout the interview"
+        ),
+        "improvement_areas": (
+            f"Could provide more specific examples relevant to {config.display_name}",
+            f"Opportunity to deepen skills in {config.improvement_focus[0]}",
+            f"Consider preparing more for {config.improvement_focus[1]}"
+        ),
+        "detailed_feedback": f"The candidate completed the {config.display_name}. {config.description}. With focused preparation on the key areas evaluated, they can strengthen their performance in future interviews.",
+        "rubric_scores": MappingProxyType({key: DEFAULT_RUBRIC_SCORE for key in rubric_keys})
+    })
+
+    return CompiledGradingPrompt(
+        config=config,
+        # Unescape the {{ }} of the response format, as format() would
+        static_prefix=static.format().rstrip() + "\n\n",
+        dynamic_template=template[dynamic.start():dynamic.end()].rstrip() + "\n",
+        rubric_keys=rubric_keys,
+        default_feedback=default_feedback
+    )
+
+
+GRADING_PROMPTS: Dict[InterviewType, CompiledGradingPrompt] = {
+    interview_type: compile_grading_prompt(config)
+    for interview_type, config in INTERVIEW_CONFIGS.items()
+}
+
+
+def get_grading_prompt(interview_type: InterviewType) -> CompiledGradingPrompt:
+    """Compiled grading prompt for an interview type, same fallback as get_interview_config"""
+    return GRADING_PROMPTS.get(interview_type, GRADING_PROMPTS[InterviewType.TECHNICAL_SCREENING_CALL])
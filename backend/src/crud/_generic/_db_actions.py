@@ -7,8 +7,9 @@ from datetime import datetime, timezone
 
 from models._base import MongoBaseModel
 
-from utils.__errors__.custom_exception import CustomException
+from utils.__errors__.custom_exception import CustomException, InvalidCursorCustomException
 from utils.mongo_helpers import exclude_created_at
+from crud._generic.indexes import recordQueryShape
 error_path = "crud/_generic"
 
 ENVIRONMENT = config('ENVIRONMENT', cast=str)
@@ -17,13 +18,64 @@ class SortDirection(str, Enum):
     ASCENDING = 'ascending'
     DESCENDING = 'descending'
 
+def _build_projection(
+    collection_name:str,
+    BaseModel:MongoBaseModel,
+    ProjectionModel:Optional[MongoBaseModel]
+) -> Optional[dict]:
+    """
+    Builds a MongoDB projection from the fields of a partial
+    "view" model, so large fields not needed by the caller are
+    never sent over the wire or validated.
+    Returns None (all fields) when no ProjectionModel is given.
+    """
+    if not ProjectionModel:
+        return None
+
+    model_keys = set()
+    for field_name, field in BaseModel.model_fields.items():
+        model_keys.add(field.alias if field.alias else field_name)
+
+    projection = {}
+    for field_name, field in ProjectionModel.model_fields.items():
+        field_key = field.alias if field.alias else field_name
+        if field_key not in model_keys:
+            raise CustomException(
+                message=f"""
+                    ProjectionModel field '{field_key}' does not
+                    exist on the collection model - projection failed
+                """,
+                custom_error_path=error_path,
+                custom_error_file_name="projection_failed.txt",
+                extra_error_info={
+                    "collection_name": collection_name,
+                    "BaseModel": BaseModel.__name__,
+                    "ProjectionModel": ProjectionModel.__name__
+                }
+            )
+        projection[field_key] = 1
+    projection['_id'] = 1
+
+    return projection
+
 # Create Operations
 async def createDocument(
         req:Request,
         collection_name:str,
         BaseModel:MongoBaseModel,
-        new_document:MongoBaseModel
+        new_document:MongoBaseModel,
+        verify:bool = False,
+        session = None
 ) -> MongoBaseModel:
+    """
+    Inserts a new document and returns it.
+
+    The id is generated client side by MongoBaseModel, so the already
+    constructed model is returned without reading it back. Pass
+    verify=True to re-read the inserted document from the database
+    and rebuild the model from what was actually stored.
+    Pass a session (see runTransaction) to insert inside a transaction.
+    """
     
     from crud._generic.model_mappings import CollectionModelMatch
     
@@ -64,11 +116,14 @@ async def createDocument(
             new_document:BaseModel
     ) -> BaseModel:
         created_document = await req.app.mongodb[collection_name].insert_one(
-            new_document.model_dump(by_alias=True, exclude_none=True)
+            new_document.model_dump(by_alias=True, exclude_none=True),
+            session=session
         )
+        if not verify:
+            return new_document
         document = await req.app.mongodb[collection_name].find_one({
             '_id': created_document.inserted_id
-        })
+        }, session=session)
         return BaseModel(**document) if document is not None else None
         
     return await embeddedCreateDocument(req, collection_name, new_document)
@@ -79,8 +134,17 @@ async def createMultipleDocuments(
     req:Request,
     collection_name:str,
     BaseModel:MongoBaseModel,
-    new_documents:list[MongoBaseModel]
+    new_documents:list[MongoBaseModel],
+    verify:bool = False,
+    session = None
 ) -> list[MongoBaseModel]:
+    """
+    Inserts several documents with a single insert_many and returns
+    them in the order given. Pass verify=True to re-read the inserted
+    documents from the database instead of returning the models as
+    constructed. Pass a session (see runTransaction) to insert inside
+    a transaction.
+    """
     
     from crud._generic.model_mappings import CollectionModelMatch
     for new_document in new_documents:
@@ -128,12 +192,16 @@ async def createMultipleDocuments(
             [ document.model_dump(
                 by_alias=True,
                 exclude_none=True
-            ) for document in new_documents ]
+            ) for document in new_documents ],
+            session=session
         )
 
+        if not verify:
+            return list(new_documents)
+
         documents = await req.app.mongodb[collection_name].find({
             '_id': {'$in': created_documents.inserted_ids}
-        }).to_list(length=None)
+        }, session=session).to_list(length=None)
         
         return [BaseModel(**document) for document in documents] if documents else []
     
@@ -148,12 +216,55 @@ async def createMultipleDocuments(
 
 
 
+# Transactions
+
+# None until the first transaction attempt tells us whether
+# the deployment (replica set / mongos vs standalone) supports them
+_transactions_supported:Optional[bool] = None
+
+async def runTransaction(
+    req:Request,
+    operation
+):
+    """
+    Runs `await operation(session)` inside a multi-document
+    transaction and returns its result.
+
+    Standalone MongoDB servers (e.g. local development) do not
+    support transactions; there the operation is run once with
+    session=None, so writes are still performed, just not atomically.
+    """
+    global _transactions_supported
+    from pymongo.errors import OperationFailure
+
+    if _transactions_supported is False:
+        return await operation(None)
+
+    try:
+        async with await req.app.mongodb_client.start_session() as session:
+            async with session.start_transaction():
+                result = await operation(session)
+        _transactions_supported = True
+        return result
+    except OperationFailure as e:
+        # IllegalOperation: transactions require a replica set or mongos
+        if e.code != 20 or _transactions_supported:
+            raise
+        if ENVIRONMENT == 'development':
+            print('Transactions not supported by this deployment, writing without one')
+        _transactions_supported = False
+        return await operation(None)
+
+
+
+
 # Get Operations
 
 async def getDocument(
     req:Request,
     collection_name:str,
     BaseModel:MongoBaseModel,
+    ProjectionModel:Optional[MongoBaseModel] = None,
     **kwargs
 ) -> MongoBaseModel | None:
     
@@ -217,8 +328,16 @@ async def getDocument(
             }
         )
 
-    document = await req.app.mongodb[collection_name].find_one(query)
+    projection = _build_projection(collection_name, BaseModel, ProjectionModel)
+    recordQueryShape(collection_name, query)
+
+    document = await req.app.mongodb[collection_name].find_one(
+        query,
+        projection=projection
+    )
 
+    if ProjectionModel:
+        return ProjectionModel(**document) if document else None
     if collection_name == "users":
         return BaseModel.model_construct(**document) if document else None
     return BaseModel(**document) if document else None
@@ -316,13 +435,7 @@ async def getMultipleDocuments(
             }
         )
     
-    projection = {}
-    if ProjectionModel:
-        for field_name, field in ProjectionModel.model_fields.items():
-            field_key = field.alias if field.alias else field_name
-            projection[field_key] = 1
-        if '_id' not in projection:
-            projection['_id'] = 1
+    projection = _build_projection(collection_name, BaseModel, ProjectionModel)
 
     # Sorting
     sort_field = order_by if order_by else 'created_at'
@@ -336,6 +449,8 @@ async def getMultipleDocuments(
     if sort_field != 'created_at':
         sort_criteria.append(('created_at', 1))
 
+    recordQueryShape(collection_name, query, sort_field if sorting else None)
+
     # Apply sorting, pagination, and convert to list
     if sorting:
         documents = await req.app.mongodb[collection_name].find(
@@ -369,6 +484,166 @@ async def getMultipleDocuments(
 
 
 
+def _encodeCursor(document:dict) -> str:
+    """Opaque keyset cursor for the (created_at, _id) position of a document"""
+    import base64
+    import json
+
+    payload = json.dumps({
+        'c': document['created_at'].isoformat(),
+        'i': str(document['_id'])
+    })
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def _decodeCursor(cursor:str) -> tuple[datetime, str]:
+    """Inverse of _encodeCursor, raising InvalidCursorCustomException on bad input"""
+    import base64
+    import json
+
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        created_at = datetime.fromisoformat(payload['c'])
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        return created_at, str(payload['i'])
+    except Exception:
+        raise InvalidCursorCustomException(
+            message="Invalid pagination cursor",
+            custom_error_path=error_path,
+            custom_error_file_name="invalid_cursor.txt",
+            extra_error_info={"cursor": cursor}
+        )
+
+
+async def getDocumentsPage(
+    req:Request,
+    collection_name:str,
+    BaseModel:MongoBaseModel,
+    limit:int = 10,
+    cursor:Optional[str] = None,
+    order_direction:Optional[SortDirection] = SortDirection.DESCENDING,
+    ProjectionModel:Optional[MongoBaseModel] = None,
+    **kwargs
+) -> dict:
+    """
+    Keyset (cursor) pagination ordered by (created_at, _id).
+
+    Unlike skip-based paging the cost of a page does not grow with its
+    depth, and has_more is known from fetching limit + 1 documents, so
+    no count query is needed.
+
+    Parameters:
+        cursor (str): Opaque cursor from a previous page's next_cursor.
+            None or an empty string returns the first page.
+
+    Returns:
+        dict: {"documents": [...], "next_cursor": str | None, "has_more": bool}
+    """
+    from crud._generic.model_mappings import CollectionModelMatch
+
+    if collection_name not in CollectionModelMatch:
+        raise CustomException(
+            message="""
+                Collection name has not been set up to
+                use generic crud functions - get page failed
+            """,
+            custom_error_path=error_path,
+            custom_error_file_name="get_page_failed.txt",
+            extra_error_info={
+                "collection_name": collection_name,
+                "BaseModel": BaseModel.__name__,
+                "limit": limit,
+                "cursor": cursor,
+                "query_parameters": kwargs
+            }
+        )
+
+    if not issubclass(BaseModel, CollectionModelMatch[collection_name]):
+        raise CustomException(
+            message="""
+                BaseModel is not of the correct type
+                for the collection - get page failed
+            """,
+            custom_error_path=error_path,
+            custom_error_file_name="get_page_failed.txt",
+            extra_error_info={
+                "collection_name": collection_name,
+                "BaseModel": BaseModel.__name__,
+                "limit": limit,
+                "cursor": cursor,
+                "query_parameters": kwargs
+            }
+        )
+
+    query = {}
+    # Handle direct model fields
+    for field_name, field in BaseModel.model_fields.items():
+        param_value = kwargs.get(field.alias, kwargs.get(field_name))
+        if param_value is not None:
+            query[field.alias if field.alias else field_name] = param_value
+
+    # Handle embedded fields with double underscore notation
+    for key, value in kwargs.items():
+        if "__" in key and key not in query:
+            query[key.replace("__", ".")] = value
+
+    if not query:
+        raise CustomException(
+            message="""
+                None or invalid query parameters provided - get page failed
+            """,
+            custom_error_path=error_path,
+            custom_error_file_name="get_page_failed.txt",
+            extra_error_info={
+                "collection_name": collection_name,
+                "BaseModel": BaseModel.__name__,
+                "query_parameters": kwargs
+            }
+        )
+
+    recordQueryShape(collection_name, query, 'created_at')
+
+    sort_direction = -1 if order_direction == SortDirection.DESCENDING else 1
+
+    # Continue strictly after the cursor position
+    if cursor:
+        cursor_created_at, cursor_id = _decodeCursor(cursor)
+        operator = '$lt' if sort_direction == -1 else '$gt'
+        query['$or'] = [
+            {'created_at': {operator: cursor_created_at}},
+            {'created_at': cursor_created_at, '_id': {operator: cursor_id}}
+        ]
+
+    projection = _build_projection(collection_name, BaseModel, ProjectionModel)
+
+    documents = await req.app.mongodb[collection_name].find(
+        query,
+        projection=projection
+    ).sort([
+        ('created_at', sort_direction),
+        ('_id', sort_direction)
+    ]).limit(limit + 1).to_list(length=None)
+
+    has_more = len(documents) > limit
+    documents = documents[:limit]
+    next_cursor = _encodeCursor(documents[-1]) if has_more else None
+
+    if ProjectionModel:
+        models = [ProjectionModel(**document) for document in documents]
+    elif collection_name == "users":
+        models = [BaseModel.model_construct(**document) for document in documents]
+    else:
+        models = [BaseModel(**document) for document in documents]
+
+    return {
+        "documents": models,
+        "next_cursor": next_cursor,
+        "has_more": has_more
+    }
+
+
+
 async def getAllDocuments(
     req:Request,
     collection_name:str,
@@ -376,6 +651,7 @@ async def getAllDocuments(
     order_by:Optional[str] = None,
     order_direction:Optional[SortDirection] = SortDirection.DESCENDING,
     limit:Optional[int] = 0,
+    ProjectionModel:Optional[MongoBaseModel] = None,
 ) -> list[MongoBaseModel]:
     
     from crud._generic.model_mappings import CollectionModelMatch
@@ -427,11 +703,21 @@ async def getAllDocuments(
     
 
     
+    projection = _build_projection(collection_name, BaseModel, ProjectionModel)
+
     # Apply sorting, pagination, and convert to list
-    documents = await req.app.mongodb[collection_name].find({}).sort(
+    documents = await req.app.mongodb[collection_name].find(
+        {},
+        projection=projection
+    ).sort(
         sort_criteria
     ).limit(limit).to_list(length=None)
 
+    if ProjectionModel:
+        return [ProjectionModel(
+            **document
+        ) for document in documents] if documents else []
+
     if collection_name == "users":
         return [BaseModel.model_construct(
             **document
@@ -450,6 +736,7 @@ async def batchGetDocuments(
     order_direction:Optional[SortDirection] = SortDirection.DESCENDING,
     limit:Optional[int] = 0,
     skip:Optional[int] = 0,
+    ProjectionModel:Optional[MongoBaseModel] = None,
     **additional_filters
 ) -> list[MongoBaseModel]:
     
@@ -503,8 +790,18 @@ async def batchGetDocuments(
     if additional_filters:
         query.update(additional_filters)
     
-    documents = await req.app.mongodb[collection_name].find(query).sort(
-        sort_criteria).limit(limit).skip(skip).to_list(length=None)
+    projection = _build_projection(collection_name, BaseModel, ProjectionModel)
+    recordQueryShape(collection_name, query, sort_field)
+
+    documents = await req.app.mongodb[collection_name].find(
+        query,
+        projection=projection
+    ).sort(sort_criteria).limit(limit).skip(skip).to_list(length=None)
+
+    if ProjectionModel:
+        return [ProjectionModel(
+            **document
+        ) for document in documents] if documents else []
 
     if collection_name == "users":
         return [BaseModel.model_construct(
@@ -515,6 +812,134 @@ async def batchGetDocuments(
         **document
     ) for document in documents] if documents else []
 
+
+async def batchGetRelatedDocuments(
+    req:Request,
+    collection_name:str,
+    BaseModel:MongoBaseModel,
+    parents:list,
+    foreign_key:str,
+    parent_key:str = 'id',
+    order_by:Optional[str] = None,
+    order_direction:Optional[SortDirection] = SortDirection.DESCENDING,
+    ProjectionModel:Optional[MongoBaseModel] = None,
+    **additional_filters
+) -> dict[str, list[MongoBaseModel]]:
+    """
+    Fetches the children of many parent documents with a single
+    $in query, replacing a per-parent lookup loop.
+
+    Parameters:
+        req (Request): The FastAPI request object.
+        collection_name (str): The collection holding the children.
+        BaseModel (MongoBaseModel): The base model for that collection.
+        parents (list): Parent models (or dicts) to join from.
+        foreign_key (str): Child field referencing the parent, e.g. 'attempt_id'.
+            Use '_id' to look children up by their own id.
+        parent_key (str): Parent attribute holding the referenced value,
+            defaults to the parent's id.
+        ProjectionModel (MongoBaseModel): Optional partial view model; only
+            its fields are fetched. It must include foreign_key.
+
+    Returns:
+        dict[str, list[MongoBaseModel]]: Children grouped by the parent key
+        value. Every parent key is present, with an empty list when it has
+        no children, so callers can index without checking.
+    """
+    from crud._generic.model_mappings import CollectionModelMatch
+
+    if collection_name not in CollectionModelMatch:
+        raise CustomException(
+            message="""
+                Collection name has not been set up to
+                use generic crud functions - batch get related failed
+            """,
+            custom_error_path=error_path,
+            custom_error_file_name="batch_get_related_failed.txt",
+            extra_error_info={
+                "collection_name": collection_name,
+                "BaseModel": BaseModel.__name__,
+                "foreign_key": foreign_key,
+                "parent_key": parent_key
+            }
+        )
+
+    if not issubclass(BaseModel, CollectionModelMatch[collection_name]):
+        raise CustomException(
+            message="""
+                BaseModel is not of the correct type
+                for the collection - batch get related failed
+            """,
+            custom_error_path=error_path,
+            custom_error_file_name="batch_get_related_failed.txt",
+            extra_error_info={
+                "collection_name": collection_name,
+                "BaseModel": BaseModel.__name__,
+                "foreign_key": foreign_key,
+                "parent_key": parent_key
+            }
+        )
+
+    # Resolve the stored field name so aliases and field names both work
+    stored_key = None
+    for field_name, field in BaseModel.model_fields.items():
+        if foreign_key in (field_name, field.alias):
+            stored_key = field.alias if field.alias else field_name
+            break
+
+    if not stored_key:
+        raise CustomException(
+            message=f"Field '{foreign_key}' does not exist on the model.",
+            custom_error_path=error_path,
+            custom_error_file_name="batch_get_related_failed.txt",
+            extra_error_info={
+                "collection_name": collection_name,
+                "BaseModel": BaseModel.__name__,
+                "foreign_key": foreign_key,
+                "parent_key": parent_key
+            }
+        )
+
+    # Collect the distinct keys, keeping parent order
+    grouped = {}
+    for parent in parents:
+        if isinstance(parent, dict):
+            key = parent.get(parent_key)
+        else:
+            key = getattr(parent, parent_key, None)
+        if key is not None:
+            grouped.setdefault(str(key), [])
+
+    if not grouped:
+        return grouped
+
+    # Sorting
+    sort_field = order_by if order_by else 'created_at'
+    sort_direction = -1 if order_direction == SortDirection.DESCENDING else 1
+
+    query = {stored_key: {'$in': list(grouped.keys())}}
+    if additional_filters:
+        query.update(additional_filters)
+
+    projection = _build_projection(collection_name, BaseModel, ProjectionModel)
+    recordQueryShape(collection_name, query, sort_field)
+
+    documents = await req.app.mongodb[collection_name].find(
+        query,
+        projection=projection
+    ).sort([(sort_field, sort_direction)]).to_list(length=None)
+
+    for document in documents:
+        if ProjectionModel:
+            child = ProjectionModel(**document)
+        elif collection_name == "users":
+            child = BaseModel.model_construct(**document)
+        else:
+            child = BaseModel(**document)
+        grouped.setdefault(str(document.get(stored_key)), []).append(child)
+
+    return grouped
+
 # Counting Operations
 
 async def countDocuments(
@@ -593,6 +1018,8 @@ async def countDocuments(
         )
 
     # Perform the count
+    recordQueryShape(collection_name, query)
+
     return await req.app.mongodb[collection_name].count_documents(query)
 
 
@@ -641,6 +1068,75 @@ async def countAllDocuments(
 
 
 
+# Aggregation Operations
+
+async def aggregateDocuments(
+    req: Request,
+    collection_name: str,
+    BaseModel: MongoBaseModel,
+    pipeline: list[dict]
+) -> list[dict]:
+    """
+    Runs an aggregation pipeline against a collection in a single
+    round trip and returns the raw result documents.
+    The result shape is defined by the pipeline, so documents are
+    not constructed into BaseModel instances.
+    """
+    from crud._generic.model_mappings import CollectionModelMatch
+
+    # Ensure the collection is supported
+    if collection_name not in CollectionModelMatch:
+        raise CustomException(
+            message="""
+                Collection name has not been set up to
+                use generic crud functions - aggregate failed
+            """,
+            custom_error_path=error_path,
+            custom_error_file_name="aggregate_failed.txt",
+            extra_error_info={
+                "collection_name": collection_name,
+                "BaseModel": BaseModel.__name__,
+                "pipeline": pipeline
+            }
+        )
+
+    # Ensure the BaseModel matches the collection
+    if not issubclass(BaseModel, CollectionModelMatch[collection_name]):
+        raise CustomException(
+            message="""
+                BaseModel is not of the correct type
+                for the collection - aggregate failed
+            """,
+            custom_error_path=error_path,
+            custom_error_file_name="aggregate_failed.txt",
+            extra_error_info={
+                "collection_name": collection_name,
+                "BaseModel": BaseModel.__name__,
+                "pipeline": pipeline
+            }
+        )
+
+    if not pipeline:
+        raise CustomException(
+            message="""
+                Empty pipeline provided. If you wish to query
+                all documents, use the getAllDocuments function.
+            """,
+            custom_error_path=error_path,
+            custom_error_file_name="aggregate_failed.txt",
+            extra_error_info={
+                "collection_name": collection_name,
+                "BaseModel": BaseModel.__name__,
+                "pipeline": pipeline
+            }
+        )
+
+    return await req.app.mongodb[collection_name].aggregate(
+        pipeline
+    ).to_list(length=None)
+
+
+
 
 
 # Update Operations
@@ -651,8 +1147,22 @@ async def updateDocument(
     BaseModel:MongoBaseModel,
     document_id:str,
     raw_update:Optional[dict] = None,
+    fast:bool = False,
     **kwargs
 ) -> MongoBaseModel:
+    """
+    Updates a single document by id and returns the updated document.
+
+    By default the existing document is read, the update is simulated
+    and the whole model is re-validated before writing, then the
+    document is read back (three round trips).
+
+    With fast=True only the changed $set fields are validated against
+    the model's field validators, and the write and read-back happen
+    in a single find_one_and_update. Other operators in raw_update
+    (e.g. $inc) are applied without simulation. Returns None when the
+    document does not exist in either mode.
+    """
     
     from crud._generic.model_mappings import CollectionModelMatch
     import pydantic
@@ -692,6 +1202,16 @@ async def updateDocument(
             }
         )
     
+    if fast:
+        return await _fastUpdateDocument(
+            req,
+            collection_name,
+            BaseModel,
+            document_id,
+            raw_update,
+            **kwargs
+        )
+
     existing_document = await getDocument(
         req,
         collection_name,
@@ -794,6 +1314,96 @@ async def updateDocument(
 
 
 
+async def _fastUpdateDocument(
+    req:Request,
+    collection_name:str,
+    BaseModel:MongoBaseModel,
+    document_id:str,
+    raw_update:Optional[dict] = None,
+    **kwargs
+) -> MongoBaseModel:
+    """
+    Single round trip update used by updateDocument(fast=True).
+    Validates only the fields being set, then writes and returns
+    the updated document with one find_one_and_update.
+    """
+    import pydantic
+    from pymongo import ReturnDocument
+
+    now = datetime.now(timezone.utc)
+
+    if raw_update:
+        update_clause = dict(raw_update)
+        update_clause["$set"] = exclude_created_at({
+            **update_clause.get("$set", {}),
+            "updated_at": now
+        })
+    else:
+        # Create the update data from kwargs
+        update_data = {}
+        kwargs.pop('_id', None)
+        for field_name, field in BaseModel.model_fields.items():
+            param_value = kwargs.get(field.alias, kwargs.get(field_name))
+            if param_value is not None:
+                update_data[field.alias if field.alias else field_name] = param_value
+        update_data['updated_at'] = now
+        update_clause = {
+            '$set': exclude_created_at(update_data)
+        }
+
+    # Map stored keys back to field names for validation
+    field_names_by_key = {}
+    for field_name, field in BaseModel.model_fields.items():
+        field_names_by_key[field.alias if field.alias else field_name] = field_name
+
+    # Validate each changed field against the model's field validators,
+    # on an unvalidated instance so no other field is checked
+    error_fields = {}
+    validation_target = BaseModel.model_construct()
+    for field_key, value in update_clause['$set'].items():
+        field_name = field_names_by_key.get(field_key)
+        if not field_name:
+            # Embedded paths (a.b) are validated by the full update path only
+            continue
+        try:
+            BaseModel.__pydantic_validator__.validate_assignment(
+                validation_target, field_name, value
+            )
+        except pydantic.ValidationError as e:
+            for error in e.errors():
+                error_fields[field_key] = error["msg"]
+
+    if error_fields:
+        raise CustomException(
+            message=f"""
+                Update operation would violate field constraints.
+                Field validations failed: {error_fields}
+            """,
+            custom_error_path=error_path,
+            custom_error_file_name="update_validation_failed.txt",
+            extra_error_info={
+                "collection_name": collection_name,
+                "document_id": document_id,
+                "update_clause": update_clause,
+                "validation_errors": error_fields
+            }
+        )
+
+    updated_doc = await req.app.mongodb[collection_name].find_one_and_update(
+        {'_id': document_id},
+        update_clause,
+        return_document=ReturnDocument.AFTER
+    )
+
+    if not updated_doc:
+        return None
+
+    if collection_name == "users":
+        return BaseModel.model_construct(**updated_doc)
+    return BaseModel(**updated_doc)
+
+
+
 async def updateMultipleDocuments(
     req: Request,
     collection_name: str,
@@ -1152,6 +1762,129 @@ async def incrementDocumentField(
     # Return the updated document as a model instance
     return BaseModel(**updated_doc)
 
+
+async def upsertDocument(
+    req: Request,
+    collection_name: str,
+    BaseModel: MongoBaseModel,
+    filter_kwargs: dict,
+    raw_update: dict
+) -> MongoBaseModel:
+    """
+    Atomically applies a raw update to the document matching
+    filter_kwargs, creating it if it does not exist yet.
+
+    Intended for counter style documents maintained with operators
+    such as $inc, $max and $push, so concurrent writers never need a
+    read-modify-write cycle. The matching filter fields are written
+    into a newly created document by MongoDB, and _id / created_at
+    are set on insert only.
+
+    Parameters:
+        req (Request): The FastAPI request object.
+        collection_name (str): The name of the collection.
+        BaseModel (MongoBaseModel): The base model for the collection.
+        filter_kwargs (dict): Equality filter identifying the document.
+        raw_update (dict): MongoDB update clause to apply.
+
+    Returns:
+        MongoBaseModel: The document after the update.
+    """
+    from crud._generic.model_mappings import CollectionModelMatch
+    from pymongo import ReturnDocument
+    from bson import ObjectId
+
+    if collection_name not in CollectionModelMatch:
+        raise CustomException(
+            message="""
+                Collection name has not been set up to
+                use generic crud functions - upsert failed
+            """,
+            custom_error_path=error_path,
+            custom_error_file_name="upsert_failed.txt",
+            extra_error_info={
+                "collection_name": collection_name,
+                "BaseModel": BaseModel.__name__,
+                "filter_kwargs": filter_kwargs
+            }
+        )
+
+    if not issubclass(
+        BaseModel,
+        CollectionModelMatch[collection_name]
+    ):
+        raise CustomException(
+            message="""
+                BaseModel is not of the correct type
+                for the collection - upsert failed
+            """,
+            custom_error_path=error_path,
+            custom_error_file_name="upsert_failed.txt",
+            extra_error_info={
+                "collection_name": collection_name,
+                "BaseModel": BaseModel.__name__,
+                "filter_kwargs": filter_kwargs
+            }
+        )
+
+    if not filter_kwargs or not raw_update:
+        raise CustomException(
+            message="""
+                An upsert requires both a filter and an update
+                clause, otherwise an arbitrary document could be
+                created or modified - upsert failed
+            """,
+            custom_error_path=error_path,
+            custom_error_file_name="upsert_failed.txt",
+            extra_error_info={
+                "collection_name": collection_name,
+                "BaseModel": BaseModel.__name__,
+                "filter_kwargs": filter_kwargs,
+                "raw_update": raw_update
+            }
+        )
+
+    # Only allow filtering on fields defined on the model
+    model_keys = set()
+    for field_name, field in BaseModel.model_fields.items():
+        model_keys.add(field.alias if field.alias else field_name)
+    unknown_keys = set(filter_kwargs) - model_keys
+    if unknown_keys:
+        raise CustomException(
+            message=f"""
+                Upsert filter contains fields that are not
+                on the model: {sorted(unknown_keys)}
+            """,
+            custom_error_path=error_path,
+            custom_error_file_name="upsert_failed.txt",
+            extra_error_info={
+                "collection_name": collection_name,
+                "BaseModel": BaseModel.__name__,
+                "filter_kwargs": filter_kwargs
+            }
+        )
+
+    now = datetime.now(timezone.utc)
+    update_clause = dict(raw_update)
+    update_clause["$set"] = exclude_created_at({
+        **update_clause.get("$set", {}),
+        "updated_at": now
+    })
+    update_clause["$setOnInsert"] = {
+        **update_clause.get("$setOnInsert", {}),
+        "_id": str(ObjectId()),
+        "created_at": now
+    }
+
+    updated_doc = await req.app.mongodb[collection_name].find_one_and_update(
+        filter_kwargs,
+        update_clause,
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+
+    return BaseModel(**updated_doc)
+
 # Delete Operations
 
 async def deleteDocument(
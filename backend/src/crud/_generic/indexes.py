@@ -0,0 +1,242 @@
+from typing import Optional
+from pymongo import IndexModel, ASCENDING, DESCENDING
+
+from decouple import config
+
+from utils.__errors__.custom_exception import CustomException
+error_path = "crud/_generic"
+
+CV_PARSE_CACHE_TTL_SECONDS = config('CV_PARSE_CACHE_TTL_DAYS', default=30, cast=int) * 24 * 60 * 60
+JOB_URL_CACHE_TTL_SECONDS = config('JOB_URL_CACHE_TTL_DAYS', default=14, cast=int) * 24 * 60 * 60
+
+# Declarative index registry, keyed by the same collection names as
+# CollectionModelMatch. Every index is created idempotently at startup
+# by ensureIndexes; add an entry here when adding a new query shape.
+# Paginated lists end in (created_at, _id) to serve getDocumentsPage.
+CollectionIndexes:dict[str, list[IndexModel]] = {
+    'refresh_tokens': [
+        IndexModel([('token_id', ASCENDING)]),
+        IndexModel([('user_id', ASCENDING)]),
+        # Expired refresh tokens are removed by MongoDB
+        IndexModel([('expires_at', ASCENDING)], expireAfterSeconds=0),
+    ],
+    'users': [
+        IndexModel([('email', ASCENDING)]),
+    ],
+    'cv_profiles': [
+        IndexModel([('user_id', ASCENDING), ('parsed_at', DESCENDING)]),
+    ],
+    'cv_parse_cache': [
+        IndexModel([('file_hash', ASCENDING), ('prompt_version', ASCENDING)], unique=True),
+        # Sliding expiry, entries not served within the TTL are removed by MongoDB
+        IndexModel([('last_accessed_at', ASCENDING)], expireAfterSeconds=CV_PARSE_CACHE_TTL_SECONDS),
+        IndexModel([('user_ids', ASCENDING)]),
+    ],
+    'jobs': [
+        IndexModel([('user_id', ASCENDING), ('created_at', DESCENDING), ('_id', DESCENDING)]),
+    ],
+    'job_url_cache': [
+        IndexModel([('canonical_url', ASCENDING)], unique=True),
+        # Postings nobody pasted within the TTL are removed by MongoDB
+        IndexModel([('last_accessed_at', ASCENDING)], expireAfterSeconds=JOB_URL_CACHE_TTL_SECONDS),
+    ],
+    'interviews': [
+        IndexModel([('user_id', ASCENDING), ('created_at', DESCENDING), ('_id', DESCENDING)]),
+        IndexModel([('job_id', ASCENDING), ('stage_order', ASCENDING)]),
+        IndexModel([('job_id', ASCENDING), ('status', ASCENDING)]),
+        IndexModel([('company', ASCENDING)]),
+    ],
+    'interview_attempts': [
+        IndexModel([('interview_id', ASCENDING), ('started_at', DESCENDING)]),
+        IndexModel([('interview_id', ASCENDING), ('created_at', DESCENDING), ('_id', DESCENDING)]),
+        IndexModel([('user_id', ASCENDING), ('created_at', DESCENDING)]),
+        IndexModel([('conversation_id', ASCENDING)], sparse=True),
+    ],
+    'interview_feedback': [
+        IndexModel([('attempt_id', ASCENDING)]),
+        IndexModel([('interview_id', ASCENDING)]),
+        IndexModel([('user_id', ASCENDING), ('created_at', DESCENDING)]),
+    ],
+    'grading_jobs': [
+        # One job per attempt, duplicate webhooks don't enqueue twice
+        IndexModel([('attempt_id', ASCENDING)], unique=True),
+        IndexModel([('status', ASCENDING), ('run_after', ASCENDING)]),
+        IndexModel([('status', ASCENDING), ('locked_until', ASCENDING)]),
+    ],
+    'company_info': [
+        IndexModel([('normalized_name', ASCENDING)]),
+        IndexModel([('domain', ASCENDING)], sparse=True),
+    ],
+    'user_onboarding_answers': [
+        IndexModel([('user_id', ASCENDING)]),
+    ],
+    'user_stats': [
+        IndexModel([('user_id', ASCENDING)], unique=True),
+    ],
+}
+
+# Query shapes issued through the generic CRUD functions since startup:
+# {(collection_name, equality_fields, sort_field): count}
+ObservedQueryShapes:dict[tuple[str, tuple[str, ...], Optional[str]], int] = {}
+
+
+def validateIndexRegistry() -> None:
+    """
+    Ensures every registry entry targets a generic-CRUD collection
+    and only indexes fields that exist on its model.
+    """
+    from crud._generic.model_mappings import CollectionModelMatch
+
+    for collection_name, indexes in CollectionIndexes.items():
+        if collection_name not in CollectionModelMatch:
+            raise CustomException(
+                message=f"""
+                    Index registry contains collection {collection_name}
+                    which is not set up to use generic crud functions
+                """,
+                custom_error_path=error_path,
+                custom_error_file_name="index_registry_invalid.txt",
+                extra_error_info={"collection_name": collection_name}
+            )
+
+        model = CollectionModelMatch[collection_name]
+        model_keys = {'_id'}
+        for field_name, field in model.model_fields.items():
+            model_keys.add(field.alias if field.alias else field_name)
+
+        for index in indexes:
+            for field_key in index.document['key']:
+                if field_key.split('.')[0] not in model_keys:
+                    raise CustomException(
+                        message=f"""
+                            Index on {collection_name}.{field_key} targets a
+                            field that does not exist on {model.__name__}
+                        """,
+                        custom_error_path=error_path,
+                        custom_error_file_name="index_registry_invalid.txt",
+                        extra_error_info={
+                            "collection_name": collection_name,
+                            "field": field_key
+                        }
+                    )
+
+
+async def ensureIndexes(db) -> dict[str, list[str]]:
+    """
+    Creates every index in the registry. createIndexes is a no-op for
+    indexes that already exist, so this is safe to run on every startup.
+    A failure on one collection (e.g. an index with conflicting options
+    already exists) is logged and does not stop the others.
+
+    Returns the names of the indexes ensured per collection.
+    """
+    from pymongo.errors import ServerSelectionTimeoutError
+
+    validateIndexRegistry()
+
+    ensured = {}
+    for collection_name, indexes in CollectionIndexes.items():
+        try:
+            ensured[collection_name] = await db[collection_name].create_indexes(indexes)
+        except ServerSelectionTimeoutError as e:
+            # Database unreachable, don't wait for every collection to time out
+            print(f"Failed to ensure indexes, database unreachable: {str(e)}")
+            break
+        except Exception as e:
+            print(f"Failed to ensure indexes on {collection_name}: {str(e)}")
+            ensured[collection_name] = []
+    return ensured
+
+
+def recordQueryShape(
+    collection_name:str,
+    query:dict,
+    sort_field:Optional[str] = None
+) -> None:
+    """Records the shape (fields, not values) of a generic CRUD query"""
+    shape = (collection_name, tuple(sorted(query.keys())), sort_field)
+    ObservedQueryShapes[shape] = ObservedQueryShapes.get(shape, 0) + 1
+
+
+def _shapeSupport(
+    equality_fields:tuple[str, ...],
+    sort_field:Optional[str],
+    index_keys:list[list[str]]
+) -> str:
+    """
+    Classifies how well a collection's indexes serve a query shape:
+    - ok: an index prefix matches the equality fields, followed by the sort field
+    - sort_not_indexed: the filter is indexed but results are sorted in memory
+    - missing_index: no index can be used to narrow the filter
+    """
+    if '_id' in equality_fields:
+        return 'ok'
+
+    fields = set(equality_fields)
+    filter_indexed = not fields
+    sort_indexed = sort_field is None or sort_field in fields
+
+    for keys in index_keys:
+        if fields and keys[0] in fields:
+            filter_indexed = True
+        prefix = keys[:len(fields)]
+        if set(prefix) == fields and not sort_indexed:
+            if len(keys) > len(fields) and keys[len(fields)] == sort_field:
+                sort_indexed = True
+
+    if not filter_indexed:
+        return 'missing_index'
+    if not sort_indexed:
+        return 'sort_not_indexed'
+    return 'ok'
+
+
+async def reportQueryShapes(db) -> dict:
+    """
+    Compares the query shapes observed since startup and the index
+    registry with the indexes that actually exist in the database.
+    """
+    existing_index_keys = {}
+    for collection_name in {shape[0] for shape in ObservedQueryShapes} | set(CollectionIndexes):
+        information = await db[collection_name].index_information()
+        existing_index_keys[collection_name] = [
+            [key for key, _ in index['key']]
+            for index in information.values()
+        ]
+
+    query_shapes = []
+    for (collection_name, equality_fields, sort_field), count in sorted(
+        ObservedQueryShapes.items(),
+        key=lambda item: item[1],
+        reverse=True
+    ):
+        query_shapes.append({
+            "collection": collection_name,
+            "filter": list(equality_fields),
+            "sort": sort_field,
+            "count": count,
+            "status": _shapeSupport(
+                equality_fields,
+                sort_field,
+                existing_index_keys.get(collection_name, [])
+            )
+        })
+
+    missing_declared_indexes = []
+    for collection_name, indexes in CollectionIndexes.items():
+        existing = existing_index_keys.get(collection_name, [])
+        for index in indexes:
+            keys = list(index.document['key'].keys())
+            if keys not in existing:
+                missing_declared_indexes.append({
+                    "collection": collection_name,
+                    "keys": keys
+                })
+
+    return {
+        "query_shapes": query_shapes,
+        "unsupported_query_shapes": [
+            shape for shape in query_shapes if shape["status"] != 'ok'
+        ],
+        "missing_declared_indexes": missing_declared_indexes
+    }
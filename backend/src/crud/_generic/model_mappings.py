@@ -1,9 +1,12 @@
 from models.auth.refresh import RefreshToken
 from models.users.users import User
+from models.users.user_stats import UserStats
 from models.interviews.cv_profile import CVProfile
+from models.interviews.cv_parse_cache import CVParseCacheEntry
 from models.interviews.interviews import Interview
 from models.interviews.attempts import InterviewAttempt, InterviewFeedback
-from models.jobs import Job
+from models.interviews.grading_jobs import GradingJob
+from models.jobs import Job, JobUrlCacheEntry
 from models.companies import CompanyInfo
 from models.onboarding import OnboardingAnswers
 
@@ -11,12 +14,16 @@ CollectionModelMatch = {
     'refresh_tokens': RefreshToken,
     'users': User,
     'cv_profiles': CVProfile,
+    'cv_parse_cache': CVParseCacheEntry,
     'jobs': Job,
+    'job_url_cache': JobUrlCacheEntry,
     'interviews': Interview,
     'interview_attempts': InterviewAttempt,
     'interview_feedback': InterviewFeedback,
+    'grading_jobs': GradingJob,
     'company_info': CompanyInfo,
     'user_onboarding_answers': OnboardingAnswers,
+    'user_stats': UserStats,
 }
 
 # Reverse mapping from model to collection name
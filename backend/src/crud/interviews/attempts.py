@@ -2,9 +2,11 @@ from fastapi import Request
 from typing import Optional, List, Dict
 from datetime import datetime, timezone, timedelta
 
-from crud._generic._db_actions import createDocument, getDocument, getMultipleDocuments, updateDocument, countDocuments
-from models.interviews.attempts import InterviewAttempt, InterviewFeedback
+from crud._generic._db_actions import createDocument, getDocument, getMultipleDocuments, getDocumentsPage, updateDocument, countDocuments, batchGetRelatedDocuments, SortDirection
+from models.interviews.attempts import InterviewAttempt, InterviewAttemptListView, InterviewFeedback
+from models.interviews.interviews import Interview
 from models.interviews.interview_types import InterviewType
+from crud.users.stats import record_attempt_in_user_stats, record_feedback_in_user_stats
 
 async def create_attempt(req: Request, interview_id: str, job_id: Optional[str], user_id: str) -> InterviewAttempt:
     """Create a new interview attempt"""
@@ -27,6 +29,7 @@ async def create_attempt(req: Request, interview_id: str, job_id: Optional[str],
     
     if result:
         print(f"   ✅ SUCCESS: Created attempt with ID: {result.id}")
+        await record_attempt_in_user_stats(req, user_id)
     else:
         print(f"   ❌ ERROR: Failed to create attempt!")
     
@@ -44,15 +47,32 @@ async def get_interview_attempts(req: Request, interview_id: str) -> List[Interv
         order_by="started_at"
     )
 
-async def get_interview_attempts_paginated(req: Request, interview_id: str, limit: int = 10, skip: int = 0) -> Dict[str, any]:
-    """Get paginated attempts for a specific interview with metadata"""
-    # Get the attempts
+async def get_interview_attempts_paginated(req: Request, interview_id: str, limit: int = 10, skip: int = 0, cursor: Optional[str] = None) -> Dict[str, any]:
+    """Get paginated attempts for a specific interview with metadata, by skip or, when a cursor is given, by keyset"""
+    if cursor is not None:
+        page = await getDocumentsPage(
+            req, "interview_attempts", InterviewAttempt,
+            limit=limit,
+            cursor=cursor,
+            ProjectionModel=InterviewAttemptListView,
+            interview_id=interview_id
+        )
+        return {
+            "attempts": page["documents"],
+            "has_more": page["has_more"],
+            "total_count": None,
+            "current_page_size": len(page["documents"]),
+            "next_cursor": page["next_cursor"]
+        }
+    
+    # Get the attempts, without transcripts
     attempts = await getMultipleDocuments(
         req, "interview_attempts", InterviewAttempt,
         interview_id=interview_id,
         order_by="started_at",
         limit=limit,
-        skip=skip
+        skip=skip,
+        ProjectionModel=InterviewAttemptListView
     )
     
     # Get total count to determine if there are more pages
@@ -68,7 +88,7 @@ async def get_interview_attempts_paginated(req: Request, interview_id: str, limi
 
 async def update_attempt(req: Request, attempt_id: str, **kwargs) -> Optional[InterviewAttempt]:
     """Update an interview attempt"""
-    return await updateDocument(req, "interview_attempts", InterviewAttempt, attempt_id, **kwargs)
+    return await updateDocument(req, "interview_attempts", InterviewAttempt, attempt_id, fast=True, **kwargs)
 
 async def add_transcript_turn(
     req: Request, 
@@ -252,9 +272,10 @@ async def create_feedback(
     else:
         print(f"   ❌ ERROR: Failed to create feedback!")
     
-    # Update interview best score after creating feedback
+    # Update interview best score and the user's stats after creating feedback
     if result:
         await update_interview_best_score(req, interview_id, overall_score)
+        await record_feedback_in_user_stats(req, result)
     
     return result
 
@@ -303,29 +324,54 @@ async def get_attempt_feedback(req: Request, attempt_id: str) -> Optional[Interv
     return await getDocument(req, "interview_feedback", InterviewFeedback, attempt_id=attempt_id)
 
 async def get_user_feedback_history(req: Request, user_id: str, limit: int = 10) -> List[Dict]:
-    """Get feedback history for a user across all interviews"""
-    # This would need to join across collections - simplified version
-    attempts = await getMultipleDocuments(
+    """Get feedback history for a user across all interviews, newest first"""
+    feedback_list = await getMultipleDocuments(
+        req, "interview_feedback", InterviewFeedback,
+        user_id=user_id,
+        order_by="created_at",
+        order_direction=SortDirection.DESCENDING,
+        limit=limit
+    )
+    
+    if not feedback_list:
+        return []
+    
+    # Join attempts and interviews with one query each instead of per feedback
+    attempts_by_id = await batchGetRelatedDocuments(
         req, "interview_attempts", InterviewAttempt,
-        limit=limit * 2  # Get more attempts to find ones with feedback
+        feedback_list, foreign_key="_id", parent_key="attempt_id"
+    )
+    interviews_by_id = await batchGetRelatedDocuments(
+        req, "interviews", Interview,
+        feedback_list, foreign_key="_id", parent_key="interview_id"
     )
     
-    feedback_list = []
-    for attempt in attempts:
-        feedback = await get_attempt_feedback(req, attempt.id)
-        if feedback:
-            # Get interview details
-            from .interviews import get_interview
-            interview = await get_interview(req, attempt.interview_id)
-            
-            if interview and interview.user_id == user_id:
-                feedback_list.append({
-                    "feedback": feedback,
-                    "attempt": attempt,
-                    "interview": interview
-                })
-    
-    return feedback_list[:limit]
+    history = []
+    for feedback in feedback_list:
+        attempts = attempts_by_id.get(feedback.attempt_id)
+        interviews = interviews_by_id.get(feedback.interview_id)
+        if not attempts or not interviews:
+            continue
+        if interviews[0].user_id != user_id:
+            continue
+        history.append({
+            "feedback": feedback,
+            "attempt": attempts[0],
+            "interview": interviews[0]
+        })
+    
+    return history
+
+async def get_attempts_feedback(req: Request, attempts: List[InterviewAttemptListView]) -> Dict[str, Optional[InterviewFeedback]]:
+    """Get feedback for many attempts in a single query, keyed by attempt ID"""
+    feedback_by_attempt = await batchGetRelatedDocuments(
+        req, "interview_feedback", InterviewFeedback,
+        attempts, foreign_key="attempt_id"
+    )
+    return {
+        attempt_id: (feedback_list[0] if feedback_list else None)
+        for attempt_id, feedback_list in feedback_by_attempt.items()
+    }
 
 async def update_attempt_with_webhook_data_by_attempt_id(
     req: Request,
@@ -0,0 +1,129 @@
+from fastapi import Request
+from typing import Optional, Dict, Any, List
+from datetime import datetime, timezone
+import hashlib
+from pymongo import ReturnDocument, ASCENDING
+from decouple import config
+
+from crud._generic._db_actions import upsertDocument, countAllDocuments, aggregateDocuments
+from crud._generic.model_mappings import get_db_for_model
+from models.interviews.cv_parse_cache import CVParseCacheEntry
+
+# Least recently used entries beyond this are evicted on write
+CV_PARSE_CACHE_MAX_ENTRIES = config('CV_PARSE_CACHE_MAX_ENTRIES', default=5000, cast=int)
+
+# Lookups served by this process since startup
+CVParseCacheMetrics: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def hash_file_content(file_content: bytes) -> str:
+    """Content hash used as the cache key for an uploaded file"""
+    return hashlib.sha256(file_content).hexdigest()
+
+
+async def get_cached_cv_parse(
+    req: Request,
+    file_hash: str,
+    prompt_version: str,
+    user_id: str
+) -> Optional[CVParseCacheEntry]:
+    """Get a cached CV parse for user_id, refreshing its LRU / TTL timestamp on a hit"""
+    collection = get_db_for_model(req.app, CVParseCacheEntry)
+    document = await collection.find_one_and_update(
+        {"file_hash": file_hash, "prompt_version": prompt_version},
+        {
+            "$set": {"last_accessed_at": datetime.now(timezone.utc)},
+            "$inc": {"hit_count": 1},
+            "$addToSet": {"user_ids": user_id}
+        },
+        return_document=ReturnDocument.AFTER
+    )
+    if document:
+        CVParseCacheMetrics["hits"] += 1
+        return CVParseCacheEntry(**document)
+
+    CVParseCacheMetrics["misses"] += 1
+    return None
+
+
+async def save_cv_parse(
+    req: Request,
+    file_hash: str,
+    prompt_version: str,
+    content_type: str,
+    raw_text: str,
+    parsed_data: Dict[str, Any],
+    user_id: str
+) -> CVParseCacheEntry:
+    """Store a CV parse uploaded by user_id, then evict least recently used entries over the limit"""
+    entry = await upsertDocument(
+        req, "cv_parse_cache", CVParseCacheEntry,
+        {"file_hash": file_hash, "prompt_version": prompt_version},
+        {"$set": {
+            "content_type": content_type,
+            "raw_text": raw_text,
+            "parsed_data": parsed_data,
+            "last_accessed_at": datetime.now(timezone.utc)
+        }, "$addToSet": {"user_ids": user_id}}
+    )
+    await _evict_least_recently_used(req)
+    return entry
+
+
+async def _evict_least_recently_used(req: Request) -> int:
+    """Delete the least recently used entries beyond CV_PARSE_CACHE_MAX_ENTRIES"""
+    collection = get_db_for_model(req.app, CVParseCacheEntry)
+    excess = await collection.estimated_document_count() - CV_PARSE_CACHE_MAX_ENTRIES
+    if excess <= 0:
+        return 0
+
+    oldest = await collection.find(
+        {}, {"_id": 1}
+    ).sort("last_accessed_at", ASCENDING).limit(excess).to_list(length=excess)
+    result = await collection.delete_many({"_id": {"$in": [document["_id"] for document in oldest]}})
+    CVParseCacheMetrics["evictions"] += result.deleted_count
+    return result.deleted_count
+
+
+async def delete_user_cv_parses(req: Request, user_id: str, raw_texts: List[str]) -> int:
+    """
+    Delete the entries of files user_id uploaded. Entries written before
+    owners were recorded are matched on the raw text of the user's CV
+    profiles instead.
+    """
+    collection = get_db_for_model(req.app, CVParseCacheEntry)
+    result = await collection.delete_many({"$or": [
+        {"user_ids": user_id},
+        {"user_ids": {"$exists": False}, "raw_text": {"$in": raw_texts}}
+    ]})
+    return result.deleted_count
+
+
+async def purge_stale_cv_parses(req: Request, prompt_version: str) -> int:
+    """Delete entries produced with any other prompt version"""
+    collection = get_db_for_model(req.app, CVParseCacheEntry)
+    result = await collection.delete_many({"prompt_version": {"$ne": prompt_version}})
+    return result.deleted_count
+
+
+async def get_cv_parse_cache_stats(req: Request, prompt_version: str) -> Dict[str, Any]:
+    """Hit rate since startup and stored entries per prompt version"""
+    lookups = CVParseCacheMetrics["hits"] + CVParseCacheMetrics["misses"]
+    by_version = await aggregateDocuments(req, "cv_parse_cache", CVParseCacheEntry, [
+        {"$group": {
+            "_id": "$prompt_version",
+            "entries": {"$sum": 1},
+            "hits": {"$sum": "$hit_count"}
+        }}
+    ])
+
+    return {
+        **CVParseCacheMetrics,
+        "hit_rate": round(CVParseCacheMetrics["hits"] / lookups, 3) if lookups else None,
+        "current_prompt_version": prompt_version,
+        "total_entries": await countAllDocuments(req, "cv_parse_cache", CVParseCacheEntry),
+        "entries_by_prompt_version": {
+            group["_id"]: {"entries": group["entries"], "hits": group["hits"]}
+            for group in by_version
+        }
+    }
@@ -4,22 +4,31 @@ from datetime import datetime, timezone
 
 from crud._generic._db_actions import createDocument, getDocument, getMultipleDocuments, updateDocument
 from models.interviews.cv_profile import CVProfile
+from crud.interviews.cv_parse_cache import hash_file_content, get_cached_cv_parse, save_cv_parse
 from services.cv_processing_service import CVProcessingService
+from utils.streaming.sse import FieldCallback
 
-async def create_cv_profile(req: Request, user_id: str, file_content: bytes, content_type: str, filename: str) -> CVProfile:
-    """Create a new CV profile for a user using OpenAI processing"""
+async def create_cv_profile(
+    req: Request,
+    user_id: str,
+    file_content: bytes,
+    content_type: str,
+    filename: str,
+    on_field: Optional[FieldCallback] = None
+) -> CVProfile:
+    """Create a new CV profile for a user using OpenAI processing, on_field streams the parsed fields"""
     
     # Initialize CV processing service
     cv_service = CVProcessingService()
     
     try:
-        # Process CV using OpenAI
-        openai_data = await cv_service.process_cv(file_content, content_type, filename)
+        # Process CV using OpenAI, or the cached parse of an identical file
+        raw_text, openai_data = await _parse_cv(req, cv_service, user_id, file_content, content_type, filename, on_field)
         
         # Convert to CVProfile structure
         cv_data = _convert_openai_to_cv_profile(
             user_id=user_id,
-            raw_text=_extract_raw_text(file_content, content_type),
+            raw_text=raw_text,
             openai_data=openai_data
         )
         
@@ -43,24 +52,33 @@ async def get_user_cv(req: Request, user_id: str) -> Optional[CVProfile]:
     )
     return cvs[0] if cvs else None
 
-async def update_cv_profile(req: Request, cv_id: str, file_content: bytes, content_type: str, filename: str) -> Optional[CVProfile]:
-    """Update an existing CV profile using OpenAI processing"""
+async def update_cv_profile(
+    req: Request,
+    cv_id: str,
+    file_content: bytes,
+    content_type: str,
+    filename: str,
+    on_field: Optional[FieldCallback] = None
+) -> Optional[CVProfile]:
+    """Update an existing CV profile using OpenAI processing, on_field streams the parsed fields"""
     
     # Initialize CV processing service
     cv_service = CVProcessingService()
     
     try:
-        # Process CV using OpenAI
-        openai_data = await cv_service.process_cv(file_content, content_type, filename)
-        
         # Get existing CV to preserve user_id
         existing_cv = await getDocument(req, "cv_profiles", CVProfile, _id=cv_id)
         if not existing_cv:
             raise HTTPException(status_code=404, detail="CV not found")
         
+        # Process CV using OpenAI, or the cached parse of an identical file
+        raw_text, openai_data = await _parse_cv(
+            req, cv_service, existing_cv.user_id, file_content, content_type, filename, on_field
+        )
+        
         # Convert to update data
         update_data = _convert_openai_to_update_data(
-            raw_text=_extract_raw_text(file_content, content_type),
+            raw_text=raw_text,
             openai_data=openai_data
         )
         
@@ -74,52 +92,49 @@ async def update_cv_profile(req: Request, cv_id: str, file_content: bytes, conte
     finally:
         await cv_service.close()
 
-# Helper functions for OpenAI data conversion
+async def _parse_cv(
+    req: Request,
+    cv_service: CVProcessingService,
+    user_id: str,
+    file_content: bytes,
+    content_type: str,
+    filename: str,
+    on_field: Optional[FieldCallback] = None
+) -> tuple[str, Dict[str, Any]]:
+    """
+    Parse a CV through the content-addressed cache, keyed by the file hash
+    and prompt version, and record user_id as one of the entry's owners.
+    Returns (raw_text, openai_data). Cache errors fall back to parsing,
+    they never fail the upload.
+    """
+    file_hash = hash_file_content(file_content)
+    prompt_version = cv_service.get_prompt_version()
 
-def _extract_raw_text(file_content: bytes, content_type: str) -> str:
-    """Extract raw text from file content for storage"""
-    import io
-    import PyPDF2
     try:
-        from docx import Document
-    except ImportError:
-        try:
-            from python_docx import Document
-        except ImportError:
-            Document = None
-    
+        cached = await get_cached_cv_parse(req, file_hash, prompt_version, user_id)
+        if cached:
+            print(f"CV parse cache hit for {filename} ({file_hash[:12]}, {prompt_version})")
+            if on_field:
+                for name, value in cached.parsed_data.items():
+                    await on_field(name, value)
+            return cached.raw_text, cached.parsed_data
+    except Exception as e:
+        print(f"CV parse cache lookup failed: {str(e)}")
+
+    # One extraction feeds both the OpenAI prompt and the stored raw text
+    document = await cv_service.extract_document(file_content, content_type)
+    print(f"Extracted {filename}: {document.page_count} pages, {len(document.text)} chars, {len(document.images)} page images")
+    openai_data = await cv_service.process_cv(file_content, content_type, filename, document, on_field)
+    raw_text = document.text
+
     try:
-        if content_type == 'text/plain':
-            return file_content.decode('utf-8')
-        elif content_type == 'application/pdf':
-            try:
-                import fitz  # PyMuPDF
-                doc = fitz.open(stream=file_content, filetype="pdf")
-                text = ""
-                for page_num in range(len(doc)):
-                    page = doc.load_page(page_num)
-                    text += page.get_text() + "\n"
-                doc.close()
-                return text.strip()
-            except:
-                # Fallback to PyPDF2
-                pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                return text.strip()
-        elif content_type in ['application/msword', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document']:
-            if Document is None:
-                return ""  # Fallback if docx is not available
-            doc = Document(io.BytesIO(file_content))
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text.strip()
-    except Exception:
-        return ""
-    
-    return ""
+        await save_cv_parse(req, file_hash, prompt_version, content_type, raw_text, openai_data, user_id)
+    except Exception as e:
+        print(f"CV parse cache write failed: {str(e)}")
+
+    return raw_text, openai_data
+
+# Helper functions for OpenAI data conversion
 
 def _convert_openai_to_cv_profile(user_id: str, raw_text: str, openai_data: Dict[str, Any]) -> CVProfile:
     """Convert OpenAI response to CVProfile model"""
@@ -0,0 +1,139 @@
+import uuid
+from fastapi import Request
+from typing import Optional, List
+from datetime import datetime, timezone, timedelta
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from crud._generic._db_actions import (
+    upsertDocument, getDocument, getMultipleDocuments, updateDocument, SortDirection
+)
+from crud._generic.model_mappings import get_db_for_model
+from models.interviews.grading_jobs import GradingJob
+
+
+async def enqueue_grading_job(req: Request, attempt_id: str, max_attempts: int = 5) -> GradingJob:
+    """
+    Enqueue grading for an attempt. Idempotent: if the attempt already
+    has a job (queued, running or finished) that job is returned as is.
+    """
+    now = datetime.now(timezone.utc)
+    try:
+        return await upsertDocument(
+            req, "grading_jobs", GradingJob,
+            {"attempt_id": attempt_id},
+            {"$setOnInsert": {
+                "status": "queued",
+                "attempts": 0,
+                "max_attempts": max_attempts,
+                "run_after": now,
+                "locked_until": None,
+                "lease_id": None,
+                "last_error": None,
+                "completed_at": None
+            }}
+        )
+    except DuplicateKeyError:
+        # Another request inserted the job between our match and insert
+        return await get_grading_job(req, attempt_id)
+
+
+async def get_grading_job(req: Request, attempt_id: str) -> Optional[GradingJob]:
+    """Get the grading job for an attempt"""
+    return await getDocument(req, "grading_jobs", GradingJob, attempt_id=attempt_id)
+
+
+async def get_grading_jobs(req: Request, status: str, limit: int = 50) -> List[GradingJob]:
+    """Get the most recently updated grading jobs in a given status"""
+    return await getMultipleDocuments(
+        req, "grading_jobs", GradingJob,
+        limit=limit,
+        order_by="updated_at",
+        order_direction=SortDirection.DESCENDING,
+        status=status
+    )
+
+
+async def claim_grading_job(req: Request, lease_seconds: int) -> Optional[GradingJob]:
+    """
+    Atomically claim the next due job for a worker. A running job whose
+    lease has expired (its worker died) is claimed again. Every claim gets
+    a new lease_id, so a worker that lost its lease can't change the job.
+    """
+    now = datetime.now(timezone.utc)
+    collection = get_db_for_model(req.app, GradingJob)
+    document = await collection.find_one_and_update(
+        {"$or": [
+            {"status": "queued", "run_after": {"$lte": now}},
+            {"status": "running", "locked_until": {"$lte": now}}
+        ]},
+        {
+            "$set": {
+                "status": "running",
+                "locked_until": now + timedelta(seconds=lease_seconds),
+                "lease_id": uuid.uuid4().hex,
+                "updated_at": now
+            },
+            "$inc": {"attempts": 1}
+        },
+        sort=[("run_after", 1)],
+        return_document=ReturnDocument.AFTER
+    )
+    return GradingJob(**document) if document else None
+
+
+async def renew_grading_job_lease(req: Request, job: GradingJob, lease_seconds: int) -> Optional[GradingJob]:
+    """Push the lease of a claimed job forward, None if the worker already lost the job"""
+    now = datetime.now(timezone.utc)
+    collection = get_db_for_model(req.app, GradingJob)
+    document = await collection.find_one_and_update(
+        {"attempt_id": job.attempt_id, "status": "running", "lease_id": job.lease_id},
+        {"$set": {"locked_until": now + timedelta(seconds=lease_seconds), "updated_at": now}},
+        return_document=ReturnDocument.AFTER
+    )
+    return GradingJob(**document) if document else None
+
+
+async def _update_claimed_job(req: Request, job: GradingJob, **fields) -> Optional[GradingJob]:
+    """
+    Update a job only if it is still held under the claim the worker got.
+    Returns None when the lease expired and the job was claimed again (or
+    finished) by another worker, which then owns it.
+    """
+    now = datetime.now(timezone.utc)
+    collection = get_db_for_model(req.app, GradingJob)
+    document = await collection.find_one_and_update(
+        {"attempt_id": job.attempt_id, "status": "running", "lease_id": job.lease_id},
+        {"$set": {**fields, "locked_until": None, "lease_id": None, "updated_at": now}},
+        return_document=ReturnDocument.AFTER
+    )
+    return GradingJob(**document) if document else None
+
+
+async def complete_grading_job(req: Request, job: GradingJob) -> Optional[GradingJob]:
+    """Mark a claimed grading job as done, None if the worker lost the job"""
+    return await _update_claimed_job(
+        req, job,
+        status="done",
+        completed_at=datetime.now(timezone.utc)
+    )
+
+
+async def retry_grading_job(req: Request, job: GradingJob, error: str, delay_seconds: float) -> Optional[GradingJob]:
+    """Put a failed claimed grading job back in the queue after a backoff delay, None if the worker lost the job"""
+    return await _update_claimed_job(
+        req, job,
+        status="queued",
+        last_error=error,
+        run_after=datetime.now(timezone.utc) + timedelta(seconds=delay_seconds)
+    )
+
+
+async def dead_letter_grading_job(req: Request, job: GradingJob, error: str) -> Optional[GradingJob]:
+    """Move a claimed grading job that ran out of attempts to the dead state, None if the worker lost the job"""
+    return await _update_claimed_job(
+        req, job,
+        status="dead",
+        last_error=error,
+        completed_at=datetime.now(timezone.utc)
+    )
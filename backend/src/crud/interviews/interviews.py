@@ -5,11 +5,12 @@ import json
 from datetime import datetime, timezone
 from bson import ObjectId
 
-from crud._generic._db_actions import createDocument, getDocument, getMultipleDocuments, updateDocument, countDocuments, SortDirection
-from models.interviews.interviews import Interview
+from crud._generic._db_actions import createDocument, getDocument, getMultipleDocuments, getDocumentsPage, updateDocument, countDocuments, SortDirection
+from models.interviews.interviews import Interview, InterviewListView
 from models.interviews.interview_types import InterviewType
 from services.job_processing_service import JobProcessingService
 from crud.companies import get_or_create_company_info
+from crud.jobs.job_url_cache import get_job_data_for_url
 from crud._generic.model_mappings import get_db_for_model
 from utils.mongo_helpers import serialize_mongo_document
 
@@ -26,7 +27,7 @@ async def create_interview_from_url(
     
     try:
         print(f"Processing job URL content...")
-        job_data = await job_processor.process_job_url(job_url)
+        job_data = await get_job_data_for_url(req, job_processor, job_url)
         print(f"Successfully processed job URL. Company: {job_data.get('company', 'N/A')}, Role: {job_data.get('role_title', 'N/A')}")
     except Exception as e:
         print(f"Failed to process job URL {job_url}: {str(e)}")
@@ -229,18 +230,35 @@ async def get_user_interviews(
     req: Request, 
     user_id: str, 
     page_size: int = 10,
-    skip: int = 0
+    skip: int = 0,
+    cursor: Optional[str] = None
 ) -> Dict[str, Any]:
-    """Get all interviews for a user with pagination"""
+    """Get all interviews for a user, paginated by skip or, when a cursor is given, by keyset"""
+    
+    if cursor is not None:
+        page = await getDocumentsPage(
+            req, "interviews", Interview,
+            limit=page_size,
+            cursor=cursor,
+            ProjectionModel=InterviewListView,
+            user_id=user_id
+        )
+        return {
+            "interviews": page["documents"],
+            "has_more": page["has_more"],
+            "total_count": None,
+            "next_cursor": page["next_cursor"]
+        }
     
-    # Get interviews
+    # Get interviews, without the job description payload
     interviews = await getMultipleDocuments(
         req, "interviews", Interview,
         user_id=user_id,
         order_by="created_at",
         order_direction=SortDirection.DESCENDING,
         limit=page_size,
-        skip=skip
+        skip=skip,
+        ProjectionModel=InterviewListView
     )
     
     # Get total count for pagination
@@ -546,16 +564,18 @@ async def update_interview_scores(req: Request, interview_id: str) -> Optional[I
     if not attempts:
         return await get_interview(req, interview_id)
     
-    # Get feedback scores for all attempts
-    scores = []
-    for attempt in attempts:
-        try:
-            from crud.interviews.attempts import get_attempt_feedback
-            feedback = await get_attempt_feedback(req, str(attempt.id))
-            if feedback:
-                scores.append(feedback.overall_score)
-        except Exception:
-            continue
+    # Get feedback scores for all attempts in a single query
+    from crud._generic._db_actions import batchGetRelatedDocuments
+    from models.interviews.attempts import InterviewFeedback
+    feedback_by_attempt = await batchGetRelatedDocuments(
+        req, "interview_feedback", InterviewFeedback,
+        attempts, foreign_key="attempt_id"
+    )
+    scores = [
+        feedback.overall_score
+        for feedback_list in feedback_by_attempt.values()
+        for feedback in feedback_list
+    ]
     
     if not scores:
         return await get_interview(req, interview_id)
@@ -568,5 +588,5 @@ async def update_interview_scores(req: Request, interview_id: str) -> Optional[I
         best_score=best_score,
         average_score=round(average_score, 1),
         total_attempts=len(attempts),
-        last_attempt_date=attempts[0].created_at if attempts else None
+        last_attempt_date=attempts[0].created_at.isoformat() if attempts else None
     )
\ No newline at end of file
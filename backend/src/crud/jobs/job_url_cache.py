@@ -0,0 +1,187 @@
+import copy
+import hashlib
+import re
+from fastapi import Request
+from typing import Optional, Dict, Any
+from datetime import datetime, timezone, timedelta
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from decouple import config
+
+from crud._generic._db_actions import getDocument, updateDocument, upsertDocument
+from models.jobs import JobUrlCacheEntry
+from services.job_processing_service import JobProcessingService
+from utils.concurrency.single_flight import SingleFlight
+
+# Cached postings younger than this are served without contacting the site
+JOB_URL_CACHE_FRESH_SECONDS = config('JOB_URL_CACHE_FRESH_HOURS', default=24, cast=int) * 60 * 60
+
+# Query parameters that identify the visitor or campaign, not the posting
+TRACKING_PARAMS = {
+    'gclid', 'fbclid', 'msclkid', 'mc_cid', 'mc_eid', '_ga', 'ref', 'refid',
+    'trackingid', 'trk', 'trkinfo', 'lipi', 'gh_src', 'lever-source', 'lever-origin'
+}
+
+# Ingestions served by this process since startup
+JobUrlCacheMetrics: Dict[str, int] = {
+    "hits": 0,          # fresh entry served as is
+    "revalidated": 0,   # stale entry confirmed by a 304
+    "unchanged": 0,     # stale entry re-fetched, text identical so not re-extracted
+    "misses": 0,        # scraped and extracted with OpenAI
+    "coalesced": 0      # waited on another request's fetch of the same URL
+}
+
+# Concurrent requests for the same canonical URL share one fetch
+_job_url_single_flight = SingleFlight()
+
+
+def canonicalize_job_url(url: str) -> str:
+    """
+    Normalize a job posting URL so copies of the same posting share a
+    cache entry: lowercase scheme and host, no www, fragment, trailing
+    slash or tracking parameters, sorted query, and LinkedIn postings
+    reduced to /jobs/view/<id>. Only a cache key, the site may not serve
+    the posting at this URL.
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    netloc = f"{host}:{parts.port}" if parts.port and parts.port not in (80, 443) else host
+
+    path = parts.path.rstrip('/') or '/'
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith('utm_')
+    ]
+
+    if host.endswith('linkedin.com'):
+        # /jobs/view/<slug>-<id> and search pages with currentJobId=<id> are the same posting
+        view_match = re.match(r'^/jobs/view/(?:[^/]*-)?(\d+)$', path)
+        current_job_id = dict(query).get('currentJobId')
+        if view_match:
+            path, query = f"/jobs/view/{view_match.group(1)}", []
+        elif current_job_id and current_job_id.isdigit():
+            path, query = f"/jobs/view/{current_job_id}", []
+
+    return urlunsplit((parts.scheme.lower(), netloc, path, urlencode(sorted(query)), ''))
+
+
+def _hash_content(content: str) -> str:
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+async def get_job_data_for_url(req: Request, job_processor: JobProcessingService, url: str) -> Dict[str, Any]:
+    """
+    Get the extracted job data for a posting URL through the URL cache.
+    The cache is keyed by the canonical URL, but the page is always fetched
+    from the URL as submitted. Concurrent calls for the same canonical URL
+    share a single fetch. Each caller gets its own copy of the job data.
+    """
+    canonical_url = canonicalize_job_url(url)
+
+    if _job_url_single_flight.is_in_flight(canonical_url):
+        JobUrlCacheMetrics["coalesced"] += 1
+        print(f"Joining in-flight fetch for {canonical_url}")
+
+    job_data = await _job_url_single_flight.do(
+        canonical_url, lambda: _load_job_data(req, job_processor, canonical_url, url)
+    )
+    return copy.deepcopy(job_data)
+
+
+async def _load_job_data(
+    req: Request,
+    job_processor: JobProcessingService,
+    canonical_url: str,
+    url: str
+) -> Dict[str, Any]:
+    now = datetime.now(timezone.utc)
+    entry = await getDocument(req, "job_url_cache", JobUrlCacheEntry, canonical_url=canonical_url)
+
+    if entry and now - entry.fetched_at < timedelta(seconds=JOB_URL_CACHE_FRESH_SECONDS):
+        JobUrlCacheMetrics["hits"] += 1
+        print(f"Job URL cache hit for {canonical_url}")
+        await _touch_entry(req, entry, fetched=False)
+        return entry.job_data
+
+    if entry:
+        # Stale: ask the site whether the posting changed since we fetched it
+        try:
+            page = await job_processor.scrape_job_page(url, entry.etag, entry.last_modified)
+        except Exception as e:
+            # Site unreachable or posting removed, the last extraction is still the best answer
+            print(f"Revalidation failed for {canonical_url}, serving cached data: {str(e)}")
+            await _touch_entry(req, entry, fetched=False)
+            return entry.job_data
+
+        if page is None:
+            JobUrlCacheMetrics["revalidated"] += 1
+            print(f"Job URL cache revalidated (304) for {canonical_url}")
+            await _touch_entry(req, entry, fetched=True)
+            return entry.job_data
+
+        if _hash_content(page["content"]) == entry.content_hash:
+            JobUrlCacheMetrics["unchanged"] += 1
+            print(f"Job URL cache revalidated (content unchanged) for {canonical_url}")
+            await _touch_entry(req, entry, fetched=True, page=page)
+            return entry.job_data
+    else:
+        try:
+            page = await job_processor.scrape_job_page(url)
+        except Exception as e:
+            # process_job_url retries the scrape and owns the web search fallback
+            print(f"Scrape failed for {canonical_url}, handing over to process_job_url: {str(e)}")
+            page = None
+
+    JobUrlCacheMetrics["misses"] += 1
+    job_data = await job_processor.process_job_url(url, page)
+
+    # Only data extracted from the page itself is worth sharing
+    if page and job_data.get('extraction_method') == 'direct_scraping':
+        try:
+            await _save_entry(req, canonical_url, page, job_data)
+        except Exception as e:
+            print(f"Job URL cache write failed for {canonical_url}: {str(e)}")
+
+    return job_data
+
+
+async def _touch_entry(
+    req: Request,
+    entry: JobUrlCacheEntry,
+    fetched: bool,
+    page: Optional[Dict[str, Any]] = None
+) -> None:
+    """Record a hit, and a successful revalidation when fetched is set"""
+    now = datetime.now(timezone.utc)
+    update_fields = {"last_accessed_at": now}
+    if fetched:
+        update_fields["fetched_at"] = now
+    if page:
+        update_fields["etag"] = page.get("etag")
+        update_fields["last_modified"] = page.get("last_modified")
+
+    try:
+        await updateDocument(
+            req, "job_url_cache", JobUrlCacheEntry, entry.id, fast=True,
+            raw_update={"$set": update_fields, "$inc": {"hit_count": 1}}
+        )
+    except Exception as e:
+        print(f"Job URL cache update failed for {entry.canonical_url}: {str(e)}")
+
+
+async def _save_entry(req: Request, canonical_url: str, page: Dict[str, Any], job_data: Dict[str, Any]) -> JobUrlCacheEntry:
+    now = datetime.now(timezone.utc)
+    return await upsertDocument(
+        req, "job_url_cache", JobUrlCacheEntry,
+        {"canonical_url": canonical_url},
+        {"$set": {
+            "content_hash": _hash_content(page["content"]),
+            "scraped_text": page["content"],
+            "job_data": job_data,
+            "etag": page.get("etag"),
+            "last_modified": page.get("last_modified"),
+            "fetched_at": now,
+            "last_accessed_at": now
+        }}
+    )
@@ -1,15 +1,93 @@
-from typing import List, Optional, Dict, Any
+import json
+import time
+from dataclasses import asdict
+from typing import Awaitable, Callable, List, Optional, Dict, Any, Tuple
 from datetime import datetime, timezone
 from fastapi import Request
+from decouple import config
 
-from models.jobs import Job
+from models.jobs import Job, JobListView
 from models.interviews import Interview
 from models.interviews.interview_types import InterviewType
 from services.job_processing_service import JobProcessingService
 from services.interview_stage_service import InterviewStageService
-from crud._generic._db_actions import createDocument, getDocument, getMultipleDocuments, updateDocument, countDocuments, SortDirection
-from crud.interviews.interviews import create_interview_for_job
+from crud._generic._db_actions import createDocument, createMultipleDocuments, getDocument, getMultipleDocuments, getDocumentsPage, updateDocument, countDocuments, runTransaction, SortDirection
 from crud.companies import get_or_create_company_info
+from crud.jobs.job_url_cache import get_job_data_for_url
+from utils.streaming.sse import FieldCallback
+from utils.concurrency.task_graph import Stage, run_task_graph
+
+# Per-stage limits of the job creation pipeline, past which the stage falls back
+COMPANY_INFO_TIMEOUT_SECONDS = config('COMPANY_INFO_TIMEOUT_SECONDS', default=10, cast=float)
+STAGE_DETECTION_TIMEOUT_SECONDS = config('STAGE_DETECTION_TIMEOUT_SECONDS', default=30, cast=float)
+
+
+# Outcome of interview stage detection for the jobs created since startup:
+# ai (AI stages used), rules (AI found nothing confident) or ai_failed
+# (the AI call errored or timed out and the business rules were used)
+JobPipelineMetrics: Dict[str, int] = {"stage_detection.ai": 0, "stage_detection.rules": 0, "stage_detection.ai_failed": 0}
+
+
+class JobPipelineContext:
+    """
+    State of one job creation: the services it calls, open from extraction
+    until the job is saved, and the stage results as the pipeline produces
+    them. Use as `async with JobPipelineContext(req) as pipeline`.
+    """
+    
+    def __init__(self, req: Request):
+        self.req = req
+        self.job_processor = JobProcessingService()
+        self.results: Dict[str, Any] = {}
+        self.stage_detection: Optional[str] = None
+    
+    async def __aenter__(self) -> "JobPipelineContext":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.job_processor.close()
+    
+    def record_stage_detection(self, outcome: str) -> None:
+        self.stage_detection = outcome
+        JobPipelineMetrics[f"stage_detection.{outcome}"] += 1
+
+
+def _build_stage_interviews(job: Job, job_data: Dict[str, Any], interview_stages: List[InterviewType]) -> List[Interview]:
+    """Build one Interview per stage of a job so they can be written with a single insert"""
+    interviews = []
+    for index, stage in enumerate(interview_stages):
+        difficulty = InterviewStageService.get_stage_difficulty(stage, job.experience_level)
+        focus_areas = InterviewStageService.get_stage_focus_areas(stage, job_data)
+        
+        print(f"Interview {index + 1}/{len(interview_stages)}: {stage.value} - Difficulty: {difficulty}, Focus areas: {focus_areas}")
+        
+        interviews.append(Interview(
+            job_id=str(job.id),
+            user_id=job.user_id,
+            company=job.company,
+            role_title=job.role_title,
+            company_logo_url=job.company_logo_url,
+            brandfetch_identifier_type=job.brandfetch_identifier_type,
+            brandfetch_identifier_value=job.brandfetch_identifier_value,
+            interview_type=stage,
+            stage_order=index,
+            status="pending",
+            difficulty=difficulty,
+            focus_areas=focus_areas or [],
+            created_at=datetime.now(timezone.utc)
+        ))
+    return interviews
+
+
+async def _save_job_with_interviews(req: Request, job: Job, interviews: List[Interview]) -> Job:
+    """Insert a job and its interviews, in one transaction where the deployment supports it"""
+    async def write(session):
+        created_job = await createDocument(req, "jobs", Job, job, session=session)
+        if interviews:
+            await createMultipleDocuments(req, "interviews", Interview, interviews, session=session)
+        return created_job
+    
+    return await runTransaction(req, write)
 
 
 async def create_job_from_url(
@@ -21,41 +99,108 @@ async def create_job_from_url(
     
     print(f"Starting job creation from URL for user {user_id}: {job_url}")
     
-    # Process the job URL to extract details
-    print(f"Initializing JobProcessingService to process URL: {job_url}")
-    job_processor = JobProcessingService()
-    try:
-        print(f"Processing job URL content...")
-        job_data = await job_processor.process_job_url(job_url)
-        print(f"Successfully processed job URL. Company: {job_data.get('company', 'N/A')}, Role: {job_data.get('role_title', 'N/A')}")
-    except Exception as e:
-        print(f"Failed to process job URL {job_url}: {str(e)}")
-        raise
-    finally:
-        await job_processor.close()
-        print("JobProcessingService client closed")
+    async with JobPipelineContext(req) as pipeline:
+        async def load_job_data(_) -> Dict[str, Any]:
+            try:
+                print(f"Processing job URL content...")
+                job_data = await get_job_data_for_url(req, pipeline.job_processor, job_url)
+                print(f"Successfully processed job URL. Company: {job_data.get('company', 'N/A')}, Role: {job_data.get('role_title', 'N/A')}")
+                return job_data
+            except Exception as e:
+                print(f"Failed to process job URL {job_url}: {str(e)}")
+                raise
+        
+        # Note: We don't use the job URL as company website since job postings can be on platforms like LinkedIn
+        job_data, job = await _run_job_pipeline(
+            pipeline, load_job_data, use_company_website=False,
+            user_id=user_id, source_type="url", source_url=job_url
+        )
+        
+        created_job = await _save_job(req, job, job_data)
+    print(f"Job creation completed successfully. Job ID: {created_job.id}, Company: {job_data['company']}, Role: {job_data['role_title']}")
+    return created_job
+
+
+async def create_job_from_file(
+    req: Request,
+    user_id: str,
+    file_content: bytes,
+    content_type: str,
+    filename: str,
+    on_field: Optional[FieldCallback] = None
+) -> Job:
+    """Create a new job and its interview stages from an uploaded file, on_field streams the parsed fields"""
     
-    # Get or create company info with Brandfetch identifiers
-    # Note: We don't use the job URL as company website since job postings can be on platforms like LinkedIn
-    print(f"Getting or creating company info for: {job_data['company']} (using company name only)")
-    try:
-        brandfetch_info = await get_or_create_company_info(
-            req,
-            job_data["company"],
-            None  # Don't pass job URL as company website - use company name only
+    print(f"Starting job creation from file for user {user_id}: {filename} ({content_type}, {len(file_content)} bytes)")
+    
+    async with JobPipelineContext(req) as pipeline:
+        async def load_job_data(_) -> Dict[str, Any]:
+            try:
+                print(f"Processing file content...")
+                job_data = await pipeline.job_processor.process_job_file(
+                    file_content, content_type, filename, on_field
+                )
+                print(f"Successfully processed file. Company: {job_data.get('company', 'N/A')}, Role: {job_data.get('role_title', 'N/A')}")
+                return job_data
+            except Exception as e:
+                print(f"Failed to process file {filename}: {str(e)}")
+                raise
+        
+        job_data, job = await _run_job_pipeline(
+            pipeline, load_job_data, use_company_website=True,
+            user_id=user_id, source_type="file"
         )
-        if brandfetch_info:
-            print(f"Retrieved Brandfetch info: {brandfetch_info[0]}={brandfetch_info[1]}")
-        else:
-            print(f"No Brandfetch info found for company: {job_data['company']}")
-    except Exception as e:
-        print(f"Error getting company info for {job_data['company']}: {str(e)}")
-        brandfetch_info = None
+        
+        created_job = await _save_job(req, job, job_data)
+    print(f"Job creation from file completed successfully. Job ID: {created_job.id}, Company: {job_data['company']}, Role: {job_data['role_title']}")
+    return created_job
+
+
+async def _run_job_pipeline(
+    pipeline: "JobPipelineContext",
+    load_job_data: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]],
+    use_company_website: bool,
+    **job_fields
+) -> Tuple[Dict[str, Any], Job]:
+    """
+    Extract the job data, then look up the company's Brandfetch identifiers
+    and detect the interview stages concurrently, as both only need the job
+    data. Each lookup has its own timeout and falls back (no logo, business
+    rule stages) rather than failing the job. Logs one [JOB-PIPELINE] line
+    with the per-stage timings.
+    """
+    stages = [
+        Stage("job_data", load_job_data),
+        Stage(
+            "company_info",
+            lambda results: _lookup_company_info(pipeline.req, results["job_data"], use_company_website),
+            depends_on=["job_data"],
+            timeout=COMPANY_INFO_TIMEOUT_SECONDS,
+            fallback=lambda results: None
+        ),
+        Stage(
+            "interview_stages",
+            lambda results: _detect_interview_stages(pipeline, results["job_data"]),
+            depends_on=["job_data"],
+            timeout=STAGE_DETECTION_TIMEOUT_SECONDS,
+            fallback=lambda results: _stage_detection_failed(pipeline, results["job_data"])
+        ),
+    ]
+    
+    started = time.perf_counter()
+    pipeline.results, timings = await run_task_graph(stages)
+    results = pipeline.results
+    job_data = results["job_data"]
+    print("[JOB-PIPELINE] " + json.dumps({
+        "source_type": job_fields["source_type"],
+        "total_ms": round((time.perf_counter() - started) * 1000, 1),
+        "stage_detection": pipeline.stage_detection,
+        "stages": {name: asdict(timing) for name, timing in timings.items()}
+    }))
     
     # Create the job record
     print("Creating job record with extracted data")
     job = Job(
-        user_id=user_id,
         company=job_data["company"],
         role_title=job_data["role_title"],
         company_logo_url=job_data.get("company_logo_url"),
@@ -65,12 +210,12 @@ async def create_job_from_url(
         salary_range=job_data.get("salary_range", ""),
         jd_raw=job_data.get("jd_raw", ""),
         job_description=job_data.get("job_description", {}),
-        source_type="url",
-        source_url=job_url,
-        created_at=datetime.now(timezone.utc)
+        created_at=datetime.now(timezone.utc),
+        **job_fields
     )
     
     # Add Brandfetch identifiers if found
+    brandfetch_info = results["company_info"]
     if brandfetch_info:
         job.brandfetch_identifier_type = brandfetch_info[0]
         job.brandfetch_identifier_value = brandfetch_info[1]
@@ -78,214 +223,92 @@ async def create_job_from_url(
     else:
         print("No Brandfetch identifiers to add - will use fallback logo handling")
     
-    # Determine interview stages using AI-enhanced detection
-    print("Determining interview stages for job with AI enhancement")
-    try:
-        # Try AI-enhanced detection first
-        raw_job_content = job_data.get("jd_raw", "") + "\n" + str(job_data.get("job_description", {}))
-        interview_stages, stage_metadata = await InterviewStageService.determine_interview_stages_with_ai(
-            job_data=job_data,
-            job_processor=job_processor,
-            raw_job_content=raw_job_content
-        )
-        
-        job.interview_stages = interview_stages
-        print(f"Determined {len(interview_stages)} interview stages using {stage_metadata['detection_method']}: {[stage.value for stage in interview_stages]}")
-        print(f"AI stages used: {stage_metadata['ai_stages_used']}, Fallback stages: {stage_metadata['fallback_stages_used']}, Confidence: {stage_metadata['confidence_score']}")
-        
-        # Store metadata in job_description for debugging/analytics
-        if "metadata" not in job_data:
-            job_data["metadata"] = {}
-        job_data["metadata"]["stage_detection"] = stage_metadata
-        
-    except Exception as e:
-        print(f"Error with AI-enhanced stage detection, falling back to business rules: {str(e)}")
-        # Fallback to original method
-        interview_stages = InterviewStageService.determine_interview_stages(job_data)
-        job.interview_stages = interview_stages
-        print(f"Fallback determined {len(interview_stages)} interview stages: {[stage.value for stage in interview_stages]}")
-    
-    # Save the job using generic CRUD
-    print("Saving job to database")
-    try:
-        created_job = await createDocument(req, "jobs", Job, job)
-        print(f"Successfully created job with ID: {created_job.id}")
-    except Exception as e:
-        print(f"Failed to save job to database: {str(e)}")
-        raise
-    
-    # Create interview records for each stage
-    print(f"Creating {len(interview_stages)} interview records")
-    try:
-        for index, stage in enumerate(interview_stages):
-            print(f"Creating interview {index + 1}/{len(interview_stages)}: {stage.value}")
-            
-            difficulty = InterviewStageService.get_stage_difficulty(stage, job.experience_level)
-            focus_areas = InterviewStageService.get_stage_focus_areas(stage, job_data)
-            
-            print(f"Interview {index + 1} details - Difficulty: {difficulty}, Focus areas: {focus_areas}")
-            
-            await create_interview_for_job(
-                req=req,
-                job_id=str(created_job.id),
-                user_id=user_id,
-                interview_type=stage,
-                stage_order=index,
-                difficulty=difficulty,
-                focus_areas=focus_areas
-            )
-            
-            print(f"Successfully created interview {index + 1}: {stage.value}")
-        
-        print(f"Successfully created all {len(interview_stages)} interview records")
-    except Exception as e:
-        print(f"Error creating interview records: {str(e)}")
-        raise
-    
-    print(f"Job creation completed successfully. Job ID: {created_job.id}, Company: {job_data['company']}, Role: {job_data['role_title']}")
-    return created_job
+    job.interview_stages = results["interview_stages"]
+    return job_data, job
 
 
-async def create_job_from_file(
+async def _lookup_company_info(
     req: Request,
-    user_id: str,
-    file_content: bytes,
-    content_type: str,
-    filename: str
-) -> Job:
-    """Create a new job and its interview stages from an uploaded file"""
-    
-    print(f"Starting job creation from file for user {user_id}: {filename} ({content_type}, {len(file_content)} bytes)")
-    
-    # Process the file to extract job details
-    print(f"Initializing JobProcessingService to process file: {filename}")
-    job_processor = JobProcessingService()
-    try:
-        print(f"Processing file content...")
-        job_data = await job_processor.process_job_file(
-            file_content, content_type, filename
-        )
-        print(f"Successfully processed file. Company: {job_data.get('company', 'N/A')}, Role: {job_data.get('role_title', 'N/A')}")
-    except Exception as e:
-        print(f"Failed to process file {filename}: {str(e)}")
-        raise
-    finally:
-        await job_processor.close()
-        print("JobProcessingService client closed")
-    
-    # Get or create company info with Brandfetch identifiers
-    # Try to extract company website from job description metadata if available
-    company_website = job_data.get("job_description", {}).get("metadata", {}).get("company_website")
+    job_data: Dict[str, Any],
+    use_company_website: bool
+) -> Optional[Tuple[str, str]]:
+    """Get or create company info with Brandfetch identifiers"""
+    company_website = None
+    if use_company_website:
+        # Try to extract company website from job description metadata if available
+        company_website = job_data.get("job_description", {}).get("metadata", {}).get("company_website")
     if company_website:
         print(f"Getting or creating company info for: {job_data['company']} (found company website: {company_website})")
     else:
-        print(f"Getting or creating company info for: {job_data['company']} (using company name only, no website found in job description)")
+        print(f"Getting or creating company info for: {job_data['company']} (using company name only)")
     
     try:
         brandfetch_info = await get_or_create_company_info(
             req,
             job_data["company"],
-            company_website  # This will be None if not found in job description
+            company_website  # None if not found in job description
         )
         if brandfetch_info:
             print(f"Retrieved Brandfetch info: {brandfetch_info[0]}={brandfetch_info[1]}")
         else:
             print(f"No Brandfetch info found for company: {job_data['company']}")
+        return brandfetch_info
     except Exception as e:
         print(f"Error getting company info for {job_data['company']}: {str(e)}")
-        brandfetch_info = None
-    
-    # Create the job record
-    print("Creating job record with extracted data from file")
-    job = Job(
-        user_id=user_id,
-        company=job_data["company"],
-        role_title=job_data["role_title"],
-        company_logo_url=job_data.get("company_logo_url"),
-        location=job_data.get("location", ""),
-        employment_type=job_data.get("employment_type", "full-time"),
-        experience_level=job_data.get("experience_level", "mid"),
-        salary_range=job_data.get("salary_range", ""),
-        jd_raw=job_data.get("jd_raw", ""),
-        job_description=job_data.get("job_description", {}),
-        source_type="file",
-        created_at=datetime.now(timezone.utc)
-    )
-    
-    # Add Brandfetch identifiers if found
-    if brandfetch_info:
-        job.brandfetch_identifier_type = brandfetch_info[0]
-        job.brandfetch_identifier_value = brandfetch_info[1]
-        print(f"Added Brandfetch identifiers to job record")
-    else:
-        print("No Brandfetch identifiers to add - will use fallback logo handling")
-    
-    # Determine interview stages using AI-enhanced detection
+        return None
+
+
+async def _detect_interview_stages(pipeline: "JobPipelineContext", job_data: Dict[str, Any]) -> List[InterviewType]:
+    """Determine interview stages using AI-enhanced detection"""
     print("Determining interview stages for job with AI enhancement")
     try:
         # Try AI-enhanced detection first
         raw_job_content = job_data.get("jd_raw", "") + "\n" + str(job_data.get("job_description", {}))
         interview_stages, stage_metadata = await InterviewStageService.determine_interview_stages_with_ai(
             job_data=job_data,
-            job_processor=job_processor,
+            job_processor=pipeline.job_processor,
             raw_job_content=raw_job_content
         )
-        
-        job.interview_stages = interview_stages
-        print(f"Determined {len(interview_stages)} interview stages using {stage_metadata['detection_method']}: {[stage.value for stage in interview_stages]}")
-        print(f"AI stages used: {stage_metadata['ai_stages_used']}, Fallback stages: {stage_metadata['fallback_stages_used']}, Confidence: {stage_metadata['confidence_score']}")
-        
-        # Store metadata in job_description for debugging/analytics
-        if "metadata" not in job_data:
-            job_data["metadata"] = {}
-        job_data["metadata"]["stage_detection"] = stage_metadata
-        
     except Exception as e:
         print(f"Error with AI-enhanced stage detection, falling back to business rules: {str(e)}")
-        # Fallback to original method
-        interview_stages = InterviewStageService.determine_interview_stages(job_data)
-        job.interview_stages = interview_stages
-        print(f"Fallback determined {len(interview_stages)} interview stages: {[stage.value for stage in interview_stages]}")
+        return _stage_detection_failed(pipeline, job_data)
     
-    # Save the job using generic CRUD
-    print("Saving job to database")
-    try:
-        created_job = await createDocument(req, "jobs", Job, job)
-        print(f"Successfully created job with ID: {created_job.id}")
-    except Exception as e:
-        print(f"Failed to save job to database: {str(e)}")
-        raise
+    print(f"Determined {len(interview_stages)} interview stages using {stage_metadata['detection_method']}: {[stage.value for stage in interview_stages]}")
+    print(f"AI stages used: {stage_metadata['ai_stages_used']}, Fallback stages: {stage_metadata['fallback_stages_used']}, Confidence: {stage_metadata['confidence_score']}")
     
-    # Create interview records for each stage
-    print(f"Creating {len(interview_stages)} interview records")
+    # Store metadata in job_description for debugging/analytics
+    if "metadata" not in job_data:
+        job_data["metadata"] = {}
+    job_data["metadata"]["stage_detection"] = stage_metadata
+    
+    ai_detection = stage_metadata.get("ai_detection_data") or {}
+    if ai_detection.get("detection_method") == "failed":
+        pipeline.record_stage_detection("ai_failed")
+    elif stage_metadata["detection_method"] == "fallback_only":
+        pipeline.record_stage_detection("rules")
+    else:
+        pipeline.record_stage_detection("ai")
+    return interview_stages
+
+
+def _stage_detection_failed(pipeline: "JobPipelineContext", job_data: Dict[str, Any]) -> List[InterviewType]:
+    pipeline.record_stage_detection("ai_failed")
+    interview_stages = InterviewStageService.determine_interview_stages(job_data)
+    print(f"Fallback determined {len(interview_stages)} interview stages: {[stage.value for stage in interview_stages]}")
+    return interview_stages
+
+
+async def _save_job(req: Request, job: Job, job_data: Dict[str, Any]) -> Job:
+    """Save the job and one interview per stage together"""
+    print(f"Saving job with {len(job.interview_stages)} interview records to database")
     try:
-        for index, stage in enumerate(interview_stages):
-            print(f"Creating interview {index + 1}/{len(interview_stages)}: {stage.value}")
-            
-            difficulty = InterviewStageService.get_stage_difficulty(stage, job.experience_level)
-            focus_areas = InterviewStageService.get_stage_focus_areas(stage, job_data)
-            
-            print(f"Interview {index + 1} details - Difficulty: {difficulty}, Focus areas: {focus_areas}")
-            
-            await create_interview_for_job(
-                req=req,
-                job_id=str(created_job.id),
-                user_id=user_id,
-                interview_type=stage,
-                stage_order=index,
-                difficulty=difficulty,
-                focus_areas=focus_areas
-            )
-            
-            print(f"Successfully created interview {index + 1}: {stage.value}")
-        
-        print(f"Successfully created all {len(interview_stages)} interview records")
+        interviews = _build_stage_interviews(job, job_data, job.interview_stages)
+        created_job = await _save_job_with_interviews(req, job, interviews)
+        print(f"Successfully created job with ID: {created_job.id} and {len(interviews)} interviews")
+        return created_job
     except Exception as e:
-        print(f"Error creating interview records: {str(e)}")
+        print(f"Failed to save job and interviews to database: {str(e)}")
         raise
-    
-    print(f"Job creation from file completed successfully. Job ID: {created_job.id}, Company: {job_data['company']}, Role: {job_data['role_title']}")
-    return created_job
 
 
 async def get_job(req: Request, job_id: str) -> Optional[Job]:
@@ -293,8 +316,24 @@ async def get_job(req: Request, job_id: str) -> Optional[Job]:
     return await getDocument(req, "jobs", Job, _id=job_id)
 
 
-async def get_user_jobs(req: Request, user_id: str, limit: int = 10, skip: int = 0) -> Dict[str, Any]:
-    """Get all jobs for a user with pagination metadata"""
+async def get_user_jobs(req: Request, user_id: str, limit: int = 10, skip: int = 0, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """Get all jobs for a user with pagination metadata, by skip or, when a cursor is given, by keyset"""
+    if cursor is not None:
+        page = await getDocumentsPage(
+            req, "jobs", Job,
+            limit=limit,
+            cursor=cursor,
+            ProjectionModel=JobListView,
+            user_id=user_id
+        )
+        return {
+            "jobs": page["documents"],
+            "has_more": page["has_more"],
+            "total_count": None,
+            "current_page_size": len(page["documents"]),
+            "next_cursor": page["next_cursor"]
+        }
+    
     # Get the jobs
     jobs = await getMultipleDocuments(
         req, 
@@ -303,7 +342,8 @@ async def get_user_jobs(req: Request, user_id: str, limit: int = 10, skip: int =
         user_id=user_id, 
         order_by="created_at",
         limit=limit,
-        skip=skip
+        skip=skip,
+        ProjectionModel=JobListView
     )
     
     # Get total count to determine if there are more pages
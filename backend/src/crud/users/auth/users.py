@@ -6,8 +6,13 @@ import stripe
 import logging
 
 from models.users.users import User, UpdateUserProfile, SubscriptionDetails
+from models.users.user_stats import UserStats
+from models.interviews.interviews import Interview
+from models.interviews.cv_profile import CVProfile
+from models.interviews.attempts import InterviewAttempt
 from models.users.authenticated_user import AuthenticatedUser
 from crud._generic import _db_actions
+from crud.interviews.cv_parse_cache import delete_user_cv_parses
 
 from authentication import Authorization
 
@@ -124,6 +129,7 @@ async def update_user_last_active_at(req:Request, user_id:str):
         collection_name='users',
         BaseModel=User,
         document_id=user_id,
+        fast=True,
         **streak_updates
     )
 
@@ -249,23 +255,38 @@ async def delete_user_account(req:Request, user_id:str):
                 logger.error(f"Failed to cancel Stripe subscription for user {user_id}: {e}")
         
         # Delete user interviews and related data
-        await _db_actions.deleteDocuments(
+        await _db_actions.deleteMultipleDocuments(
             req=req,
             collection_name='interviews',
+            BaseModel=Interview,
             user_id=user_id
         )
         
+        # Delete the cached parses of the user's CV uploads, older entries are matched on the profiles' text
+        cv_profiles = await _db_actions.getMultipleDocuments(req, 'cv_profiles', CVProfile, user_id=user_id)
+        await delete_user_cv_parses(req, user_id, [cv_profile.raw_text for cv_profile in cv_profiles])
+        
         # Delete user CV profiles
-        await _db_actions.deleteDocuments(
+        await _db_actions.deleteMultipleDocuments(
             req=req,
             collection_name='cv_profiles',
+            BaseModel=CVProfile,
             user_id=user_id
         )
         
         # Delete user interview attempts
-        await _db_actions.deleteDocuments(
+        await _db_actions.deleteMultipleDocuments(
             req=req,
             collection_name='interview_attempts',
+            BaseModel=InterviewAttempt,
+            user_id=user_id
+        )
+        
+        # Delete user materialized stats
+        await _db_actions.deleteMultipleDocuments(
+            req=req,
+            collection_name='user_stats',
+            BaseModel=UserStats,
             user_id=user_id
         )
         
@@ -274,7 +295,7 @@ async def delete_user_account(req:Request, user_id:str):
             req=req,
             collection_name='users',
             BaseModel=User,
-            document_id=user_id
+            _id=user_id
         )
         
         logger.info(f"Successfully deleted user account {user_id} and all associated data")
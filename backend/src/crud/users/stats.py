@@ -0,0 +1,277 @@
+from fastapi import Request
+from typing import Dict, Any, List, Optional
+import hashlib
+
+from crud._generic._db_actions import (
+    aggregateDocuments, getDocument, getMultipleDocuments,
+    countDocuments, upsertDocument, SortDirection
+)
+from models.interviews.attempts import InterviewAttempt, InterviewFeedback
+from models.users.user_stats import UserStats
+
+# Number of scores kept for the improvement trend
+RECENT_SCORES_LIMIT = 10
+
+
+async def get_user_score_stats(req: Request, user_id: str) -> Dict[str, Any]:
+    """
+    Get the attempt count and average feedback score for a user.
+
+    Runs as a single aggregation over the user's attempts, joining each
+    attempt to its feedback, so the cost is one round trip regardless of
+    how many interviews or attempts the user has.
+
+    Returns:
+        Dict containing:
+        - total_attempts: Number of attempts the user has started
+        - graded_attempts: Number of feedback documents found for those attempts
+        - average_score: Mean overall_score across the feedback, or None
+    """
+    pipeline = [
+        {'$match': {'user_id': user_id}},
+        {'$lookup': {
+            'from': 'interview_feedback',
+            'localField': '_id',
+            'foreignField': 'attempt_id',
+            'as': 'feedback'
+        }},
+        {'$project': {'scores': '$feedback.overall_score'}},
+        {'$group': {
+            '_id': None,
+            'total_attempts': {'$sum': 1},
+            'score_sum': {'$sum': {'$sum': '$scores'}},
+            'score_count': {'$sum': {'$size': '$scores'}}
+        }}
+    ]
+
+    results = await aggregateDocuments(
+        req, "interview_attempts", InterviewAttempt, pipeline
+    )
+
+    if not results:
+        return {
+            "total_attempts": 0,
+            "graded_attempts": 0,
+            "average_score": None
+        }
+
+    stats = results[0]
+    score_count = stats.get('score_count', 0)
+    average_score = None
+    if score_count:
+        average_score = round(stats['score_sum'] / score_count, 1)
+
+    return {
+        "total_attempts": stats.get('total_attempts', 0),
+        "graded_attempts": score_count,
+        "average_score": average_score
+    }
+
+
+def _score_band(score: int) -> str:
+    """Map an overall score onto its score_distribution band"""
+    if score >= 90:
+        return "excellent"
+    if score >= 80:
+        return "good"
+    if score >= 70:
+        return "fair"
+    return "needs_improvement"
+
+def _field_key(key: str) -> str:
+    """Make a free-form key safe to use inside a dotted update path"""
+    return str(key).replace('.', '_').lstrip('$')
+
+def _text_key(text: str) -> str:
+    """Stable short key for a strength / improvement area string"""
+    normalized = " ".join(text.lower().split())
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:16]
+
+def _feedback_stats_update(feedback: InterviewFeedback) -> Dict[str, Any]:
+    """Build the $inc / $max update that folds one feedback into a user's stats"""
+    score = feedback.overall_score
+    interview_type = _field_key(
+        feedback.interview_type.value
+        if hasattr(feedback.interview_type, 'value')
+        else feedback.interview_type
+    )
+
+    inc = {
+        'graded_attempts': 1,
+        'score_sum': score,
+        f'score_distribution.{_score_band(score)}': 1,
+        f'by_interview_type.{interview_type}.graded_attempts': 1,
+        f'by_interview_type.{interview_type}.score_sum': score,
+    }
+    max_ = {
+        'best_score': score,
+        f'by_interview_type.{interview_type}.best_score': score,
+    }
+    set_ = {
+        'latest_score': score
+    }
+
+    for rubric_key, rubric_score in (feedback.rubric_scores or {}).items():
+        if isinstance(rubric_score, bool) or not isinstance(rubric_score, (int, float)):
+            continue
+        key = _field_key(rubric_key)
+        inc[f'rubric_totals.{key}.count'] = inc.get(f'rubric_totals.{key}.count', 0) + 1
+        inc[f'rubric_totals.{key}.sum'] = inc.get(f'rubric_totals.{key}.sum', 0) + rubric_score
+
+    for field, items in (
+        ('strength_counts', feedback.strengths),
+        ('weakness_counts', feedback.improvement_areas)
+    ):
+        for text in items or []:
+            if not text or not text.strip():
+                continue
+            key = _text_key(text)
+            inc[f'{field}.{key}.count'] = inc.get(f'{field}.{key}.count', 0) + 1
+            set_[f'{field}.{key}.text'] = text.strip()
+
+    return {
+        '$inc': inc,
+        '$max': max_,
+        '$set': set_,
+        '$push': {
+            'recent_scores': {
+                '$each': [score],
+                '$slice': -RECENT_SCORES_LIMIT
+            }
+        }
+    }
+
+def _apply_stats_update(document: Dict[str, Any], update: Dict[str, Any]) -> None:
+    """Apply a _feedback_stats_update clause to a stats dict in memory, as MongoDB would"""
+    for operator, fields in update.items():
+        for path, value in fields.items():
+            *parents, key = path.split('.')
+            target = document
+            for parent in parents:
+                target = target.setdefault(parent, {})
+            if operator == '$inc':
+                target[key] = target.get(key, 0) + value
+            elif operator == '$max':
+                target[key] = max(target.get(key, value), value)
+            elif operator == '$set':
+                target[key] = value
+            elif operator == '$push':
+                target[key] = (target.get(key, []) + value['$each'])[value['$slice']:]
+
+async def record_attempt_in_user_stats(req: Request, user_id: str) -> UserStats:
+    """Count a newly started attempt in the user's materialized stats"""
+    stats = await upsertDocument(
+        req, "user_stats", UserStats,
+        {'user_id': user_id},
+        {'$inc': {'total_attempts': 1}}
+    )
+    # Created by this attempt: complete if the user has no older attempts
+    if not stats.backfilled and stats.total_attempts == 1 and not stats.graded_attempts:
+        if await countDocuments(req, "interview_attempts", InterviewAttempt, user_id=user_id) == 1:
+            stats = await upsertDocument(
+                req, "user_stats", UserStats,
+                {'user_id': user_id},
+                {'$set': {'backfilled': True}}
+            )
+    return stats
+
+async def record_feedback_in_user_stats(req: Request, feedback: InterviewFeedback) -> UserStats:
+    """Fold a newly saved feedback into the user's materialized stats in one atomic update"""
+    return await upsertDocument(
+        req, "user_stats", UserStats,
+        {'user_id': feedback.user_id},
+        _feedback_stats_update(feedback)
+    )
+
+async def get_user_stats(req: Request, user_id: str) -> Optional[UserStats]:
+    """Get the materialized stats document for a user, complete or not (see UserStats.backfilled)"""
+    return await getDocument(req, "user_stats", UserStats, user_id=user_id)
+
+async def get_complete_user_stats(req: Request, user_id: str) -> UserStats:
+    """
+    Get the user's stats, read from the materialized document when it is
+    backfilled and computed from their attempts and feedback otherwise.
+    Never writes, run the rebuild migration to backfill.
+    """
+    user_stats = await get_user_stats(req, user_id)
+    if user_stats and user_stats.backfilled:
+        return user_stats
+    return await compute_user_stats(req, user_id)
+
+async def compute_user_stats(req: Request, user_id: str) -> UserStats:
+    """
+    Compute a user's stats from interview_attempts and interview_feedback.
+
+    Folds every feedback through the same update used on grading, so the
+    result is identical to a document maintained incrementally.
+    """
+    total_attempts = await countDocuments(
+        req, "interview_attempts", InterviewAttempt, user_id=user_id
+    )
+    feedback_list = await getMultipleDocuments(
+        req, "interview_feedback", InterviewFeedback,
+        order_by="created_at",
+        order_direction=SortDirection.ASCENDING,
+        user_id=user_id
+    )
+
+    document = UserStats(user_id=user_id, total_attempts=total_attempts, backfilled=True).model_dump(
+        exclude={'id', 'created_at', 'updated_at'}
+    )
+    for feedback in feedback_list:
+        _apply_stats_update(document, _feedback_stats_update(feedback))
+    return UserStats(**document)
+
+def get_average(total: float, count: int) -> Optional[float]:
+    """Average rounded to one decimal place, or None when there is nothing to average"""
+    if not count:
+        return None
+    return round(total / count, 1)
+
+def get_top_counts(counts: Dict[str, Dict[str, Any]], limit: int = 5) -> List[Dict[str, Any]]:
+    """Most frequent {text, count} entries from a strength / weakness counter"""
+    entries = sorted(
+        counts.values(),
+        key=lambda entry: entry.get('count', 0),
+        reverse=True
+    )
+    return [
+        {"text": entry.get('text', ''), "count": entry.get('count', 0)}
+        for entry in entries[:limit]
+    ]
+
+async def get_stats_user_ids(req: Request) -> List[str]:
+    """Every user that has started an attempt, for backfilling stats"""
+    results = await aggregateDocuments(
+        req, "interview_attempts", InterviewAttempt,
+        [{'$group': {'_id': '$user_id'}}]
+    )
+    return [result['_id'] for result in results if result.get('_id')]
+
+async def rebuild_user_stats(req: Request, user_id: str, dry_run: bool = True) -> Dict[str, Any]:
+    """
+    Rebuild a user's materialized stats from interview_attempts and
+    interview_feedback, and mark them backfilled. Feedback saved for the
+    user while the rebuild runs may be lost, so run it outside of peak
+    grading.
+    """
+    user_stats = await compute_user_stats(req, user_id)
+
+    result = {
+        "user_id": user_id,
+        "total_attempts": user_stats.total_attempts,
+        "graded_attempts": user_stats.graded_attempts,
+        "average_score": get_average(user_stats.score_sum, user_stats.graded_attempts)
+    }
+
+    if dry_run:
+        return result
+
+    # Every counter replaced in one write
+    await upsertDocument(
+        req, "user_stats", UserStats,
+        {'user_id': user_id},
+        {'$set': user_stats.model_dump(exclude={'id', 'user_id', 'created_at', 'updated_at'})}
+    )
+
+    return result
@@ -11,6 +11,11 @@ from starlette.middleware.cors import CORSMiddleware
 from routers.app._index import router as app_router
 from routers.webhooks._index import router as webhook_router
 from routers.internal._index import router as internal_router
+from crud._generic.indexes import ensureIndexes
+from services.grading_queue import grading_queue
+from services.document_extraction import document_extraction
+from services.http_clients import http_clients
+from utils.uploads.size_limit_middleware import UploadSizeLimitMiddleware
 
 CONNECTION_STRING_DB=config("CONNECTION_STRING_DB", cast=str)
 DB_NAME=config("DB_NAME", cast=str)
@@ -23,7 +28,9 @@ middleware = [
         allow_credentials=True,
         allow_methods=['*'],
         allow_headers=['*']
-    )
+    ),
+    # Turn away oversized document uploads before they are parsed
+    Middleware(UploadSizeLimitMiddleware)
 ]
 
 class ExtendFastAPI(FastAPI):
@@ -41,8 +48,23 @@ async def lifespan(app: ExtendFastAPI):
 
     app.mongodb = app.mongodb_client[DB_NAME]
 
+    # Declared indexes for the generic CRUD collections (idempotent)
+    await ensureIndexes(app.mongodb)
+
+    # Pooled HTTP clients for OpenAI, ElevenLabs, Brandfetch and scraping
+    http_clients.open()
+
+    # Background workers for interview grading enqueued by the webhook
+    grading_queue.start(app)
+
+    # Worker processes for CPU-bound PDF / DOCX parsing
+    document_extraction.start()
+
     # shutdown
     yield
+    await grading_queue.stop()
+    document_extraction.stop()
+    await http_clients.close()
     app.mongodb_client.close()
 
 app = ExtendFastAPI(
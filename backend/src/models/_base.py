@@ -1,6 +1,6 @@
 from typing import Any
 from bson import ObjectId
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, create_model
 from pydantic_core import core_schema
 from datetime import datetime, timezone
 
@@ -101,3 +101,27 @@ class MongoBaseModel(BaseModel):
             timezone.utc
         )
     )
+
+
+def create_view_model(
+    model:type[MongoBaseModel],
+    exclude:set[str],
+    name:str | None = None
+) -> type[MongoBaseModel]:
+    """
+    Creates a partial "view" of a collection model without the
+    excluded fields, for use as a ProjectionModel in the generic
+    get functions. Fields keep their types and defaults, so the
+    view stays in sync with the full model.
+    """
+    fields = {
+        field_name: (field.annotation, field)
+        for field_name, field in model.model_fields.items()
+        if field_name not in exclude
+        and field_name not in MongoBaseModel.model_fields
+    }
+    return create_model(
+        name or f"{model.__name__}View",
+        __base__=MongoBaseModel,
+        **fields
+    )
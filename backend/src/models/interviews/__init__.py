@@ -1,5 +1,11 @@
 from .cv_profile import CVProfile
-from .interviews import Interview
-from .attempts import InterviewAttempt, InterviewFeedback
+from .cv_parse_cache import CVParseCacheEntry
+from .interviews import Interview, InterviewListView
+from .attempts import InterviewAttempt, InterviewAttemptListView, InterviewFeedback
+from .grading_jobs import GradingJob
 
-__all__ = ["CVProfile", "Interview", "InterviewAttempt", "InterviewFeedback"]
\ No newline at end of file
+__all__ = [
+    "CVProfile", "CVParseCacheEntry", "Interview", "InterviewListView",
+    "InterviewAttempt", "InterviewAttemptListView", "InterviewFeedback",
+    "GradingJob"
+]
\ No newline at end of file
@@ -1,4 +1,4 @@
-from models._base import MongoBaseModel
+from models._base import MongoBaseModel, create_view_model
 from typing import List, Dict, Optional
 from datetime import datetime
 from models.interviews.interview_types import InterviewType
@@ -16,6 +16,13 @@ class InterviewAttempt(MongoBaseModel):
     ended_at: Optional[datetime] = None
     elevenlabs_analysis: Optional[Dict] = None  # Raw analysis from ElevenLabs webhook
 
+# Attempt without the transcript and raw analysis, for list pages
+InterviewAttemptListView = create_view_model(
+    InterviewAttempt,
+    exclude={"transcript", "elevenlabs_analysis"},
+    name="InterviewAttemptListView"
+)
+
 class InterviewFeedback(MongoBaseModel):
     attempt_id: str
     interview_id: str
@@ -0,0 +1,44 @@
+from pydantic import Field
+from typing import Dict, Any, List
+from datetime import datetime
+
+from models._base import MongoBaseModel
+
+class CVParseCacheEntry(MongoBaseModel):
+    """
+    Parsed CV data keyed by the uploaded file's content hash and the
+    CV parsing prompt version, so re-uploads of the same file skip the
+    document rendering and the OpenAI call.
+    """
+    file_hash: str = Field(
+        ...,
+        description='sha256 of the uploaded file bytes'
+    )
+    prompt_version: str = Field(
+        ...,
+        description='CV parsing prompt version the data was produced with'
+    )
+    content_type: str = Field(
+        ...,
+        description='Content type of the uploaded file'
+    )
+    raw_text: str = Field(
+        default='',
+        description='Raw text extracted from the file'
+    )
+    parsed_data: Dict[str, Any] = Field(
+        default={},
+        description='Validated OpenAI output for the file'
+    )
+    user_ids: List[str] = Field(
+        default=[],
+        description='Users who uploaded the file, the entry is deleted with any of their accounts'
+    )
+    hit_count: int = Field(
+        default=0,
+        description='Number of uploads served from this entry'
+    )
+    last_accessed_at: datetime = Field(
+        ...,
+        description='Last time the entry was written or served, drives TTL and LRU eviction'
+    )
@@ -0,0 +1,50 @@
+from pydantic import Field
+from typing import Optional
+from datetime import datetime
+
+from models._base import MongoBaseModel
+
+class GradingJob(MongoBaseModel):
+    """
+    Queued grading work for a single interview attempt.
+
+    Enqueued by the ElevenLabs post-call webhook and processed by the
+    grading workers, so the webhook can reply without waiting on OpenAI.
+    There is one job per attempt, which makes webhook retries a no-op.
+    """
+    attempt_id: str = Field(
+        ...,
+        description='The attempt to grade'
+    )
+    status: str = Field(
+        default='queued',
+        description='queued, running, done or dead'
+    )
+    attempts: int = Field(
+        default=0,
+        description='Number of times a worker has picked up the job'
+    )
+    max_attempts: int = Field(
+        default=5,
+        description='Attempts before the job is moved to the dead state'
+    )
+    run_after: Optional[datetime] = Field(
+        default=None,
+        description='Earliest time the job may be picked up, used for retry backoff'
+    )
+    locked_until: Optional[datetime] = Field(
+        default=None,
+        description='Lease of the running worker, the job is picked up again once it expires'
+    )
+    lease_id: Optional[str] = Field(
+        default=None,
+        description='Token of the current claim, a worker may only change the job while it still holds it'
+    )
+    last_error: Optional[str] = Field(
+        default=None,
+        description='Error raised by the most recent failed attempt'
+    )
+    completed_at: Optional[datetime] = Field(
+        default=None,
+        description='When the job reached the done or dead state'
+    )
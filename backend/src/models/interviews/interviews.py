@@ -1,4 +1,4 @@
-from models._base import MongoBaseModel
+from models._base import MongoBaseModel, create_view_model
 from typing import List, Dict, Optional, Any
 from models.interviews.interview_types import InterviewType
 
@@ -42,4 +42,11 @@ class Interview(MongoBaseModel):
     # Legacy fields - can be removed after data migration
     job_id: Optional[str] = None  # No longer needed
     stage_order: Optional[int] = None  # No longer needed
-    jd_structured: Optional[Dict] = None
\ No newline at end of file
+    jd_structured: Optional[Dict] = None
+
+# Interview without the job description payload, for list pages
+InterviewListView = create_view_model(
+    Interview,
+    exclude={"jd_raw", "job_description", "jd_structured"},
+    name="InterviewListView"
+)
@@ -1,3 +1,4 @@
-from .jobs import Job
+from .jobs import Job, JobListView
+from .job_url_cache import JobUrlCacheEntry
 
-__all__ = ["Job"]
\ No newline at end of file
+__all__ = ["Job", "JobListView", "JobUrlCacheEntry"]
@@ -0,0 +1,47 @@
+from pydantic import Field
+from typing import Dict, Any, Optional
+from datetime import datetime
+
+from models._base import MongoBaseModel
+
+class JobUrlCacheEntry(MongoBaseModel):
+    """
+    Scraped text and extracted job data for a canonical job posting URL,
+    shared by every user who pastes the same posting.
+    """
+    canonical_url: str = Field(
+        ...,
+        description='Canonicalized job posting URL'
+    )
+    content_hash: str = Field(
+        ...,
+        description='sha256 of the scraped text, an unchanged page is not re-extracted'
+    )
+    scraped_text: str = Field(
+        default='',
+        description='Text scraped from the page'
+    )
+    job_data: Dict[str, Any] = Field(
+        default={},
+        description='Validated job data extracted from scraped_text'
+    )
+    etag: Optional[str] = Field(
+        default=None,
+        description='ETag returned with the page, used for revalidation'
+    )
+    last_modified: Optional[str] = Field(
+        default=None,
+        description='Last-Modified returned with the page, used for revalidation'
+    )
+    fetched_at: datetime = Field(
+        ...,
+        description='When the page was last fetched or revalidated, drives freshness'
+    )
+    last_accessed_at: datetime = Field(
+        ...,
+        description='Last time the entry was served, drives TTL eviction'
+    )
+    hit_count: int = Field(
+        default=0,
+        description='Number of ingestions served from this entry'
+    )
@@ -1,4 +1,4 @@
-from models._base import MongoBaseModel
+from models._base import MongoBaseModel, create_view_model
 from typing import List, Dict, Optional, Any
 from models.interviews.interview_types import InterviewType
 
@@ -32,4 +32,11 @@ class Job(MongoBaseModel):
     
     # Metadata
     total_attempts: int = 0  # Total attempts across all interviews
-    last_attempt_date: Optional[str] = None
\ No newline at end of file
+    last_attempt_date: Optional[str] = None
+
+# Job without the job description payload, for list pages
+JobListView = create_view_model(
+    Job,
+    exclude={"jd_raw", "job_description"},
+    name="JobListView"
+)
@@ -0,0 +1,65 @@
+from pydantic import Field
+from typing import Dict, List, Any, Optional
+
+from models._base import MongoBaseModel
+
+class UserStats(MongoBaseModel):
+    """
+    Materialized interview statistics for a single user.
+
+    Maintained incrementally with $inc / $max as attempts are started
+    and feedback is saved, so stats endpoints are a single document read.
+    Only documents with backfilled set cover all of the user's history.
+    """
+    user_id: str = Field(
+        ...,
+        description='The user these statistics belong to'
+    )
+    backfilled: bool = Field(
+        default=False,
+        description='Whether the stats include every attempt and feedback of the user; false when the document was first created by an incremental update for a user with older data, until it is rebuilt'
+    )
+    total_attempts: int = Field(
+        default=0,
+        description='Number of interview attempts the user has started'
+    )
+    graded_attempts: int = Field(
+        default=0,
+        description='Number of attempts with saved feedback'
+    )
+    score_sum: int = Field(
+        default=0,
+        description='Sum of overall_score across all feedback'
+    )
+    best_score: int = Field(
+        default=0,
+        description='Highest overall_score received'
+    )
+    latest_score: Optional[int] = Field(
+        default=None,
+        description='overall_score of the most recently saved feedback'
+    )
+    recent_scores: List[int] = Field(
+        default=[],
+        description='Most recent overall scores, oldest first'
+    )
+    score_distribution: Dict[str, int] = Field(
+        default={},
+        description='Feedback count per score band (excellent, good, fair, needs_improvement)'
+    )
+    by_interview_type: Dict[str, Dict[str, int]] = Field(
+        default={},
+        description='{interview_type: {graded_attempts, score_sum, best_score}}'
+    )
+    rubric_totals: Dict[str, Dict[str, float]] = Field(
+        default={},
+        description='{rubric_key: {count, sum}} used for running averages'
+    )
+    strength_counts: Dict[str, Dict[str, Any]] = Field(
+        default={},
+        description='{text_hash: {text, count}} for strengths mentioned in feedback'
+    )
+    weakness_counts: Dict[str, Dict[str, Any]] = Field(
+        default={},
+        description='{text_hash: {text, count}} for improvement areas mentioned in feedback'
+    )
@@ -9,14 +9,11 @@ from authentication import Authorization
 from utils.__errors__.error_decorator_routes import error_decorator
 from crud.interviews.interviews import get_interview
 from models.interviews.interview_types import InterviewType
+from services.http_clients import http_clients
 
 router = APIRouter()
 auth = Authorization()
 
-# ElevenLabs configuration
-ELEVENLABS_API_KEY = config('ELEVENLABS_API_KEY', default='', cast=str)
-ELEVENLABS_BASE_URL = "https://api.elevenlabs.io/v1"
-
 # Agent IDs stored securely in environment variables
 AGENT_IDS = {
     InterviewType.GENERAL_INTERVIEW: config('AGENT_ID_NIAMH_MORISSEY', default=''),
@@ -166,41 +163,39 @@ async def get_conversation_token(
     
     # Fetch conversation token from ElevenLabs
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{ELEVENLABS_BASE_URL}/convai/conversation/token",
-                params={"agent_id": agent_id},
-                headers={"xi-api-key": ELEVENLABS_API_KEY},
-                timeout=10.0
+        response = await http_clients.get('elevenlabs').get(
+            "/convai/conversation/token",
+            params={"agent_id": agent_id},
+            timeout=10.0
+        )
+        
+        if response.status_code != 200:
+            print(f"❌ ElevenLabs API error: {response.status_code} - {response.text}")
+            raise HTTPException(
+                status_code=500,
+                detail="Failed to obtain conversation token"
             )
-            
-            if response.status_code != 200:
-                print(f"❌ ElevenLabs API error: {response.status_code} - {response.text}")
-                raise HTTPException(
-                    status_code=500,
-                    detail="Failed to obtain conversation token"
-                )
-            
-            data = response.json()
-            conversation_token = data.get("token")
-            
-            if not conversation_token:
-                raise HTTPException(
-                    status_code=500,
-                    detail="Invalid response from ElevenLabs API"
-                )
-            
-            print(f"✅ Obtained conversation token for interview {interview_id}, type: {request.interview_type}")
-            
-            return JSONResponse(
-                status_code=200,
-                content={
-                    "conversation_token": conversation_token,
-                    "agent_id": agent_id,
-                    "agent_metadata": agent_metadata
-                }
+        
+        data = response.json()
+        conversation_token = data.get("token")
+        
+        if not conversation_token:
+            raise HTTPException(
+                status_code=500,
+                detail="Invalid response from ElevenLabs API"
             )
-            
+        
+        print(f"✅ Obtained conversation token for interview {interview_id}, type: {request.interview_type}")
+        
+        return JSONResponse(
+            status_code=200,
+            content={
+                "conversation_token": conversation_token,
+                "agent_id": agent_id,
+                "agent_metadata": agent_metadata
+            }
+        )
+        
     except httpx.RequestError as e:
         print(f"❌ Network error calling ElevenLabs API: {str(e)}")
         raise HTTPException(
@@ -6,6 +6,7 @@ from typing import Optional
 
 from authentication import Authorization
 from utils.__errors__.error_decorator_routes import error_decorator
+from utils.uploads.read_upload import read_upload
 from crud.interviews import (
     create_interview_from_url,
     create_interview_from_file
@@ -59,25 +60,15 @@ async def create_interview_file(
 ):
     """Create a new interview from uploaded job description file"""
     
-    # Validate file type
-    allowed_types = ['application/pdf', 'text/plain', 'application/msword', 
-                     'application/vnd.openxmlformats-officedocument.wordprocessingml.document']
-    
-    if file.content_type not in allowed_types:
-        raise HTTPException(
-            status_code=400,
-            detail="Unsupported file type. Please upload PDF, DOC, DOCX, or TXT files."
-        )
-    
-    # Read file content
-    content = await file.read()
+    # Read in chunks up to the size limit, with the type sniffed from the content
+    content, content_type = await read_upload(file)
     filename = file.filename or "job_description"
     
     interview = await create_interview_from_file(
         req=req,
         user_id=user_id,
         file_content=content,
-        content_type=file.content_type,
+        content_type=content_type,
         filename=filename
     )
     
@@ -4,6 +4,8 @@ from fastapi.encoders import jsonable_encoder
 
 from authentication import Authorization
 from utils.__errors__.error_decorator_routes import error_decorator
+from utils.uploads.read_upload import read_upload
+from utils.streaming.sse import field_event_stream
 from crud.interviews.cv_profiles import create_cv_profile, get_user_cv, update_cv_profile
 
 router = APIRouter()
@@ -17,18 +19,8 @@ async def upload_cv(
     user_id: str = Depends(auth.auth_wrapper)
 ):
     """Upload and process a CV file using OpenAI"""
-    # Validate file type
-    allowed_types = ['application/pdf', 'text/plain', 'application/msword', 
-                     'application/vnd.openxmlformats-officedocument.wordprocessingml.document']
-    
-    if file.content_type not in allowed_types:
-        raise HTTPException(
-            status_code=400,
-            detail="Unsupported file type. Please upload PDF, DOC, DOCX, or TXT files."
-        )
-    
-    # Read file content
-    content = await file.read()
+    # Read in chunks up to the size limit, with the type sniffed from the content
+    content, content_type = await read_upload(file)
     filename = file.filename or "unknown"
     
     try:
@@ -37,10 +29,10 @@ async def upload_cv(
         
         if existing_cv:
             # Update existing CV using OpenAI processing
-            cv_profile = await update_cv_profile(req, existing_cv.id, content, file.content_type, filename)
+            cv_profile = await update_cv_profile(req, existing_cv.id, content, content_type, filename)
         else:
             # Create new CV profile using OpenAI processing
-            cv_profile = await create_cv_profile(req, user_id, content, file.content_type, filename)
+            cv_profile = await create_cv_profile(req, user_id, content, content_type, filename)
         
         return JSONResponse(
             status_code=200,
@@ -57,6 +49,32 @@ async def upload_cv(
             detail=f"Unexpected error processing CV: {str(e)}"
         )
 
+@router.post("/stream")
+@error_decorator
+async def upload_cv_stream(
+    req: Request,
+    file: UploadFile = File(...),
+    user_id: str = Depends(auth.auth_wrapper)
+):
+    """
+    Same as POST /, streamed as server-sent events: a `field` event for
+    each parsed CV field as the model generates it, `reset` when a failed
+    attempt is retried and its fields should be dropped, then `result`
+    with the CV profile, or `error`.
+    """
+    content, content_type = await read_upload(file)
+    filename = file.filename or "unknown"
+
+    async def upload(on_field):
+        existing_cv = await get_user_cv(req, user_id)
+        if existing_cv:
+            cv_profile = await update_cv_profile(req, existing_cv.id, content, content_type, filename, on_field)
+        else:
+            cv_profile = await create_cv_profile(req, user_id, content, content_type, filename, on_field)
+        return cv_profile.model_dump()
+
+    return field_event_stream(upload)
+
 @router.get("/")
 @error_decorator
 async def get_cv(
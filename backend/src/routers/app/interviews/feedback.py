@@ -7,6 +7,7 @@ from authentication import Authorization
 from utils.__errors__.error_decorator_routes import error_decorator
 from crud.interviews.attempts import get_attempt_feedback, get_user_feedback_history
 from crud.interviews.interviews import get_interview
+from crud.users.stats import get_complete_user_stats, get_top_counts, get_average
 
 router = APIRouter()
 auth = Authorization()
@@ -66,9 +67,11 @@ async def get_user_interview_stats(
     if target_user_id != user_id:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    history = await get_user_feedback_history(req, user_id, limit=100)
+    # Stats are maintained incrementally on grading, so this is a single
+    # read unless the user's stats are not backfilled yet
+    user_stats = await get_complete_user_stats(req, user_id)
     
-    if not history:
+    if not user_stats or not user_stats.graded_attempts:
         return JSONResponse(
             status_code=200,
             content={
@@ -80,47 +83,42 @@ async def get_user_interview_stats(
             }
         )
     
-    # Calculate statistics
-    scores = [item["feedback"].overall_score for item in history]
-    
-    # Count strengths and weaknesses
-    all_strengths = []
-    all_weaknesses = []
-    
-    for item in history:
-        all_strengths.extend(item["feedback"].strengths)
-        all_weaknesses.extend(item["feedback"].improvement_areas)
-    
-    # Count frequency
-    strength_counts = {}
-    weakness_counts = {}
-    
-    for strength in all_strengths:
-        strength_counts[strength] = strength_counts.get(strength, 0) + 1
-    
-    for weakness in all_weaknesses:
-        weakness_counts[weakness] = weakness_counts.get(weakness, 0) + 1
-    
-    # Get top items
-    top_strengths = sorted(strength_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-    common_weaknesses = sorted(weakness_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-    
     stats = {
-        "total_interviews": len(history),
-        "average_score": sum(scores) / len(scores) if scores else 0,
-        "latest_score": scores[0] if scores else 0,
-        "improvement_trend": scores[-10:] if len(scores) >= 10 else scores,  # Last 10 scores
-        "top_strengths": [{"skill": k, "count": v} for k, v in top_strengths],
-        "common_weaknesses": [{"area": k, "count": v} for k, v in common_weaknesses],
+        "total_interviews": user_stats.graded_attempts,
+        "average_score": user_stats.score_sum / user_stats.graded_attempts,
+        "latest_score": user_stats.latest_score or 0,
+        "best_score": user_stats.best_score,
+        "improvement_trend": user_stats.recent_scores,  # Last 10 scores
+        "top_strengths": [
+            {"skill": entry["text"], "count": entry["count"]}
+            for entry in get_top_counts(user_stats.strength_counts)
+        ],
+        "common_weaknesses": [
+            {"area": entry["text"], "count": entry["count"]}
+            for entry in get_top_counts(user_stats.weakness_counts)
+        ],
         "score_distribution": {
-            "excellent": len([s for s in scores if s >= 90]),
-            "good": len([s for s in scores if 80 <= s < 90]),
-            "fair": len([s for s in scores if 70 <= s < 80]),
-            "needs_improvement": len([s for s in scores if s < 70])
+            band: user_stats.score_distribution.get(band, 0)
+            for band in ("excellent", "good", "fair", "needs_improvement")
+        },
+        "by_interview_type": {
+            interview_type: {
+                "total_interviews": type_stats.get("graded_attempts", 0),
+                "average_score": get_average(
+                    type_stats.get("score_sum", 0),
+                    type_stats.get("graded_attempts", 0)
+                ),
+                "best_score": type_stats.get("best_score", 0)
+            }
+            for interview_type, type_stats in user_stats.by_interview_type.items()
+        },
+        "rubric_averages": {
+            rubric_key: get_average(totals.get("sum", 0), totals.get("count", 0))
+            for rubric_key, totals in user_stats.rubric_totals.items()
         }
     }
     
     return JSONResponse(
         status_code=200,
         content=jsonable_encoder(stats)
-    )
\ No newline at end of file
+    )
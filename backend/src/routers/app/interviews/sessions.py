@@ -7,6 +7,8 @@ from datetime import datetime, timezone
 
 from authentication import Authorization
 from utils.__errors__.error_decorator_routes import error_decorator
+from utils.uploads.read_upload import read_upload
+from utils.__errors__.custom_exception import InvalidCursorCustomException
 from crud.interviews.interviews import (
     create_interview_from_url as create_interview_from_url_crud,
     create_interview_from_file as create_interview_from_file_crud,
@@ -14,7 +16,7 @@ from crud.interviews.interviews import (
 )
 from crud.interviews.attempts import (
     create_attempt, get_attempt, get_interview_attempts, get_interview_attempts_paginated,
-    update_attempt, add_transcript_turn, finish_attempt
+    update_attempt, add_transcript_turn, finish_attempt, get_attempts_feedback
 )
 
 router = APIRouter()
@@ -27,12 +29,20 @@ async def list_user_interviews(
     req: Request,
     user_id: str = Depends(auth.auth_wrapper),
     page_size: int = 10,
-    page_number: int = 1
+    page_number: int = 1,
+    cursor: Optional[str] = None
 ):
-    """Get all interviews for the current user with pagination"""
+    """
+    Get all interviews for the current user with pagination.
+    Pass cursor (empty for the first page, then next_cursor) for keyset
+    pagination, which skips the total count; otherwise page_number is used.
+    """
     # Calculate skip from page number (page 1 = skip 0, page 2 = skip 10, etc.)
     skip = (page_number - 1) * page_size
-    interviews_result = await get_user_interviews(req, user_id, page_size, skip)
+    try:
+        interviews_result = await get_user_interviews(req, user_id, page_size, skip, cursor)
+    except InvalidCursorCustomException:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
     
     # Convert interviews to dicts and ensure _id is included
     interviews_data = []
@@ -50,6 +60,7 @@ async def list_user_interviews(
             "interviews": interviews_data,
             "has_more": interviews_result["has_more"],
             "total_count": interviews_result["total_count"],
+            "next_cursor": interviews_result.get("next_cursor"),
             "page_number": page_number,
             "page_size": page_size
         })
@@ -108,25 +119,15 @@ async def create_interview_from_file(
 ):
     """Create a new interview from uploaded job description file"""
     
-    # Validate file type
-    allowed_types = ['application/pdf', 'text/plain', 'application/msword', 
-                     'application/vnd.openxmlformats-officedocument.wordprocessingml.document']
-    
-    if file.content_type not in allowed_types:
-        raise HTTPException(
-            status_code=400,
-            detail="Unsupported file type. Please upload PDF, DOC, DOCX, or TXT files."
-        )
-    
-    # Read file content
-    content = await file.read()
+    # Read in chunks up to the size limit, with the type sniffed from the content
+    content, content_type = await read_upload(file)
     filename = file.filename or "job_description"
     
     interview = await create_interview_from_file_crud(
         req=req,
         user_id=user_id,
         file_content=content,
-        content_type=file.content_type,
+        content_type=content_type,
         filename=filename
     )
     
@@ -254,9 +255,10 @@ async def get_interview_attempts_paginated_route(
     interview_id: str,
     user_id: str = Depends(auth.auth_wrapper),
     page_size: int = 10,
-    page_number: int = 1
+    page_number: int = 1,
+    cursor: Optional[str] = None
 ):
-    """Get paginated attempts for a specific interview"""
+    """Get paginated attempts for a specific interview, by page_number or keyset cursor"""
     # Verify interview exists and belongs to user
     interview = await get_interview(req, interview_id)
     
@@ -268,24 +270,21 @@ async def get_interview_attempts_paginated_route(
     
     # Calculate skip from page number (page 1 = skip 0, page 2 = skip 10, etc.)
     skip = (page_number - 1) * page_size
-    attempts_result = await get_interview_attempts_paginated(req, interview_id, page_size, skip)
+    try:
+        attempts_result = await get_interview_attempts_paginated(req, interview_id, page_size, skip, cursor)
+    except InvalidCursorCustomException:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
     
     # Convert attempts to dicts and ensure _id is included, also include feedback scores
+    feedback_by_attempt = await get_attempts_feedback(req, attempts_result["attempts"])
+    
     attempts_data = []
     for attempt in attempts_result["attempts"]:
         attempt_dict = attempt.model_dump()
         attempt_dict['_id'] = str(attempt.id)
         
-        # Get feedback score for this attempt
-        try:
-            from crud.interviews.attempts import get_attempt_feedback
-            feedback = await get_attempt_feedback(req, str(attempt.id))
-            if feedback:
-                attempt_dict['score'] = feedback.overall_score
-            else:
-                attempt_dict['score'] = None
-        except Exception:
-            attempt_dict['score'] = None
+        feedback = feedback_by_attempt.get(str(attempt.id))
+        attempt_dict['score'] = feedback.overall_score if feedback else None
         
         attempts_data.append(attempt_dict)
     
@@ -296,6 +295,7 @@ async def get_interview_attempts_paginated_route(
             "has_more": attempts_result["has_more"],
             "total_count": attempts_result["total_count"],
             "current_page_size": attempts_result["current_page_size"],
+            "next_cursor": attempts_result.get("next_cursor"),
             "page_number": page_number,
             "page_size": page_size
         })
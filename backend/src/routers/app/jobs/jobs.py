@@ -6,6 +6,9 @@ from typing import List, Optional
 
 from authentication import Authorization
 from utils.__errors__.error_decorator_routes import error_decorator
+from utils.uploads.read_upload import read_upload
+from utils.streaming.sse import field_event_stream
+from utils.__errors__.custom_exception import InvalidCursorCustomException
 from crud.jobs import (
     create_job_from_url,
     create_job_from_file,
@@ -74,28 +77,56 @@ async def create_job_file(
 ):
     """Create a new job and its interview stages from uploaded job description file"""
     
-    # Validate file type
-    allowed_types = ['application/pdf', 'text/plain', 'application/msword', 
-                     'application/vnd.openxmlformats-officedocument.wordprocessingml.document']
-    
-    if file.content_type not in allowed_types:
-        raise HTTPException(
-            status_code=400,
-            detail="Unsupported file type. Please upload PDF, DOC, DOCX, or TXT files."
-        )
-    
-    # Read file content
-    content = await file.read()
+    # Read in chunks up to the size limit, with the type sniffed from the content
+    content, content_type = await read_upload(file)
     filename = file.filename or "job_description"
     
     job = await create_job_from_file(
         req=req,
         user_id=user_id,
         file_content=content,
-        content_type=file.content_type,
+        content_type=content_type,
         filename=filename
     )
     
+    return JSONResponse(
+        status_code=201,
+        content=jsonable_encoder(await _job_with_interviews_response(req, job))
+    )
+
+
+@router.post("/create/file/stream")
+@error_decorator
+async def create_job_file_stream(
+    req: Request,
+    file: UploadFile = File(...),
+    user_id: str = Depends(auth.auth_wrapper)
+):
+    """
+    Same as /create/file, streamed as server-sent events: a `field` event
+    for each extracted field as the model generates it (company and
+    role_title first), then `result` with the /create/file response body,
+    or `error`.
+    """
+    content, content_type = await read_upload(file)
+    filename = file.filename or "job_description"
+
+    async def create(on_field):
+        job = await create_job_from_file(
+            req=req,
+            user_id=user_id,
+            file_content=content,
+            content_type=content_type,
+            filename=filename,
+            on_field=on_field
+        )
+        return await _job_with_interviews_response(req, job)
+
+    return field_event_stream(create)
+
+
+async def _job_with_interviews_response(req: Request, job) -> dict:
+    """Response body for a created job with its interviews"""
     # Get the created interviews for the response
     job_with_interviews = await get_job_with_interviews(req, str(job.id))
     
@@ -113,13 +144,10 @@ async def create_job_file(
             interview_dict['best_score'] = 0
         interviews_data.append(interview_dict)
     
-    return JSONResponse(
-        status_code=201,
-        content=jsonable_encoder({
-            "job": job_dict,
-            "interviews": interviews_data
-        })
-    )
+    return {
+        "job": job_dict,
+        "interviews": interviews_data
+    }
 
 
 @router.get("/")
@@ -128,12 +156,20 @@ async def list_user_jobs(
     req: Request,
     user_id: str = Depends(auth.auth_wrapper),
     page_size: int = 10,
-    page_number: int = 1
+    page_number: int = 1,
+    cursor: Optional[str] = None
 ):
-    """Get all jobs for the current user with pagination"""
+    """
+    Get all jobs for the current user with pagination.
+    Pass cursor (empty for the first page, then next_cursor) for keyset
+    pagination, which skips the total count; otherwise page_number is used.
+    """
     # Calculate skip from page number (page 1 = skip 0, page 2 = skip 10, etc.)
     skip = (page_number - 1) * page_size
-    jobs_result = await get_user_jobs(req, user_id, page_size, skip)
+    try:
+        jobs_result = await get_user_jobs(req, user_id, page_size, skip, cursor)
+    except InvalidCursorCustomException:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
     
     # Convert jobs to dicts and ensure _id is included
     jobs_data = []
@@ -149,6 +185,7 @@ async def list_user_jobs(
             "has_more": jobs_result["has_more"],
             "total_count": jobs_result["total_count"],
             "current_page_size": jobs_result["current_page_size"],
+            "next_cursor": jobs_result.get("next_cursor"),
             "page_number": page_number,
             "page_size": page_size
         })
@@ -2,8 +2,12 @@ from fastapi import APIRouter
 
 from routers.internal.migrations import router as migrations_router
 from routers.internal.grading import router as grading_router
+from routers.internal.indexes import router as indexes_router
+from routers.internal.cv_cache import router as cv_cache_router
 
 router = APIRouter()
 
 router.include_router(migrations_router, prefix='/migrations', tags=['migrations'])
-router.include_router(grading_router, prefix='/grading', tags=['grading'])
\ No newline at end of file
+router.include_router(grading_router, prefix='/grading', tags=['grading'])
+router.include_router(indexes_router, prefix='/indexes', tags=['indexes'])
+router.include_router(cv_cache_router, prefix='/cv-cache', tags=['cv-cache'])
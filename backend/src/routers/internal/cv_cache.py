@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
+import logging
+
+from utils.__errors__.error_decorator_routes import error_decorator
+from crud.interviews.cv_parse_cache import get_cv_parse_cache_stats, purge_stale_cv_parses
+from services.cv_processing_service import CVProcessingService
+
+router = APIRouter()
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+@router.get("/stats")
+@error_decorator
+async def cv_cache_stats(
+    req: Request
+):
+    """
+    CV parse cache hit rate since startup (per process) and stored
+    entries per prompt version.
+    """
+    stats = await get_cv_parse_cache_stats(req, CVProcessingService().get_prompt_version())
+    
+    return JSONResponse(
+        status_code=200,
+        content=jsonable_encoder(stats)
+    )
+
+
+@router.post("/purge-stale")
+@error_decorator
+async def purge_stale_cv_cache(
+    req: Request
+):
+    """
+    Delete cached parses from previous prompt versions. They are never
+    served, this only frees the space before their TTL runs out.
+    """
+    prompt_version = CVProcessingService().get_prompt_version()
+    deleted = await purge_stale_cv_parses(req, prompt_version)
+    logger.info(f"Purged {deleted} stale CV parse cache entries, current version {prompt_version}")
+    
+    return JSONResponse(
+        status_code=200,
+        content=jsonable_encoder({
+            "success": True,
+            "current_prompt_version": prompt_version,
+            "deleted": deleted
+        })
+    )
@@ -7,6 +7,7 @@ import logging
 
 from utils.__errors__.error_decorator_routes import error_decorator
 from services.grading_service import trigger_interview_grading
+from crud.interviews.grading_jobs import get_grading_jobs
 
 router = APIRouter()
 
@@ -81,4 +82,24 @@ async def grading_health_check(req: Request):
             "service": "grading",
             "default_test_attempt_id": "68b865df1c19a5e844d9d1d0"
         }
-    )
\ No newline at end of file
+    )
+
+@router.get("/grading-jobs")
+@error_decorator
+async def list_grading_jobs(
+    req: Request,
+    status: str = "dead",
+    limit: int = 50
+):
+    """
+    List grading queue jobs in a given status (queued, running, done, dead).
+    Defaults to dead jobs, i.e. attempts that got fallback feedback.
+    """
+    jobs = await get_grading_jobs(req, status, limit)
+    return JSONResponse(
+        status_code=200,
+        content=jsonable_encoder({
+            "status": status,
+            "jobs": jobs
+        })
+    )
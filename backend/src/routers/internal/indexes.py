@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
+import logging
+
+from utils.__errors__.error_decorator_routes import error_decorator
+from crud._generic.indexes import ensureIndexes, reportQueryShapes
+
+router = APIRouter()
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+@router.get("/report")
+@error_decorator
+async def index_report(
+    req: Request
+):
+    """
+    Report the generic CRUD query shapes seen since startup and flag any
+    without a supporting index, plus declared indexes missing from the database.
+    Shapes are tracked per process, so run traffic through this instance first.
+    """
+    report = await reportQueryShapes(req.app.mongodb)
+    
+    logger.info(
+        f"Index report: {len(report['unsupported_query_shapes'])} unsupported query shapes, "
+        f"{len(report['missing_declared_indexes'])} missing declared indexes"
+    )
+    
+    return JSONResponse(
+        status_code=200,
+        content=jsonable_encoder(report)
+    )
+
+
+@router.post("/ensure")
+@error_decorator
+async def ensure_indexes(
+    req: Request
+):
+    """Create any declared indexes that do not exist yet (also run at startup)"""
+    ensured = await ensureIndexes(req.app.mongodb)
+    
+    return JSONResponse(
+        status_code=200,
+        content=jsonable_encoder({
+            "success": True,
+            "indexes": ensured
+        })
+    )
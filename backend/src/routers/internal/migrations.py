@@ -13,6 +13,7 @@ from crud._generic._db_actions import getAllDocuments, getMultipleDocuments, upd
 from models.interviews.interviews import Interview
 from models.interviews.attempts import InterviewFeedback
 from models.jobs import Job
+from crud.users.stats import rebuild_user_stats, get_stats_user_ids
 
 router = APIRouter()
 auth = Authorization()
@@ -23,6 +24,9 @@ logger = logging.getLogger(__name__)
 class MigrationRequest(BaseModel):
     dry_run: bool = True  # Safety: default to dry run
 
+class UserStatsRebuildRequest(MigrationRequest):
+    user_id: Optional[str] = None  # Rebuild a single user, otherwise all users
+
 class MigrationStats(BaseModel):
     interviews_to_update: int = 0
     interviews_updated: int = 0
@@ -246,4 +250,51 @@ async def migration_status(
         return JSONResponse(
             status_code=500,
             content={"error": str(e)}
-        )
\ No newline at end of file
+        )
+
+@router.post("/user-stats/rebuild")
+@error_decorator
+async def migrate_rebuild_user_stats(
+    req: Request,
+    request: UserStatsRebuildRequest
+):
+    """
+    Backfill the user_stats collection from existing interview_attempts
+    and interview_feedback. Rebuilds a single user when user_id is given,
+    otherwise every user with at least one attempt.
+    """
+    logger.info(f"Starting user stats rebuild (dry_run={request.dry_run}, user_id={request.user_id})")
+    
+    user_ids = [request.user_id] if request.user_id else await get_stats_user_ids(req)
+    
+    users_rebuilt = 0
+    results = []
+    errors = []
+    
+    for target_user_id in user_ids:
+        try:
+            result = await rebuild_user_stats(req, target_user_id, dry_run=request.dry_run)
+            results.append(result)
+            if not request.dry_run:
+                users_rebuilt += 1
+        except Exception as e:
+            error_msg = f"Error rebuilding stats for user {target_user_id}: {str(e)}"
+            logger.error(error_msg)
+            errors.append(error_msg)
+    
+    response = {
+        "success": not errors,
+        "dry_run": request.dry_run,
+        "users_found": len(user_ids),
+        "users_rebuilt": users_rebuilt,
+        "results": results[:100],  # Sample so the response stays small
+        "errors": errors,
+        "message": "User stats rebuilt" if not request.dry_run else "Dry run completed - no changes made"
+    }
+    
+    logger.info(f"User stats rebuild completed: {users_rebuilt}/{len(user_ids)} users")
+    
+    return JSONResponse(
+        status_code=200,
+        content=jsonable_encoder(response)
+    )
@@ -7,7 +7,7 @@ from fastapi import APIRouter, Request, HTTPException
 from decouple import config
 
 from crud.interviews.attempts import update_attempt_with_webhook_data, update_attempt_with_webhook_data_by_attempt_id
-from services.grading_service import trigger_interview_grading
+from services.grading_queue import grading_queue
 
 router = APIRouter()
 
@@ -277,44 +277,14 @@ async def handle_post_call_webhook(request: Request):
             print(f"    - Role: {first_turn.get('role', 'N/A')}")
             print(f"    - Message: {first_turn.get('message', '')[:100]}...")
         
-        # Start grading process immediately
-        print(f"\n[WEBHOOK] Step 3: Starting grading process...")
+        # Grading runs in the background queue so ElevenLabs gets a reply
+        # without waiting on OpenAI; duplicate webhooks reuse the same job
+        print(f"\n[WEBHOOK] Step 3: Enqueueing grading...")
         print(f"  - Attempt ID: {str(attempt.id)}")
-        
-        try:
-            print(f"[WEBHOOK] Triggering interview grading...")
-            feedback_data = await trigger_interview_grading(request, str(attempt.id))
-            print(f"[WEBHOOK] ✅ Grading completed successfully")
-            print(f"  - Feedback exists: {feedback_data is not None}")
-            if feedback_data:
-                print(f"  - Overall score: {feedback_data.get('overall_score', 'N/A')}")
-            
-            # Notify frontend that grading is complete
-            if feedback_data:
-                # Get the feedback document from database to get the ID
-                from crud.interviews.attempts import get_attempt_feedback
-                print(f"\n[WEBHOOK] Step 4: Retrieving saved feedback from database...")
-                feedback = await get_attempt_feedback(request, str(attempt.id))
-                print(f"[WEBHOOK] Feedback retrieval result:")
-                print(f"  - Feedback found: {feedback is not None}")
-                if feedback:
-                    print(f"  - Feedback ID: {str(feedback.id)}")
-                    print(f"  - Overall score: {feedback.overall_score}")
-                    print(f"  - Strengths count: {len(feedback.strengths)}")
-                    print(f"  - Improvement areas count: {len(feedback.improvement_areas)}")
-                    
-                    print(f"[WEBHOOK] ✅ Feedback successfully saved and available")
-                else:
-                    print(f"[WEBHOOK] ⚠️  WARNING: No feedback document found in database!")
-        except Exception as grade_error:
-            print(f"\n[WEBHOOK] ❌ ERROR: Grading failed")
-            print(f"[WEBHOOK] Error: {str(grade_error)}")
-            print(f"[WEBHOOK] Error type: {type(grade_error).__name__}")
-            import traceback
-            print(f"[WEBHOOK] Traceback:")
-            traceback.print_exc()
-            
-            print(f"[WEBHOOK] Note: Frontend will need to poll for grading status")
+        grading_job = await grading_queue.enqueue(request, str(attempt.id))
+        print(f"[WEBHOOK] ✅ Grading job {grading_job.status}")
+        print(f"  - Job ID: {grading_job.id}")
+        print(f"[WEBHOOK] Note: Frontend will poll for grading status")
         
         print(f"\n[WEBHOOK] ✅ Webhook processing complete")
         print(f"[WEBHOOK] Response: {{\"status\": \"success\", \"attempt_id\": \"{str(attempt.id)}\"}}")
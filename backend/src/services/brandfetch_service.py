@@ -5,6 +5,8 @@ from urllib.parse import urlparse
 from decouple import config
 import logging
 
+from services.http_clients import http_clients
+
 logger = logging.getLogger(__name__)
 
 BRANDFETCH_CLIENT_ID = config('BRANDFETCH_API_KEY', cast=str)  # Using BRANDFETCH_API_KEY env var that contains client ID
@@ -16,10 +18,11 @@ class BrandfetchService:
             raise ValueError("BRANDFETCH_API_KEY environment variable is required (should contain client ID)")
         
         self.client_id = BRANDFETCH_CLIENT_ID
-        self.client = httpx.AsyncClient(
-            base_url="https://api.brandfetch.io/v2",
-            timeout=30.0
-        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared brandfetch client, see services/http_clients.py"""
+        return http_clients.get('brandfetch')
     
     async def search_company(self, company_name: str) -> Optional[Dict[str, Any]]:
         """
@@ -207,5 +210,5 @@ class BrandfetchService:
         return round(base_score, 2)
     
     async def close(self):
-        """Close the HTTP client"""
-        await self.client.aclose()
\ No newline at end of file
+        """The HTTP client is shared and closed with the app, nothing to release"""
+        pass
\ No newline at end of file
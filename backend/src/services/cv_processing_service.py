@@ -1,75 +1,61 @@
 import json
-import base64
-import io
+import hashlib
 import asyncio
+import time
 from typing import Dict, List, Optional, Any
 from decouple import config
 import httpx
 from fastapi import HTTPException
-import PyPDF2
-try:
-    from docx import Document
-except ImportError:
-    try:
-        from python_docx import Document
-    except ImportError:
-        Document = None
 from PIL import Image
-try:
-    import fitz  # PyMuPDF for better PDF handling
-except ImportError:
-    fitz = None
 import logging
 
+from services.http_clients import http_clients, chat_completion_content
+from utils.streaming.sse import FieldCallback, reset_fields
+from services.document_extraction import (
+    document_extraction, extract_document, log_parsing_outcome, ExtractedDocument, WORD_CONTENT_TYPES
+)
+
 logger = logging.getLogger(__name__)
 
 # Environment variables
 OPENAI_API_KEY = config('OPENAI_API_KEY', default='', cast=str)
 
+# Bump for parsing changes the prompt text doesn't show (models, validation),
+# cached parses from any other version are never served
+CV_PARSING_PROMPT_VERSION = 1
+
 class CVProcessingService:
     def __init__(self):
         if not OPENAI_API_KEY:
             raise ValueError("OPENAI_API_KEY environment variable is required")
-        
-        self.client = httpx.AsyncClient(
-            base_url="https://api.openai.com/v1",
-            headers={
-                "Authorization": f"Bearer {OPENAI_API_KEY}",
-                "Content-Type": "application/json"
-            },
-            timeout=120.0  # Longer timeout for document processing
-        )
-    
-    async def process_cv(self, file_content: bytes, content_type: str, filename: str) -> Dict[str, Any]:
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared openai client, see services/http_clients.py"""
+        return http_clients.get('openai')
+
+    async def process_cv(
+        self,
+        file_content: bytes,
+        content_type: str,
+        filename: str,
+        document: Optional[ExtractedDocument] = None,
+        on_field: Optional[FieldCallback] = None
+    ) -> Dict[str, Any]:
         """
         Process CV file using OpenAI vision/text capabilities with error handling and validation
-        Returns structured CV data
+        Returns structured CV data. Pass the result of extract_document to
+        reuse an extraction instead of parsing the file again, and on_field
+        to stream the completion and get each top-level field as it arrives,
+        a retried completion resets the fields first (see reset_fields).
         """
-        if not file_content:
-            raise HTTPException(status_code=400, detail="Empty file content")
-        
-        # File size validation (max 10MB)
-        if len(file_content) > 10 * 1024 * 1024:
-            raise HTTPException(
-                status_code=400, 
-                detail="File too large. Maximum size is 10MB."
-            )
+        self._validate_upload(file_content)
         
         try:
             # Convert file to processable format
-            if content_type == 'application/pdf':
-                text_content, images = await self._extract_pdf_content(file_content)
-            elif content_type in ['application/msword', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document']:
-                text_content = await self._extract_docx_content(file_content)
-                images = []
-            elif content_type == 'text/plain':
-                text_content = file_content.decode('utf-8')
-                images = []
-            else:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Unsupported file type. Please upload PDF, DOC, DOCX, or TXT files."
-                )
+            if document is None:
+                document = await self.extract_document(file_content, content_type)
+            text_content, images = document.text, document.images
             
             # Validate extracted content
             if not text_content.strip() and not images:
@@ -79,19 +65,22 @@ class CVProcessingService:
                 )
             
             # Use OpenAI to extract structured data with retry logic
+            started = time.perf_counter()
             try:
                 if images and len(images) > 0:
-                    # Use vision API for PDFs with complex layouts
-                    cv_data = await self._process_with_vision_retry(text_content, images)
+                    # Pages are only rendered when the text layer isn't enough, see classify_pdf_pages
+                    cv_data = await self._process_with_vision_retry(text_content, images, on_field=on_field)
                 else:
                     # Use text-based processing for simpler formats
-                    cv_data = await self._process_with_text_retry(text_content)
+                    cv_data = await self._process_with_text_retry(text_content, on_field=on_field)
                 
                 # Validate OpenAI response
                 self._validate_cv_data(cv_data)
+                log_parsing_outcome("cv", filename, document, "ok", started, cv_data)
                 return cv_data
                 
             except httpx.HTTPStatusError as e:
+                log_parsing_outcome("cv", filename, document, f"http_{e.response.status_code}", started)
                 logger.error(f"OpenAI API error: {e.response.status_code} - {e.response.text}")
                 if e.response.status_code == 429:
                     raise HTTPException(
@@ -108,6 +97,9 @@ class CVProcessingService:
                         status_code=500,
                         detail="CV processing service error. Please try again or contact support."
                     )
+            except Exception as e:
+                log_parsing_outcome("cv", filename, document, type(e).__name__, started)
+                raise
             
         except HTTPException:
             raise
@@ -118,61 +110,29 @@ class CVProcessingService:
                 detail=f"Unexpected error processing CV. Please try again or contact support."
             )
     
-    async def _extract_pdf_content(self, content: bytes) -> tuple[str, List[str]]:
-        """Extract both text and images from PDF"""
-        try:
-            # Extract text using PyMuPDF (more reliable than PyPDF2)
-            doc = fitz.open(stream=content, filetype="pdf")
-            text_content = ""
-            images = []
-            
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                text_content += page.get_text() + "\n"
-                
-                # Convert page to image for vision processing
-                pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))  # 2x zoom for better quality
-                img_data = pix.tobytes("png")
-                img_base64 = base64.b64encode(img_data).decode('utf-8')
-                images.append(img_base64)
-            
-            doc.close()
-            return text_content.strip(), images
-            
-        except Exception as e:
-            # Fallback to PyPDF2 if PyMuPDF fails
-            try:
-                pdf_reader = PyPDF2.PdfReader(io.BytesIO(content))
-                text_content = ""
-                for page in pdf_reader.pages:
-                    text_content += page.extract_text() + "\n"
-                return text_content.strip(), []
-            except Exception:
-                raise Exception(f"Failed to extract PDF content: {str(e)}")
-    
-    async def _extract_docx_content(self, content: bytes) -> str:
-        """Extract text from DOCX file"""
-        if Document is None:
-            raise Exception("DOCX processing not available. Please install python-docx.")
+    def _validate_upload(self, file_content: bytes) -> None:
+        if not file_content:
+            raise HTTPException(status_code=400, detail="Empty file content")
         
-        try:
-            doc = Document(io.BytesIO(content))
-            text_content = ""
-            for paragraph in doc.paragraphs:
-                text_content += paragraph.text + "\n"
-            
-            # Also extract text from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        text_content += cell.text + "\t"
-                    text_content += "\n"
-            
-            return text_content.strip()
-        except Exception as e:
-            raise Exception(f"Failed to extract DOCX content: {str(e)}")
+        # File size validation (max 10MB)
+        if len(file_content) > 10 * 1024 * 1024:
+            raise HTTPException(
+                status_code=400, 
+                detail="File too large. Maximum size is 10MB."
+            )
     
-    async def _process_with_vision(self, text_content: str, images: List[str]) -> Dict[str, Any]:
+    async def extract_document(self, file_content: bytes, content_type: str) -> ExtractedDocument:
+        """Extract text and page images from a CV file once, in the extraction pool"""
+        self._validate_upload(file_content)
+        if content_type not in ['application/pdf', 'text/plain'] + WORD_CONTENT_TYPES:
+            raise HTTPException(
+                status_code=400,
+                detail="Unsupported file type. Please upload PDF, DOC, DOCX, or TXT files."
+            )
+        # Only the first page goes to the vision model
+        return await document_extraction.run(extract_document, file_content, content_type, None, 1)
+    
+    async def _process_with_vision(self, text_content: str, images: List[str], on_field: Optional[FieldCallback] = None) -> Dict[str, Any]:
         """Process CV using OpenAI Vision API for complex layouts"""
         
         # Use the first page image for vision processing
@@ -195,7 +155,7 @@ class CVProcessingService:
             messages[0]["content"].append({
                 "type": "image_url",
                 "image_url": {
-                    "url": f"data:image/png;base64,{first_image}",
+                    "url": first_image,
                     "detail": "high"
                 }
             })
@@ -207,29 +167,23 @@ class CVProcessingService:
                 "text": f"\n\nExtracted text content:\n{text_content}"
             })
         
-        response = await self.client.post(
-            "/chat/completions",
-            json={
+        content = await chat_completion_content(
+            {
                 "model": "gpt-4o",  # Vision model
                 "messages": messages,
                 "response_format": {"type": "json_object"},
                 "temperature": 0.1,
                 "max_tokens": 4000
-            }
+            },
+            on_field
         )
         
-        if response.status_code != 200:
-            raise Exception(f"OpenAI API error: {response.status_code} - {response.text}")
-        
-        result = response.json()
-        content = result['choices'][0]['message']['content']
-        
         try:
             return json.loads(content)
         except json.JSONDecodeError as e:
             raise Exception(f"Failed to parse OpenAI response as JSON: {str(e)}")
     
-    async def _process_with_text(self, text_content: str) -> Dict[str, Any]:
+    async def _process_with_text(self, text_content: str, on_field: Optional[FieldCallback] = None) -> Dict[str, Any]:
         """Process CV using text-only OpenAI processing"""
         
         messages = [
@@ -239,28 +193,27 @@ class CVProcessingService:
             }
         ]
         
-        response = await self.client.post(
-            "/chat/completions",
-            json={
+        content = await chat_completion_content(
+            {
                 "model": "gpt-4o-mini",  # Text model, more cost-effective
                 "messages": messages,
                 "response_format": {"type": "json_object"},
                 "temperature": 0.1,
                 "max_tokens": 4000
-            }
+            },
+            on_field
         )
         
-        if response.status_code != 200:
-            raise Exception(f"OpenAI API error: {response.status_code} - {response.text}")
-        
-        result = response.json()
-        content = result['choices'][0]['message']['content']
-        
         try:
             return json.loads(content)
         except json.JSONDecodeError as e:
             raise Exception(f"Failed to parse OpenAI response as JSON: {str(e)}")
     
+    def get_prompt_version(self) -> str:
+        """Version of the parsing prompt, part of the CV parse cache key"""
+        prompt_hash = hashlib.sha256(self._get_cv_parsing_prompt().encode('utf-8')).hexdigest()[:12]
+        return f"v{CV_PARSING_PROMPT_VERSION}-{prompt_hash}"
+
     def _get_cv_parsing_prompt(self) -> str:
         """Get the comprehensive CV parsing prompt"""
         return """
@@ -356,22 +309,37 @@ Instructions:
 10. Return ONLY the JSON object, no additional text or explanations
 """
 
-    async def _process_with_vision_retry(self, text_content: str, images: List[str], max_retries: int = 3) -> Dict[str, Any]:
+    async def _process_with_vision_retry(
+        self,
+        text_content: str,
+        images: List[str],
+        max_retries: int = 3,
+        on_field: Optional[FieldCallback] = None
+    ) -> Dict[str, Any]:
         """Process CV with vision API with retry logic"""
         for attempt in range(max_retries):
+            if attempt > 0:
+                await reset_fields(on_field)
             try:
-                return await self._process_with_vision(text_content, images)
+                return await self._process_with_vision(text_content, images, on_field)
             except Exception as e:
                 if attempt == max_retries - 1:
                     raise
                 logger.warning(f"Vision processing attempt {attempt + 1} failed: {str(e)}")
                 await asyncio.sleep(2 ** attempt)  # Exponential backoff
     
-    async def _process_with_text_retry(self, text_content: str, max_retries: int = 3) -> Dict[str, Any]:
+    async def _process_with_text_retry(
+        self,
+        text_content: str,
+        max_retries: int = 3,
+        on_field: Optional[FieldCallback] = None
+    ) -> Dict[str, Any]:
         """Process CV with text API with retry logic"""
         for attempt in range(max_retries):
+            if attempt > 0:
+                await reset_fields(on_field)
             try:
-                return await self._process_with_text(text_content)
+                return await self._process_with_text(text_content, on_field)
             except Exception as e:
                 if attempt == max_retries - 1:
                     raise
@@ -426,5 +394,5 @@ Instructions:
             cv_data['projects'] = []
     
     async def close(self):
-        """Close the HTTP client"""
-        await self.client.aclose()
\ No newline at end of file
+        """The HTTP client is shared and closed with the app, nothing to release"""
+        pass
\ No newline at end of file
@@ -0,0 +1,372 @@
+import asyncio
+import base64
+import io
+import json
+import multiprocessing
+import os
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from decouple import config
+from fastapi import HTTPException
+from PIL import Image
+import PyPDF2
+try:
+    from docx import Document
+except ImportError:
+    try:
+        from python_docx import Document
+    except ImportError:
+        Document = None
+try:
+    import fitz  # PyMuPDF for better PDF handling
+except ImportError:
+    fitz = None
+
+# Worker processes for PDF / DOCX parsing, 0 runs it on a thread instead
+DOCUMENT_EXTRACTION_WORKERS = config(
+    'DOCUMENT_EXTRACTION_WORKERS', default=min(4, os.cpu_count() or 1), cast=int
+)
+# Extractions allowed to wait for a free worker before uploads are turned away
+DOCUMENT_EXTRACTION_MAX_QUEUE = config('DOCUMENT_EXTRACTION_MAX_QUEUE', default=16, cast=int)
+
+# Vision inputs: target resolution of gpt-4o high detail processing, never zoomed past 2x
+VISION_MAX_SHORT_SIDE = config('VISION_MAX_SHORT_SIDE', default=768, cast=int)
+VISION_MAX_LONG_SIDE = config('VISION_MAX_LONG_SIDE', default=2048, cast=int)
+VISION_MAX_ZOOM = 2.0
+VISION_IMAGE_FORMAT = config('VISION_IMAGE_FORMAT', default='jpeg', cast=str).lower()  # jpeg or webp
+VISION_IMAGE_QUALITY = config('VISION_IMAGE_QUALITY', default=80, cast=int)
+
+# Text vs vision routing for PDFs, see classify_pdf_pages. Tune from the [PARSE-ROUTE] logs
+PARSE_ROUTE_FORCE_VISION = config('PARSE_ROUTE_FORCE_VISION', default=False, cast=bool)
+PARSE_ROUTE_MIN_CHARS_PER_PAGE = config('PARSE_ROUTE_MIN_CHARS_PER_PAGE', default=300, cast=int)
+PARSE_ROUTE_MIN_PRINTABLE_RATIO = config('PARSE_ROUTE_MIN_PRINTABLE_RATIO', default=0.9, cast=float)
+PARSE_ROUTE_MAX_IMAGE_COVERAGE = config('PARSE_ROUTE_MAX_IMAGE_COVERAGE', default=0.5, cast=float)
+PARSE_ROUTE_MAX_COLUMNS = config('PARSE_ROUTE_MAX_COLUMNS', default=2, cast=int)
+
+WORD_CONTENT_TYPES = ['application/msword', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document']
+
+
+@dataclass
+class ParsingRoute:
+    """Whether a document is parsed from its text layer or from page images, and why"""
+    route: str  # 'text' or 'vision'
+    reason: str
+    chars_per_page: float = 0.0
+    # Share of extracted characters that are readable (not replacement / private use glyphs)
+    printable_ratio: float = 1.0
+    # Share of the page area covered by embedded images
+    image_coverage: float = 0.0
+    columns: int = 0
+
+
+# Extraction functions run in the worker processes, so they must stay
+# module level (picklable) and only take and return plain data.
+
+def extract_pdf_content(
+    content: bytes,
+    max_pages: Optional[int] = None,
+    render_pages: Optional[int] = None
+) -> Tuple[str, List[str]]:
+    """
+    Extract text from the first max_pages pages of a PDF and render the first
+    render_pages of them as vision inputs (None = all), see render_page_for_vision.
+    Pages are only rendered when classify_pdf_pages routes the PDF to vision.
+    Falls back to PyPDF2, text only, when PyMuPDF is missing or fails.
+    """
+    text_content, images, _, _ = _extract_pdf(content, max_pages, render_pages)
+    return text_content, images
+
+
+def _extract_pdf(
+    content: bytes,
+    max_pages: Optional[int],
+    render_pages: Optional[int]
+) -> Tuple[str, List[str], int, ParsingRoute]:
+    """(text, page images, total page count, routing decision) from a single open of the PDF"""
+    try:
+        if fitz is None:
+            raise Exception("PyMuPDF not available")
+
+        doc = fitz.open(stream=content, filetype="pdf")
+        total_pages = len(doc)
+        pages = [doc.load_page(page_num) for page_num in range(
+            total_pages if max_pages is None else min(total_pages, max_pages)
+        )]
+        page_texts = [page.get_text() for page in pages]
+        text_content = "".join(page_text + "\n" for page_text in page_texts).strip()
+
+        route = classify_pdf_pages(pages, page_texts)
+        images = []
+        if route.route == 'vision':
+            images = [render_page_for_vision(page) for page in pages[:render_pages]]
+
+        doc.close()
+        return text_content, images, total_pages, route
+
+    except Exception as e:
+        try:
+            pdf_reader = PyPDF2.PdfReader(io.BytesIO(content))
+            text_content = ""
+            for page in pdf_reader.pages[:max_pages]:
+                text_content += page.extract_text() + "\n"
+            route = ParsingRoute('text', 'PyMuPDF unavailable, no page renders')
+            return text_content.strip(), [], len(pdf_reader.pages), route
+        except Exception:
+            raise Exception(f"Failed to extract PDF content: {str(e)}")
+
+
+def classify_pdf_pages(pages: List[Any], page_texts: List[str]) -> ParsingRoute:
+    """
+    Decide from the text layer alone whether it carries the document well
+    enough for the cheaper text parse. Vision is only needed for scans,
+    sparse or garbled text layers and layouts text extraction scrambles.
+    """
+    page_count = len(pages)
+    text = "".join(page_texts)
+    chars = len(text.strip())
+    features = {
+        "chars_per_page": round(chars / page_count, 1) if page_count else 0.0,
+        "printable_ratio": round(_printable_ratio(text), 3),
+        "image_coverage": round(sum(_image_coverage(page) for page in pages) / page_count, 3) if page_count else 0.0,
+        "columns": max((_count_columns(page) for page in pages), default=0),
+    }
+
+    if PARSE_ROUTE_FORCE_VISION:
+        return ParsingRoute('vision', 'forced by PARSE_ROUTE_FORCE_VISION', **features)
+    if features["chars_per_page"] < PARSE_ROUTE_MIN_CHARS_PER_PAGE:
+        reason = 'scanned pages' if features["image_coverage"] >= PARSE_ROUTE_MAX_IMAGE_COVERAGE else 'sparse text layer'
+        return ParsingRoute('vision', reason, **features)
+    if features["printable_ratio"] < PARSE_ROUTE_MIN_PRINTABLE_RATIO:
+        return ParsingRoute('vision', 'garbled text layer', **features)
+    if features["columns"] > PARSE_ROUTE_MAX_COLUMNS:
+        return ParsingRoute('vision', 'multi-column layout', **features)
+    return ParsingRoute('text', 'rich text layer', **features)
+
+
+def _printable_ratio(text: str) -> float:
+    visible = [char for char in text if not char.isspace()]
+    if not visible:
+        return 0.0
+    readable = sum(
+        1 for char in visible
+        if char != '\ufffd' and char.isprintable() and unicodedata.category(char) != 'Co'
+    )
+    return readable / len(visible)
+
+
+def _image_coverage(page: Any) -> float:
+    page_area = abs(page.rect)
+    if not page_area:
+        return 0.0
+    covered = sum(abs(fitz.Rect(info["bbox"]) & page.rect) for info in page.get_image_info())
+    return min(1.0, covered / page_area)
+
+
+def _count_columns(page: Any) -> int:
+    """Text columns on a page: clusters of left edges shared by several narrow text blocks"""
+    width = page.rect.width
+    left_edges = sorted(
+        block[0] for block in page.get_text("blocks")
+        if block[6] == 0 and block[4].strip() and (block[2] - block[0]) < width * 0.6
+    )
+    clusters: List[List[float]] = []
+    for x0 in left_edges:
+        if clusters and x0 - clusters[-1][-1] <= width * 0.05:
+            clusters[-1].append(x0)
+        else:
+            clusters.append([x0])
+    columns = sum(1 for cluster in clusters if len(cluster) >= 3)
+    return max(columns, 1) if left_edges else 0
+
+
+def render_page_for_vision(page) -> str:
+    """
+    Render a PDF page as a compressed data URL sized for the vision model.
+    gpt-4o scales high detail images to fit 2048px and then to 768px on the
+    short side, so anything rendered beyond that is only upload and encode
+    cost. The zoom is picked from the page size to land on that resolution.
+    """
+    rect = page.rect
+    zoom = min(
+        VISION_MAX_SHORT_SIDE / min(rect.width, rect.height),
+        VISION_MAX_LONG_SIDE / max(rect.width, rect.height),
+        VISION_MAX_ZOOM
+    )
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+    image = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+
+    buffer = io.BytesIO()
+    if VISION_IMAGE_FORMAT == 'webp':
+        image.save(buffer, format="WEBP", quality=VISION_IMAGE_QUALITY, method=4)
+    else:
+        image.save(buffer, format="JPEG", quality=VISION_IMAGE_QUALITY, optimize=True)
+    return f"data:image/{VISION_IMAGE_FORMAT};base64,{base64.b64encode(buffer.getvalue()).decode('utf-8')}"
+
+
+def extract_docx_content(
+    content: bytes,
+    max_paragraphs: Optional[int] = None,
+    max_tables: Optional[int] = None
+) -> str:
+    """Extract paragraph and table text from a DOCX file"""
+    if Document is None:
+        raise Exception("DOCX processing not available. Please install python-docx.")
+
+    try:
+        doc = Document(io.BytesIO(content))
+        text_content = ""
+        for paragraph in doc.paragraphs[:max_paragraphs]:
+            text_content += paragraph.text + "\n"
+
+        for table in doc.tables[:max_tables]:
+            for row in table.rows:
+                for cell in row.cells:
+                    text_content += cell.text + "\t"
+                text_content += "\n"
+
+        return text_content.strip()
+    except Exception as e:
+        raise Exception(f"Failed to extract DOCX content: {str(e)}")
+
+
+@dataclass
+class ExtractedDocument:
+    """Everything read from an uploaded file, shared by the LLM prompt and storage"""
+    content_type: str
+    text: str
+    # Page renders as data URLs for vision processing, empty when the text layer is enough
+    images: List[str] = field(default_factory=list)
+    page_count: int = 0
+    parsing_route: Optional[ParsingRoute] = None
+
+
+TEXT_ONLY_ROUTE = ParsingRoute('text', 'format has no page renders')
+
+
+def extract_document(
+    content: bytes,
+    content_type: str,
+    max_pages: Optional[int] = None,
+    render_pages: Optional[int] = None
+) -> ExtractedDocument:
+    """
+    Extract text, page images and page count from a PDF, Word or text file
+    in one pass, so the same result feeds the LLM prompt and the stored raw text.
+    """
+    if content_type == 'application/pdf':
+        return ExtractedDocument(content_type, *_extract_pdf(content, max_pages, render_pages))
+    elif content_type in WORD_CONTENT_TYPES:
+        return ExtractedDocument(content_type, extract_docx_content(content), parsing_route=TEXT_ONLY_ROUTE)
+    elif content_type == 'text/plain':
+        return ExtractedDocument(content_type, content.decode('utf-8'), parsing_route=TEXT_ONLY_ROUTE)
+    raise ValueError(f"Unsupported content type: {content_type}")
+
+
+# Parsed documents per route and outcome since startup
+ParseRouteMetrics: Dict[str, int] = {}
+
+
+def log_parsing_outcome(
+    kind: str,
+    filename: str,
+    document: ExtractedDocument,
+    outcome: str,
+    started: float,
+    parsed_data: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    Log one [PARSE-ROUTE] line per parsed document with the routing decision,
+    its features and how the parse went, to tune the PARSE_ROUTE_* thresholds.
+    """
+    route = document.parsing_route or TEXT_ONLY_ROUTE
+    metric = f"{kind}.{route.route}.{outcome}"
+    ParseRouteMetrics[metric] = ParseRouteMetrics.get(metric, 0) + 1
+    print("[PARSE-ROUTE] " + json.dumps({
+        "kind": kind,
+        "filename": filename,
+        "content_type": document.content_type,
+        "pages": document.page_count,
+        **asdict(route),
+        "outcome": outcome,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000),
+        "filled_fields": sum(1 for value in parsed_data.values() if value) if parsed_data else 0
+    }))
+
+
+class DocumentExtractionPool:
+    """
+    Runs CPU-bound document parsing (PyMuPDF rendering, PyPDF2 and
+    python-docx) in a process pool so it doesn't block the event loop.
+
+    At most workers + max_queue extractions are admitted at once; uploads
+    beyond that get a 503 straight away instead of piling up behind a
+    backlog they would time out in. Started in the main.py lifespan; used
+    outside the lifespan (scripts, tests) the pool is created lazily.
+    """
+
+    def __init__(self, workers: int = DOCUMENT_EXTRACTION_WORKERS, max_queue: int = DOCUMENT_EXTRACTION_MAX_QUEUE):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.metrics: Dict[str, int] = {"active": 0, "completed": 0, "failed": 0, "rejected": 0}
+
+    def start(self) -> None:
+        """Create the worker processes"""
+        if self._executor is not None or self.workers <= 0:
+            return
+        # spawn, forking a process running the event loop and driver threads isn't safe
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+        print(f"[DOCUMENT-EXTRACTION] Started pool with {self.workers} workers")
+
+    def stop(self, executor: Optional[ProcessPoolExecutor] = None) -> None:
+        """
+        Shut the pool down, dropping extractions that haven't started. With
+        executor, only if that is still the current pool (not a replacement).
+        """
+        if self._executor is None or (executor is not None and executor is not self._executor):
+            return
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run an extraction function from this module off the event loop"""
+        if self.metrics["active"] >= self.workers + self.max_queue:
+            self.metrics["rejected"] += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Too many documents are being processed right now. Please try again in a few moments."
+            )
+
+        self.metrics["active"] += 1
+        executor = None
+        try:
+            if self.workers <= 0:
+                result = await asyncio.to_thread(fn, *args)
+            else:
+                self.start()
+                executor = self._executor
+                result = await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+            self.metrics["completed"] += 1
+            return result
+        except BrokenProcessPool:
+            # A worker died mid-parse (e.g. a malformed PDF crashing PyMuPDF), replace the pool
+            # unless another waiter on the broken pool already did
+            self.metrics["failed"] += 1
+            self.stop(executor)
+            raise Exception("Document extraction worker crashed while parsing the file")
+        except Exception:
+            self.metrics["failed"] += 1
+            raise
+        finally:
+            self.metrics["active"] -= 1
+
+
+# Global pool, started in the app lifespan
+document_extraction = DocumentExtractionPool()
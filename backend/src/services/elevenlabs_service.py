@@ -6,18 +6,13 @@ from decouple import config
 from crud.interviews.interviews import get_interview
 from crud.interviews.cv_profiles import get_user_cv
 from crud.users.auth.users import get_user_by_id
-
-# Environment variables - these need to be set
-ELEVENLABS_API_KEY = config('ELEVENLABS_API_KEY', default='', cast=str)
-ELEVENLABS_BASE_URL = "https://api.elevenlabs.io/v1"
+from services.http_clients import http_clients
 
 class ElevenLabsService:
-    def __init__(self):
-        self.client = httpx.AsyncClient(
-            base_url=ELEVENLABS_BASE_URL,
-            headers={"xi-api-key": ELEVENLABS_API_KEY},
-            timeout=30.0
-        )
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared elevenlabs client, see services/http_clients.py"""
+        return http_clients.get('elevenlabs')
     
     async def create_interview_agent(self, interview_id: str, user_id: str) -> str:
         """Create an ElevenLabs agent for the interview session"""
@@ -4,16 +4,12 @@ from typing import List, Dict, Optional
 from fastapi import Request
 from decouple import config
 
+from services.http_clients import http_clients
+
 # Environment variables
 ELEVENLABS_API_KEY = config('ELEVENLABS_API_KEY', default='', cast=str)
 
 class ElevenLabsTranscriptService:
-    def __init__(self):
-        self.base_url = "https://api.elevenlabs.io/v1"
-        self.headers = {
-            "xi-api-key": ELEVENLABS_API_KEY
-        }
-    
     async def get_conversation_transcript(self, conversation_id: str, max_retries: int = 5) -> Optional[List[Dict]]:
         """
         Retrieve transcript from ElevenLabs conversation API
@@ -25,48 +21,46 @@ class ElevenLabsTranscriptService:
             
         print(f"\n🎙️ [ELEVENLABS] Fetching transcript for conversation: {conversation_id}")
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            for attempt in range(max_retries):
-                try:
-                    response = await client.get(
-                        f"{self.base_url}/convai/conversations/{conversation_id}",
-                        headers=self.headers
-                    )
-                    
-                    if response.status_code == 404:
-                        print(f"   ⚠️  Conversation not found (attempt {attempt + 1}/{max_retries})")
-                        await asyncio.sleep(2)
-                        continue
-                        
-                    response.raise_for_status()
-                    data = response.json()
-                    
-                    status = data.get('status', '')
-                    print(f"   - Status: {status} (attempt {attempt + 1}/{max_retries})")
-                    
-                    if status in ['done', 'processing']:
-                        transcript = data.get('transcript', [])
-                        print(f"   ✅ Retrieved transcript with {len(transcript)} entries")
-                        return transcript  # Return original ElevenLabs format
-                    
-                    elif status in ['failed']:
-                        print(f"   ❌ Conversation failed")
-                        return None
-                    
-                    else:
-                        print(f"   ⏳ Status '{status}' - waiting 3 seconds before retry...")
-                        await asyncio.sleep(3)
-                        
-                except httpx.RequestError as e:
-                    print(f"   ❌ Request error (attempt {attempt + 1}/{max_retries}): {e}")
-                    if attempt < max_retries - 1:
-                        await asyncio.sleep(2)
+        for attempt in range(max_retries):
+            try:
+                response = await http_clients.get('elevenlabs').get(
+                    f"/convai/conversations/{conversation_id}"
+                )
+                
+                if response.status_code == 404:
+                    print(f"   ⚠️  Conversation not found (attempt {attempt + 1}/{max_retries})")
+                    await asyncio.sleep(2)
+                    continue
                     
-                except httpx.HTTPStatusError as e:
-                    print(f"   ❌ HTTP error (attempt {attempt + 1}/{max_retries}): {e.response.status_code}")
-                    if attempt < max_retries - 1:
-                        await asyncio.sleep(2)
+                response.raise_for_status()
+                data = response.json()
+                
+                status = data.get('status', '')
+                print(f"   - Status: {status} (attempt {attempt + 1}/{max_retries})")
+                
+                if status in ['done', 'processing']:
+                    transcript = data.get('transcript', [])
+                    print(f"   ✅ Retrieved transcript with {len(transcript)} entries")
+                    return transcript  # Return original ElevenLabs format
+                
+                elif status in ['failed']:
+                    print(f"   ❌ Conversation failed")
+                    return None
+                
+                else:
+                    print(f"   ⏳ Status '{status}' - waiting 3 seconds before retry...")
+                    await asyncio.sleep(3)
                     
+            except httpx.RequestError as e:
+                print(f"   ❌ Request error (attempt {attempt + 1}/{max_retries}): {e}")
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(2)
+                
+            except httpx.HTTPStatusError as e:
+                print(f"   ❌ HTTP error (attempt {attempt + 1}/{max_retries}): {e.response.status_code}")
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(2)
+                
         print(f"   ❌ Failed to retrieve transcript after {max_retries} attempts")
         return None
     
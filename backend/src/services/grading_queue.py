@@ -0,0 +1,215 @@
+import asyncio
+import json
+import random
+from types import SimpleNamespace
+from typing import List, Optional
+from fastapi import Request
+from decouple import config
+import httpx
+
+from crud.interviews.attempts import get_attempt_feedback
+from crud.interviews.grading_jobs import (
+    enqueue_grading_job, claim_grading_job, complete_grading_job,
+    retry_grading_job, dead_letter_grading_job, renew_grading_job_lease
+)
+from models.interviews.grading_jobs import GradingJob
+from services.grading_service import grading_service
+
+# Number of worker coroutines per process, i.e. concurrent gradings
+GRADING_WORKERS = config('GRADING_WORKERS', default=4, cast=int)
+GRADING_MAX_ATTEMPTS = config('GRADING_MAX_ATTEMPTS', default=5, cast=int)
+GRADING_RETRY_BASE_SECONDS = config('GRADING_RETRY_BASE_SECONDS', default=5.0, cast=float)
+GRADING_RETRY_MAX_SECONDS = config('GRADING_RETRY_MAX_SECONDS', default=300.0, cast=float)
+# Renewed every third of it while grading, a job is only picked up again if its worker died
+GRADING_LEASE_SECONDS = config('GRADING_LEASE_SECONDS', default=180, cast=int)
+GRADING_POLL_SECONDS = config('GRADING_POLL_SECONDS', default=5.0, cast=float)
+
+
+class GradingLeaseLost(Exception):
+    """The worker's lease on a job expired and another worker claimed it"""
+
+
+class GradingQueue:
+    """
+    Mongo-backed queue for interview grading.
+
+    Jobs live in the grading_jobs collection and are claimed atomically,
+    so any number of workers across processes can share the queue. Each
+    worker grades one attempt at a time; failed attempts are retried with
+    exponential backoff and moved to the dead state once they run out of
+    attempts, at which point fallback feedback is saved for the user.
+    """
+
+    def __init__(
+        self,
+        workers: int = GRADING_WORKERS,
+        max_attempts: int = GRADING_MAX_ATTEMPTS,
+        retry_base_seconds: float = GRADING_RETRY_BASE_SECONDS,
+        retry_max_seconds: float = GRADING_RETRY_MAX_SECONDS,
+        lease_seconds: int = GRADING_LEASE_SECONDS,
+        poll_seconds: float = GRADING_POLL_SECONDS
+    ):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+
+    def start(self, app) -> None:
+        """Start the worker coroutines on the running event loop"""
+        if self._tasks:
+            return
+        # Workers run outside a request, the CRUD layer only needs req.app
+        req = SimpleNamespace(app=app)
+        self._tasks = [
+            asyncio.create_task(self._worker(req, index))
+            for index in range(self.workers)
+        ]
+        print(f"[GRADING-QUEUE] Started {self.workers} workers")
+
+    async def stop(self) -> None:
+        """Cancel the workers, a job in progress is picked up again once its lease expires"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def enqueue(self, req: Request, attempt_id: str) -> GradingJob:
+        """Enqueue grading for an attempt and wake up an idle worker"""
+        job = await enqueue_grading_job(req, attempt_id, self.max_attempts)
+        self._wakeup.set()
+        return job
+
+    def backoff_seconds(self, attempts: int) -> float:
+        """Exponential backoff with jitter for the given number of attempts made"""
+        delay = min(self.retry_max_seconds, self.retry_base_seconds * 2 ** (attempts - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def run_once(self, req: Request) -> Optional[GradingJob]:
+        """Claim and process a single due job, returns None if the queue is empty"""
+        job = await claim_grading_job(req, self.lease_seconds)
+        if job:
+            await self._process(req, job)
+        return job
+
+    async def _worker(self, req: Request, index: int) -> None:
+        while True:
+            try:
+                job = await self.run_once(req)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[GRADING-QUEUE] Worker {index} error: {type(e).__name__}: {e}")
+                job = None
+
+            if job:
+                continue
+
+            # Idle until a job is enqueued in this process or the poll interval passes
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _process(self, req: Request, job: GradingJob) -> None:
+        print(f"[GRADING-QUEUE] Grading attempt {job.attempt_id} (attempt {job.attempts}/{job.max_attempts})")
+
+        if job.attempts > job.max_attempts:
+            # The worker running the final attempt died before finishing it
+            await self._dead_letter(req, job, job.last_error or "Lease expired on the final attempt")
+            return
+
+        # Already graded, e.g. the previous worker saved feedback then lost its lease
+        if await get_attempt_feedback(req, job.attempt_id):
+            if not await complete_grading_job(req, job):
+                self._lost_lease(job)
+            return
+
+        try:
+            await self._grade_holding_lease(req, job)
+        except GradingLeaseLost:
+            self._lost_lease(job)
+            return
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            if not self._is_retryable(e) or job.attempts >= job.max_attempts:
+                await self._dead_letter(req, job, error)
+            else:
+                delay = self.backoff_seconds(job.attempts)
+                print(f"[GRADING-QUEUE] Attempt {job.attempt_id} failed, retrying in {delay:.1f}s: {error}")
+                if not await retry_grading_job(req, job, error, delay):
+                    self._lost_lease(job)
+            return
+
+        if not await complete_grading_job(req, job):
+            self._lost_lease(job)
+            return
+        print(f"[GRADING-QUEUE] ✅ Graded attempt {job.attempt_id}")
+
+    async def _grade_holding_lease(self, req: Request, job: GradingJob) -> None:
+        """
+        Grade the attempt while renewing the job's lease, so a long grading
+        (e.g. a long transcript graded in segments) isn't claimed by a second
+        worker. Grading is cancelled if the lease is lost anyway.
+        """
+        grading = asyncio.create_task(
+            grading_service.grade_interview(req, job.attempt_id, fallback_on_error=False)
+        )
+        heartbeat = asyncio.create_task(self._renew_lease(req, job))
+        try:
+            await asyncio.wait({grading, heartbeat}, return_when=asyncio.FIRST_COMPLETED)
+            if not grading.done():
+                raise GradingLeaseLost(job.attempt_id)
+            grading.result()
+        finally:
+            heartbeat.cancel()
+            grading.cancel()
+            await asyncio.gather(grading, heartbeat, return_exceptions=True)
+
+    async def _renew_lease(self, req: Request, job: GradingJob) -> None:
+        """Renew the lease every third of its length, returns once it is lost"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                if not await renew_grading_job_lease(req, job, self.lease_seconds):
+                    return
+            except Exception as e:
+                # Keep grading, the next renewal may get through before the lease runs out
+                print(f"[GRADING-QUEUE] Could not renew the lease on {job.attempt_id}: {type(e).__name__}: {e}")
+
+    async def _dead_letter(self, req: Request, job: GradingJob, error: str) -> None:
+        if not await dead_letter_grading_job(req, job, error):
+            self._lost_lease(job)
+            return
+        print(f"[GRADING-QUEUE] ❌ Attempt {job.attempt_id} moved to dead state: {error}")
+        try:
+            await grading_service.save_fallback_feedback(req, job.attempt_id)
+        except Exception as fallback_error:
+            print(f"[GRADING-QUEUE] Could not save fallback feedback for {job.attempt_id}: {fallback_error}")
+
+    @staticmethod
+    def _lost_lease(job: GradingJob) -> None:
+        """The lease expired and another worker claimed the job, its state is theirs to set"""
+        print(f"[GRADING-QUEUE] Lost the lease on attempt {job.attempt_id}, leaving the job to its new owner")
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        """Missing data and client errors other than rate limits won't succeed on retry"""
+        if isinstance(error, json.JSONDecodeError):
+            # Malformed model output, a new completion may parse
+            return True
+        if isinstance(error, ValueError):
+            # Missing attempt or interview
+            return False
+        if isinstance(error, httpx.HTTPStatusError):
+            status_code = error.response.status_code
+            return status_code == 429 or status_code >= 500
+        return True
+
+
+# Global queue instance, started in the app lifespan
+grading_queue = GradingQueue()
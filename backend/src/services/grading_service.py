@@ -1,27 +1,56 @@
+import asyncio
 import json
-from typing import Dict, List
+from typing import Dict, List, Tuple
 from fastapi import Request
 from decouple import config
 import httpx
 
+from services.http_clients import http_clients, post_chat_completion
 from crud.interviews.attempts import get_attempt, create_feedback, update_attempt
 from crud.interviews.interviews import get_interview, update_interview_scores
 from config.interview_configs import get_interview_config
+from config.grading_prompts import get_grading_prompt
 from models.interviews.interview_types import InterviewType
 
 # Environment variables - these need to be set
 OPENAI_API_KEY = config('OPENAI_API_KEY', default='', cast=str)
 
+# Transcripts above this many (estimated) tokens are graded in overlapping segments
+GRADING_SEGMENT_TOKENS = config('GRADING_SEGMENT_TOKENS', default=6000, cast=int)
+# Turns repeated at the start of each segment from the end of the previous one
+GRADING_SEGMENT_OVERLAP_TURNS = config('GRADING_SEGMENT_OVERLAP_TURNS', default=2, cast=int)
+# Segments of one transcript graded at the same time
+GRADING_MAX_PARALLEL_SEGMENTS = config('GRADING_MAX_PARALLEL_SEGMENTS', default=3, cast=int)
+# Strengths and improvement areas kept when merging segment feedback
+MERGED_FEEDBACK_ITEMS = 5
+
+# Prompt tokens of the grading calls since startup, and how many OpenAI served from its prompt cache
+GradingPromptCacheMetrics: Dict[str, int] = {"requests": 0, "prompt_tokens": 0, "cached_tokens": 0}
+
+
+def record_prompt_cache_usage(usage: Dict) -> None:
+    """Add the usage of a chat completion to GradingPromptCacheMetrics"""
+    prompt_tokens = usage.get("prompt_tokens", 0)
+    cached_tokens = (usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0)
+    GradingPromptCacheMetrics["requests"] += 1
+    GradingPromptCacheMetrics["prompt_tokens"] += prompt_tokens
+    GradingPromptCacheMetrics["cached_tokens"] += cached_tokens
+    total = GradingPromptCacheMetrics["prompt_tokens"]
+    hit_rate = GradingPromptCacheMetrics["cached_tokens"] / total if total else 0.0
+    print(f"[GRADING] Prompt cache: {cached_tokens}/{prompt_tokens} tokens cached, {hit_rate:.0%} since startup")
+
 class InterviewGradingService:
-    def __init__(self):
-        self.client = httpx.AsyncClient(
-            base_url="https://api.openai.com/v1",
-            headers={"Authorization": f"Bearer {OPENAI_API_KEY}"},
-            timeout=60.0
-        )
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared openai client, see services/http_clients.py"""
+        return http_clients.get('openai')
     
-    async def grade_interview(self, req: Request, attempt_id: str) -> Dict:
-        """Grade an interview attempt using AI"""
+    async def grade_interview(self, req: Request, attempt_id: str, fallback_on_error: bool = True) -> Dict:
+        """
+        Grade an interview attempt using AI.
+        With fallback_on_error=False errors are raised instead of saving
+        fallback feedback, so the grading queue can retry them.
+        """
 
         print(f"[GRADING] Attempt ID: {attempt_id}")
         
@@ -46,7 +75,8 @@ class InterviewGradingService:
             print(f"[GRADING] Raw transcript type: {type(raw_transcript)}")
             print(f"[GRADING] Raw transcript length: {len(raw_transcript) if raw_transcript else 0}")
             
-            transcript_text = self._format_transcript(raw_transcript)
+            transcript_turns = self._format_turns(raw_transcript)
+            transcript_text = "\n".join(transcript_turns)
             print(f"[GRADING] Transcript text: {transcript_text}")
             
             if not transcript_text.strip():
@@ -58,10 +88,6 @@ class InterviewGradingService:
                 await self._save_feedback(req, attempt_id, interview, interview_type, default_feedback)
                 return default_feedback
             
-            # Create grading prompt using interview type config
-            grading_prompt = await self._build_grading_prompt(req, interview, transcript_text, interview_type)
-            print(f"[GRADING] Grading prompt: {grading_prompt}")
-            
             # Check if API key is configured
             if not OPENAI_API_KEY:
                 default_feedback = await self._create_fallback_feedback(attempt_id, interview)
@@ -71,25 +97,15 @@ class InterviewGradingService:
                 await self._save_feedback(req, attempt_id, interview, interview_type, default_feedback)
                 return default_feedback
             
-            # Call OpenAI API
-            
-            response = await self.client.post(
-                "/chat/completions",
-                json={
-                    "model": "gpt-4o-mini",  # More cost-effective model
-                    "messages": [{"role": "user", "content": grading_prompt}],
-                    "response_format": {"type": "json_object"},
-                    "temperature": 0.3
-                }
-            )
-            print(f"[GRADING] Response: {response}")
-
-            response.raise_for_status()
-            result = response.json()
-            print(f"[GRADING] Result: {result}")
-            
-            # Parse the AI response
-            feedback_data = json.loads(result['choices'][0]['message']['content'])
+            if _estimate_tokens(transcript_text) > GRADING_SEGMENT_TOKENS:
+                # Too long for one request, grade segments and merge them
+                feedback_data = await self._grade_in_segments(req, interview, transcript_turns, interview_type)
+            else:
+                # Create grading prompt using interview type config
+                grading_prompt = await self._build_grading_prompt(req, interview, transcript_text, interview_type)
+                print(f"[GRADING] Grading prompt: {grading_prompt}")
+                
+                feedback_data = await self._grade_prompt(grading_prompt)
             print(f"[GRADING] Feedback data 1: {feedback_data}")
             
             # Ensure required fields exist
@@ -105,6 +121,9 @@ class InterviewGradingService:
             import traceback
             traceback.print_exc()
             print(f"[GRADING] Error: {e}")
+
+            if not fallback_on_error:
+                raise
             
             # Try to get interview data if not already loaded
             try:
@@ -125,6 +144,16 @@ class InterviewGradingService:
                 pass
             return default_feedback
     
+    async def save_fallback_feedback(self, req: Request, attempt_id: str) -> Dict:
+        """Save fallback feedback for an attempt that could not be graded"""
+        attempt = await self._get_attempt_data(req, attempt_id)
+        interview = await self._get_interview_data(req, attempt['interview_id'])
+        interview_type = InterviewType(interview.get('interview_type', InterviewType.TECHNICAL_SCREENING_CALL))
+
+        fallback_feedback = await self._create_fallback_feedback(attempt_id, interview)
+        await self._save_feedback(req, attempt_id, interview, interview_type, fallback_feedback)
+        return fallback_feedback
+
     async def _save_feedback(self, req: Request, attempt_id: str, interview: Dict, 
                            interview_type: InterviewType, feedback_data: Dict):
         """Save feedback to database and mark attempt as graded"""
@@ -154,13 +183,17 @@ class InterviewGradingService:
     
     def _format_transcript(self, transcript: List[Dict]) -> str:
         """Format transcript for AI analysis"""
+        return "\n".join(self._format_turns(transcript))
+    
+    def _format_turns(self, transcript: List[Dict]) -> List[str]:
+        """Format each transcript turn that has text as a SPEAKER: text line"""
         formatted = []
         print(f"[GRADING] Transcript: {transcript}")
         print(f"[GRADING] Transcript length: {len(transcript) if transcript else 0}")
         
         if not transcript:
             print("[GRADING] No transcript data provided")
-            return ""
+            return []
         
         for i, turn in enumerate(transcript):
             print(f"[GRADING] Processing turn {i}: {turn}")
@@ -180,17 +213,64 @@ class InterviewGradingService:
             else:
                 print(f"[GRADING] Skipping turn {i} - no text content")
         
-        result = "\n".join(formatted)
-        print(f"[GRADING] Final formatted transcript length: {len(result)} characters")
-        print(f"[GRADING] Final formatted transcript preview: {result[:200]}...")
+        print(f"[GRADING] Final formatted transcript: {len(formatted)} turns, {sum(len(turn) for turn in formatted)} characters")
+        
+        return formatted
+    
+    async def _grade_prompt(self, grading_prompt: str) -> Dict:
+        """Send one grading prompt to OpenAI and return the parsed feedback JSON"""
+        response = await post_chat_completion(
+            {
+                "model": "gpt-4o-mini",  # More cost-effective model
+                "messages": [{"role": "user", "content": grading_prompt}],
+                "response_format": {"type": "json_object"},
+                "temperature": 0.3
+            },
+            timeout=60.0
+        )
+        print(f"[GRADING] Response: {response}")
+
+        response.raise_for_status()
+        result = response.json()
+        print(f"[GRADING] Result: {result}")
+        record_prompt_cache_usage(result.get('usage') or {})
         
-        return result
+        # Parse the AI response
+        return json.loads(result['choices'][0]['message']['content'])
+    
+    async def _grade_in_segments(self, req: Request, interview: Dict, turns: List[str], interview_type: InterviewType) -> Dict:
+        """
+        Map-reduce grading for long transcripts: grade overlapping segments
+        concurrently (at most GRADING_MAX_PARALLEL_SEGMENTS at a time), then
+        merge them with merge_segment_feedback
+        """
+        segments = split_transcript(turns, GRADING_SEGMENT_TOKENS, GRADING_SEGMENT_OVERLAP_TURNS)
+        print(f"[GRADING] Long transcript ({len(turns)} turns), grading {len(segments)} segments")
+        semaphore = asyncio.Semaphore(GRADING_MAX_PARALLEL_SEGMENTS)
+        
+        async def grade_segment(index: int, segment: str) -> Dict:
+            note = (
+                f"[Part {index + 1} of {len(segments)} of a longer interview. The other parts are graded "
+                f"separately: grade only the evidence in this part and do not treat its start or end "
+                f"as the interview starting or ending early.]\n"
+            )
+            prompt = await self._build_grading_prompt(req, interview, note + segment, interview_type)
+            async with semaphore:
+                return await self._grade_prompt(prompt)
+        
+        segment_feedback = await asyncio.gather(*[
+            grade_segment(index, segment) for index, segment in enumerate(segments)
+        ])
+        return merge_segment_feedback(
+            segment_feedback,
+            [_estimate_tokens(segment) for segment in segments],
+            get_grading_prompt(interview_type).rubric_keys
+        )
     
     async def _build_grading_prompt(self, req: Request, interview: Dict, transcript: str, interview_type: InterviewType) -> str:
-        """Build the grading prompt using interview type configuration"""
-        config = get_interview_config(interview_type)
+        """Build the grading prompt from the compiled prompt of the interview type"""
+        compiled_prompt = get_grading_prompt(interview_type)
 
-        print(f"[GRADING] Config: {config}")
         print(f"[GRADING] Interview: {interview}")
         print(f"[GRADING] Transcript: {transcript}")
         print(f"[GRADING] Interview type: {interview_type}")
@@ -233,9 +313,8 @@ class InterviewGradingService:
             print(f"[GRADING] Company values: {company_values}")
 
         
-        # Use the configured prompt template
-        
-        prompt = config.prompt_template.format(
+        # Static prefix of the interview type first, then this attempt's details
+        prompt = compiled_prompt.build(
             role=role,
             company=company,
             difficulty=difficulty,
@@ -249,35 +328,15 @@ class InterviewGradingService:
     
     def _validate_feedback_data(self, data: Dict, interview_type: InterviewType) -> Dict:
         """Ensure feedback data has all required fields with valid values"""
-        # Get the expected rubric structure from config
-        config = get_interview_config(interview_type)
-        expected_rubric_keys = [criteria.key for criteria in config.rubric_criteria]
-        
-        # Create defaults based on interview type config
-        default_rubric_scores = {}
-        for key in expected_rubric_keys:
-            default_rubric_scores[key] = 75
-        
-        defaults = {
-            "overall_score": 75,
-            "strengths": [
-                f"Demonstrated understanding of {config.display_name} expectations",
-                "Maintained professional communication",
-                "Showed engagement throughout the interview"
-            ],
-            "improvement_areas": [
-                f"Could provide more specific examples relevant to {config.display_name}",
-                f"Opportunity to deepen skills in {config.improvement_focus[0]}",
-                f"Consider preparing more for {config.improvement_focus[1]}"
-            ],
-            "detailed_feedback": f"The candidate completed the {config.display_name}. {config.description}. With focused preparation on the key areas evaluated, they can strengthen their performance in future interviews.",
-            "rubric_scores": default_rubric_scores
-        }
+        # Rubric keys and defaults precompiled for the interview type
+        compiled_prompt = get_grading_prompt(interview_type)
+        expected_rubric_keys = compiled_prompt.rubric_keys
+        defaults = compiled_prompt.default_feedback
         
-        # Merge with defaults for any missing fields
+        # Merge with defaults for any missing fields (copies, the compiled defaults are read-only)
         for key, default_value in defaults.items():
             if key not in data or not data[key]:
-                data[key] = default_value
+                data[key] = _copy_default(default_value)
         
         # Validate score ranges
         if not isinstance(data["overall_score"], (int, float)) or data["overall_score"] < 0 or data["overall_score"] > 100:
@@ -299,10 +358,10 @@ class InterviewGradingService:
         
         # Ensure arrays have content
         if not isinstance(data["strengths"], list) or len(data["strengths"]) == 0:
-            data["strengths"] = defaults["strengths"]
+            data["strengths"] = list(defaults["strengths"])
         
         if not isinstance(data["improvement_areas"], list) or len(data["improvement_areas"]) == 0:
-            data["improvement_areas"] = defaults["improvement_areas"]
+            data["improvement_areas"] = list(defaults["improvement_areas"])
         
         return data
     
@@ -374,6 +433,87 @@ class InterviewGradingService:
         return interview.model_dump()
     
 
+def _estimate_tokens(text: str) -> int:
+    """Rough token count of English text, about 4 characters per token"""
+    return len(text) // 4 + 1
+
+
+def split_transcript(turns: List[str], max_tokens: int, overlap_turns: int) -> List[str]:
+    """
+    Split formatted transcript turns into segments of at most max_tokens
+    (estimated; a single longer turn gets a segment of its own). Each segment
+    after the first starts with the last overlap_turns turns of the one
+    before, so an answer is graded together with its question.
+    """
+    segments = []
+    start = 0
+    while start < len(turns):
+        end = start
+        tokens = 0
+        while end < len(turns) and (end == start or tokens + _estimate_tokens(turns[end]) <= max_tokens):
+            tokens += _estimate_tokens(turns[end])
+            end += 1
+        segments.append("\n".join(turns[start:end]))
+        if end == len(turns):
+            break
+        # Always move forward by at least one turn
+        start = max(end - overlap_turns, start + 1)
+    return segments
+
+
+def merge_segment_feedback(segment_feedback: List[Dict], weights: List[int], rubric_keys: Tuple[str, ...]) -> Dict:
+    """
+    Reduce the feedback of the transcript segments into one feedback dict.
+    Scores are the means of the valid segment scores weighted by segment
+    length, strengths and improvement areas are taken from the segments in
+    turn without duplicates, and the detailed feedback is kept in order.
+    The result only depends on the segment order, not on which segment
+    finished grading first.
+    """
+    def weighted_mean(scores: List[Tuple[object, int]]):
+        valid = [(score, weight) for score, weight in scores
+                 if isinstance(score, (int, float)) and not isinstance(score, bool) and 0 <= score <= 100]
+        if not valid:
+            return None
+        return round(sum(score * weight for score, weight in valid) / sum(weight for _, weight in valid))
+
+    def interleave(key: str) -> List[str]:
+        lists = [feedback.get(key) if isinstance(feedback.get(key), list) else [] for feedback in segment_feedback]
+        merged, seen = [], set()
+        for index in range(max((len(items) for items in lists), default=0)):
+            for items in lists:
+                if index < len(items) and isinstance(items[index], str) and items[index].strip().lower() not in seen:
+                    seen.add(items[index].strip().lower())
+                    merged.append(items[index])
+        return merged[:MERGED_FEEDBACK_ITEMS]
+
+    merged = {"rubric_scores": {}}
+    overall_score = weighted_mean([(feedback.get("overall_score"), weight)
+                                   for feedback, weight in zip(segment_feedback, weights)])
+    if overall_score is not None:
+        merged["overall_score"] = overall_score
+    for key in rubric_keys:
+        score = weighted_mean([((feedback.get("rubric_scores") or {}).get(key), weight)
+                               for feedback, weight in zip(segment_feedback, weights)])
+        if score is not None:
+            merged["rubric_scores"][key] = score
+    merged["strengths"] = interleave("strengths")
+    merged["improvement_areas"] = interleave("improvement_areas")
+    merged["detailed_feedback"] = "\n\n".join(
+        feedback["detailed_feedback"].strip() for feedback in segment_feedback
+        if isinstance(feedback.get("detailed_feedback"), str) and feedback["detailed_feedback"].strip()
+    )
+    return merged
+
+
+def _copy_default(value):
+    if isinstance(value, tuple):
+        return list(value)
+    if hasattr(value, 'items'):
+        return dict(value)
+    return value
+
+
 # Global service instance
 grading_service = InterviewGradingService()
 
@@ -0,0 +1,198 @@
+import importlib.util
+import json
+from dataclasses import dataclass, field
+from http.cookiejar import CookieJar
+from typing import Any, AsyncIterator, Dict, Optional
+from decouple import config
+import httpx
+
+from utils.concurrency.single_flight import SingleFlight, hash_payload
+from utils.streaming.partial_json import PartialJsonObject
+from utils.streaming.sse import FieldCallback
+
+OPENAI_API_KEY = config('OPENAI_API_KEY', default='', cast=str)
+# Overridable so the services can run against a local mock of the API
+OPENAI_BASE_URL = config('OPENAI_BASE_URL', default='https://api.openai.com/v1', cast=str)
+ELEVENLABS_API_KEY = config('ELEVENLABS_API_KEY', default='', cast=str)
+ELEVENLABS_BASE_URL = config('ELEVENLABS_BASE_URL', default='https://api.elevenlabs.io/v1', cast=str)
+BRANDFETCH_BASE_URL = config('BRANDFETCH_BASE_URL', default='https://api.brandfetch.io/v2', cast=str)
+
+# HTTP/2 needs the optional h2 package, fall back to HTTP/1.1 keep-alive without it
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate',
+}
+
+
+@dataclass
+class HttpClientConfig:
+    base_url: str = ''
+    headers: Dict[str, str] = field(default_factory=dict)
+    # Connect fails fast, read is the slowest expected response for the host
+    timeout: httpx.Timeout = field(default_factory=lambda: httpx.Timeout(30.0, connect=5.0))
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    follow_redirects: bool = False
+    # Keep cookies the upstream sets, off for clients shared between users
+    store_cookies: bool = True
+
+
+class NoCookieJar(CookieJar):
+    """Cookie jar that never stores a cookie, so none is ever sent"""
+
+    def set_cookie(self, cookie):
+        pass
+
+    def extract_cookies(self, response, request):
+        pass
+
+
+# One pooled client per upstream host (the web client serves arbitrary hosts)
+HttpClientConfigs: Dict[str, HttpClientConfig] = {
+    'openai': HttpClientConfig(
+        base_url=OPENAI_BASE_URL,
+        headers={
+            "Authorization": f"Bearer {OPENAI_API_KEY}",
+            "Content-Type": "application/json"
+        },
+        # Vision and long extraction calls, callers pass a shorter timeout where it fits
+        timeout=httpx.Timeout(120.0, connect=5.0),
+        max_connections=50,
+        max_keepalive_connections=20,
+    ),
+    'elevenlabs': HttpClientConfig(
+        base_url=ELEVENLABS_BASE_URL,
+        headers={"xi-api-key": ELEVENLABS_API_KEY},
+        timeout=httpx.Timeout(30.0, connect=5.0),
+    ),
+    'brandfetch': HttpClientConfig(
+        base_url=BRANDFETCH_BASE_URL,
+        timeout=httpx.Timeout(30.0, connect=5.0),
+    ),
+    'web': HttpClientConfig(
+        headers=BROWSER_HEADERS,
+        timeout=httpx.Timeout(30.0, connect=10.0),
+        max_connections=50,
+        max_keepalive_connections=10,
+        follow_redirects=True,
+        # Scrapes for different users share the client, a site's cookies must not leak between them
+        store_cookies=False,
+    ),
+}
+
+
+class HttpClientRegistry:
+    """
+    Shared httpx clients, one per upstream, reused for the app lifetime so
+    requests get pooled keep-alive connections instead of a new TLS
+    handshake each time. Opened and closed in the main.py lifespan; a
+    client requested outside the lifespan (scripts, tests) is created lazily.
+    """
+
+    def __init__(self, configs: Dict[str, HttpClientConfig] = HttpClientConfigs):
+        self.configs = configs
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def open(self) -> None:
+        """Create every configured client"""
+        for name in self.configs:
+            self.get(name)
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """Get the shared client for an upstream"""
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._build(self.configs[name])
+            self._clients[name] = client
+        return client
+
+    async def close(self) -> None:
+        """Close every client and its pooled connections"""
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients = {}
+
+    @staticmethod
+    def _build(client_config: HttpClientConfig) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=client_config.base_url,
+            headers=client_config.headers,
+            timeout=client_config.timeout,
+            limits=httpx.Limits(
+                max_connections=client_config.max_connections,
+                max_keepalive_connections=client_config.max_keepalive_connections,
+                keepalive_expiry=client_config.keepalive_expiry
+            ),
+            http2=HTTP2_AVAILABLE,
+            follow_redirects=client_config.follow_redirects,
+            cookies=None if client_config.store_cookies else NoCookieJar()
+        )
+
+
+# Global registry, opened in the app lifespan
+http_clients = HttpClientRegistry()
+
+# Identical concurrent OpenAI requests share one call
+openai_single_flight = SingleFlight()
+
+
+async def post_chat_completion(payload: Dict[str, Any], **kwargs) -> httpx.Response:
+    """
+    POST /chat/completions on the shared openai client. Concurrent calls
+    with an identical payload share one request and get the same response.
+    """
+    return await openai_single_flight.do(
+        hash_payload(payload),
+        lambda: http_clients.get('openai').post("/chat/completions", json=payload, **kwargs)
+    )
+
+
+async def stream_chat_completion(payload: Dict[str, Any], **kwargs) -> AsyncIterator[str]:
+    """POST /chat/completions with stream=True and yield the content deltas of the SSE chunks"""
+    async with http_clients.get('openai').stream(
+        "POST", "/chat/completions", json={**payload, "stream": True}, **kwargs
+    ) as response:
+        if response.status_code != 200:
+            await response.aread()
+            raise Exception(f"OpenAI API error: {response.status_code} - {response.text}")
+
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                break
+            for choice in json.loads(data).get("choices", []):
+                delta = choice.get("delta", {}).get("content")
+                if delta:
+                    yield delta
+
+
+async def chat_completion_content(
+    payload: Dict[str, Any],
+    on_field: Optional[FieldCallback] = None,
+    **kwargs
+) -> str:
+    """
+    Message content of a chat completion. With on_field the completion is
+    streamed and each top-level field of the JSON object being generated
+    is passed to on_field as soon as it is complete.
+    """
+    if on_field is None:
+        response = await post_chat_completion(payload, **kwargs)
+        if response.status_code != 200:
+            raise Exception(f"OpenAI API error: {response.status_code} - {response.text}")
+        return response.json()['choices'][0]['message']['content']
+
+    parser = PartialJsonObject()
+    content = ""
+    async for delta in stream_chat_completion(payload, **kwargs):
+        content += delta
+        for name, value in parser.feed(delta):
+            await on_field(name, value)
+    return content
@@ -18,7 +18,8 @@ class InterviewStageService:
         
         Args:
             job_data: Dictionary containing job details
-            job_processor: Optional JobProcessingService instance for AI detection
+            job_processor: Optional JobProcessingService instance for AI detection,
+                not called when job_data already has the extracted interview_process
             raw_job_content: Raw job posting content for AI analysis
             
         Returns:
@@ -39,10 +40,16 @@ class InterviewStageService:
         ai_confidence = 0.0
         
         # Try AI detection first if we have the required components
-        if job_processor and raw_job_content and raw_job_content.strip():
+        extracted_process = job_data.get("interview_process")
+        if extracted_process or (job_processor and raw_job_content and raw_job_content.strip()):
             print("Attempting AI-based interview stage detection")
             try:
-                ai_result = await job_processor.extract_interview_process(raw_job_content)
+                if extracted_process:
+                    # Returned with the job extraction, no separate call needed
+                    print("Using interview process returned with the job extraction")
+                    ai_result = extracted_process
+                else:
+                    ai_result = await job_processor.extract_interview_process(raw_job_content)
                 metadata["ai_detection_data"] = ai_result
                 
                 if ai_result.get("confidence_score", 0.0) >= 0.6 and ai_result.get("detected_stages"):
@@ -1,27 +1,21 @@
 import json
-import base64
-import io
 import asyncio
+import time
 from typing import Dict, List, Optional, Any
 from decouple import config
 import httpx
 from fastapi import HTTPException
-import PyPDF2
-try:
-    from docx import Document
-except ImportError:
-    try:
-        from python_docx import Document
-    except ImportError:
-        Document = None
 from PIL import Image
-try:
-    import fitz  # PyMuPDF for better PDF handling
-except ImportError:
-    fitz = None
 import logging
 from urllib.parse import urlparse
 
+from services.http_clients import http_clients, post_chat_completion, chat_completion_content
+from utils.streaming.sse import FieldCallback
+from services.document_extraction import (
+    document_extraction, extract_document, extract_docx_content, log_parsing_outcome,
+    ExtractedDocument, TEXT_ONLY_ROUTE
+)
+
 logger = logging.getLogger(__name__)
 
 # Environment variables
@@ -29,23 +23,32 @@ OPENAI_API_KEY = config('OPENAI_API_KEY', default='', cast=str)
 OPENAI_WEB_SEARCH_ENABLED = config('OPENAI_WEB_SEARCH_ENABLED', default=True, cast=bool)
 FALLBACK_CONFIDENCE_THRESHOLD = config('FALLBACK_CONFIDENCE_THRESHOLD', default=0.7, cast=float)
 
+# The extraction prompts also ask for the cleaned title and the interview process,
+# so neither needs a call of its own unless the response falls short (see _validate_job_data)
+JOB_TITLE_INSTRUCTION = (
+    'role_title is the core role only, without company prefix, salary, location or promotional text '
+    '(e.g. "Junior Python Developer – Elite Hedge Fund (up to £100K + Bonus + Hybrid)" -> "Junior Python Developer")'
+)
+INTERVIEW_PROCESS_INSTRUCTION = (
+    'interview_process lists the interview stages or hiring steps the posting states (explicit) or clearly '
+    'implies (inferred), e.g. "phone screen, technical interview, and final round"; use an empty '
+    'detected_stages list and detection_method "none" if the posting does not describe its process'
+)
+
 class JobProcessingService:
     def __init__(self):
         if not OPENAI_API_KEY:
             raise ValueError("OPENAI_API_KEY environment variable is required")
-        
-        self.client = httpx.AsyncClient(
-            base_url="https://api.openai.com/v1",
-            headers={
-                "Authorization": f"Bearer {OPENAI_API_KEY}",
-                "Content-Type": "application/json"
-            },
-            timeout=120.0
-        )
-    
-    async def process_job_url(self, url: str) -> Dict[str, Any]:
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared openai client, see services/http_clients.py"""
+        return http_clients.get('openai')
+
+    async def process_job_url(self, url: str, page: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
-        Process job posting from URL using OpenAI to extract structured data
+        Process job posting from URL using OpenAI to extract structured data.
+        A page already fetched with scrape_job_page can be passed to skip scraping.
         """
         print(f"Starting job URL processing: {url}")
         
@@ -63,7 +66,7 @@ class JobProcessingService:
         try:
             print("Calling OpenAI to fetch and process job posting content")
             # Use OpenAI to fetch and process the job posting
-            job_data = await self._process_job_url_with_openai(url)
+            job_data = await self._process_job_url_with_openai(url, page)
             print(f"OpenAI processing completed. Extracted company: {job_data.get('company', 'N/A')}")
             
             # Validate the response
@@ -82,9 +85,17 @@ class JobProcessingService:
                 detail="Failed to process job posting. Please try uploading the job description as a file instead."
             )
     
-    async def process_job_file(self, file_content: bytes, content_type: str, filename: str) -> Dict[str, Any]:
+    async def process_job_file(
+        self,
+        file_content: bytes,
+        content_type: str,
+        filename: str,
+        on_field: Optional[FieldCallback] = None
+    ) -> Dict[str, Any]:
         """
-        Process job description file using OpenAI vision/text capabilities
+        Process job description file using OpenAI vision/text capabilities.
+        With on_field the completion is streamed and each top-level field
+        (company and role_title first) is passed to it as soon as it arrives.
         """
         print(f"Starting job file processing: {filename} ({content_type}, {len(file_content)} bytes)")
         
@@ -107,17 +118,21 @@ class JobProcessingService:
             print(f"Extracting content from {content_type} file")
             if content_type == 'application/pdf':
                 print("Processing PDF file")
-                text_content, images = await self._extract_pdf_content(file_content)
+                # First 5 pages, page 1 rendered if the PDF is routed to vision
+                document = await document_extraction.run(extract_document, file_content, content_type, 5, 1)
+                text_content, images = document.text, document.images
                 print(f"PDF extraction complete: {len(text_content)} chars text, {len(images)} images")
             elif content_type in ['application/msword', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document']:
                 print("Processing Word document")
                 text_content = await self._extract_docx_content(file_content)
                 images = []
+                document = ExtractedDocument(content_type, text_content, parsing_route=TEXT_ONLY_ROUTE)
                 print(f"Word extraction complete: {len(text_content)} chars text")
             elif content_type == 'text/plain':
                 print("Processing plain text file")
                 text_content = file_content.decode('utf-8')
                 images = []
+                document = ExtractedDocument(content_type, text_content, parsing_route=TEXT_ONLY_ROUTE)
                 print(f"Text extraction complete: {len(text_content)} chars")
             else:
                 print(f"Unsupported file type: {content_type}")
@@ -136,18 +151,24 @@ class JobProcessingService:
                 )
             
             # Process with OpenAI
-            if images and len(images) > 0:
-                print(f"Processing with OpenAI Vision API (text + {len(images)} images)")
-                job_data = await self._process_job_with_vision(text_content, images)
-            else:
-                print("Processing with OpenAI text-only API")
-                job_data = await self._process_job_with_text(text_content)
-            
-            print(f"OpenAI processing completed. Extracted company: {job_data.get('company', 'N/A')}")
-            
-            # Validate the response
-            print("Validating extracted job data")
-            await self._validate_job_data(job_data)
+            started = time.perf_counter()
+            try:
+                if images and len(images) > 0:
+                    print(f"Processing with OpenAI Vision API (text + {len(images)} images)")
+                    job_data = await self._process_job_with_vision(text_content, images, on_field)
+                else:
+                    print("Processing with OpenAI text-only API")
+                    job_data = await self._process_job_with_text(text_content, on_field)
+                
+                print(f"OpenAI processing completed. Extracted company: {job_data.get('company', 'N/A')}")
+                
+                # Validate the response
+                print("Validating extracted job data")
+                await self._validate_job_data(job_data)
+            except Exception as e:
+                log_parsing_outcome("job", filename, document, type(e).__name__, started)
+                raise
+            log_parsing_outcome("job", filename, document, "ok", started, job_data)
             print(f"Job file processing completed successfully for: {job_data.get('company', 'N/A')} - {job_data.get('role_title', 'N/A')}")
             
             return job_data
@@ -161,13 +182,13 @@ class JobProcessingService:
                 detail="Failed to process job description file."
             )
     
-    async def _process_job_url_with_openai(self, url: str) -> Dict[str, Any]:
+    async def _process_job_url_with_openai(self, url: str, page: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Fetch URL content and use OpenAI to extract job data"""
         
         # First, scrape the website content
         print(f"Scraping website content from: {url}")
         try:
-            web_content = await self._scrape_url_content(url)
+            web_content = page["content"] if page else await self._scrape_url_content(url)
             print(f"Successfully scraped {len(web_content)} characters from URL")
         except Exception as e:
             print(f"Failed to scrape URL {url}: {str(e)}")
@@ -226,6 +247,17 @@ Return ONLY a JSON object with this exact structure:
     "source": "linkedin/indeed/company_website/other",
     "confidence_score": 0.0-1.0,
     "extraction_notes": "Any issues or notes about extraction"
+  }},
+  "interview_process": {{
+    "detected_stages": ["Interview stages or hiring steps the posting mentions, using its own names"],
+    "confidence_score": 0.0-1.0,
+    "raw_text": "Exact text from the posting describing the interview process",
+    "detection_method": "explicit/inferred/none",
+    "process_details": {{
+      "total_rounds": 0,
+      "estimated_duration": "Timeline if mentioned (e.g. 2-3 weeks)",
+      "special_requirements": ["Any special prep mentioned (e.g. bring portfolio)"]
+    }}
   }}
 }}
 
@@ -234,14 +266,15 @@ Instructions:
 2. Categorize experience level based on years required and seniority keywords
 3. Extract ALL technical skills and tools mentioned
 4. Use empty strings for missing information
-5. Return ONLY the JSON object
+5. {JOB_TITLE_INSTRUCTION}
+6. {INTERVIEW_PROCESS_INSTRUCTION}
+7. Return ONLY the JSON object
 """
         
         messages = [{"role": "user", "content": prompt}]
         
-        response = await self.client.post(
-            "/chat/completions",
-            json={
+        response = await post_chat_completion(
+            {
                 "model": "gpt-4o-mini",  # More cost-effective for text processing
                 "messages": messages,
                 "response_format": {"type": "json_object"},
@@ -339,9 +372,8 @@ Instructions:
 """
         
         try:
-            response = await self.client.post(
-                "/chat/completions",
-                json={
+            response = await post_chat_completion(
+                {
                     "model": "gpt-4o-mini",  # Use cheaper model for this fallback
                     "messages": [
                         {
@@ -386,40 +418,53 @@ Instructions:
     
     async def _scrape_url_content(self, url: str) -> str:
         """Scrape content from URL using HTTP requests"""
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-        }
-        
+        page = await self.scrape_job_page(url)
+        return page["content"]
+
+    async def scrape_job_page(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Scrape the text of a job posting page along with its ETag and
+        Last-Modified validators. When validators from an earlier fetch are
+        passed the request is conditional, and None means the page is unchanged.
+        """
+        conditional_headers = {}
+        if etag:
+            conditional_headers['If-None-Match'] = etag
+        if last_modified:
+            conditional_headers['If-Modified-Since'] = last_modified
+
         try:
-            # Create a separate HTTP client for web scraping
-            async with httpx.AsyncClient(
-                timeout=30.0,
-                headers=headers,
-                follow_redirects=True
-            ) as scraping_client:
-                response = await scraping_client.get(url)
-                response.raise_for_status()
-                
-                # Parse HTML content
-                from bs4 import BeautifulSoup
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Remove unwanted elements
-                for element in soup(["script", "style", "nav", "header", "footer", "aside"]):
-                    element.decompose()
-                
-                # Extract text content
-                text_content = soup.get_text()
-                
-                # Clean up whitespace
-                lines = [line.strip() for line in text_content.splitlines() if line.strip()]
-                cleaned_content = '\n'.join(lines)
-                
-                return cleaned_content
+            # Shared browser-like client, pooled across scrapes
+            response = await http_clients.get('web').get(url, headers=conditional_headers)
+            if response.status_code == 304 and conditional_headers:
+                return None
+            response.raise_for_status()
+            
+            # Parse HTML content
+            from bs4 import BeautifulSoup
+            soup = BeautifulSoup(response.text, 'html.parser')
+            
+            # Remove unwanted elements
+            for element in soup(["script", "style", "nav", "header", "footer", "aside"]):
+                element.decompose()
+            
+            # Extract text content
+            text_content = soup.get_text()
+            
+            # Clean up whitespace
+            lines = [line.strip() for line in text_content.splitlines() if line.strip()]
+            cleaned_content = '\n'.join(lines)
+            
+            return {
+                "content": cleaned_content,
+                "etag": response.headers.get('etag'),
+                "last_modified": response.headers.get('last-modified')
+            }
                 
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 403:
@@ -433,64 +478,11 @@ Instructions:
         except Exception as e:
             raise Exception(f"Failed to scrape URL content: {str(e)}")
     
-    async def _extract_pdf_content(self, content: bytes) -> tuple[str, List[str]]:
-        """Extract both text and images from PDF"""
-        try:
-            # Try PyMuPDF first
-            if fitz:
-                doc = fitz.open(stream=content, filetype="pdf")
-                text_content = ""
-                images = []
-                
-                for page_num in range(min(len(doc), 5)):  # Limit to first 5 pages
-                    page = doc.load_page(page_num)
-                    text_content += page.get_text() + "\n"
-                    
-                    # Convert first page to image for vision processing
-                    if page_num == 0:
-                        pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))
-                        img_data = pix.tobytes("png")
-                        img_base64 = base64.b64encode(img_data).decode('utf-8')
-                        images.append(img_base64)
-                
-                doc.close()
-                return text_content.strip(), images
-            else:
-                # Fallback to PyPDF2
-                pdf_reader = PyPDF2.PdfReader(io.BytesIO(content))
-                text_content = ""
-                for i, page in enumerate(pdf_reader.pages[:5]):  # Limit to first 5 pages
-                    text_content += page.extract_text() + "\n"
-                return text_content.strip(), []
-                
-        except Exception as e:
-            raise Exception(f"Failed to extract PDF content: {str(e)}")
-    
     async def _extract_docx_content(self, content: bytes) -> str:
-        """Extract text from DOCX file"""
-        if Document is None:
-            raise Exception("DOCX processing not available. Please install python-docx.")
-        
-        try:
-            doc = Document(io.BytesIO(content))
-            text_content = ""
-            
-            # Extract paragraphs
-            for paragraph in doc.paragraphs[:100]:  # Limit paragraphs
-                text_content += paragraph.text + "\n"
-            
-            # Extract tables
-            for table in doc.tables[:5]:  # Limit tables
-                for row in table.rows:
-                    for cell in row.cells:
-                        text_content += cell.text + "\t"
-                    text_content += "\n"
-            
-            return text_content.strip()
-        except Exception as e:
-            raise Exception(f"Failed to extract DOCX content: {str(e)}")
+        """Extract text from DOCX file (first 100 paragraphs, 5 tables), in the extraction pool"""
+        return await document_extraction.run(extract_docx_content, content, 100, 5)
     
-    async def _process_job_with_vision(self, text_content: str, images: List[str]) -> Dict[str, Any]:
+    async def _process_job_with_vision(self, text_content: str, images: List[str], on_field: Optional[FieldCallback] = None) -> Dict[str, Any]:
         """Process job description using OpenAI Vision API"""
         
         messages = [{
@@ -508,7 +500,7 @@ Instructions:
             messages[0]["content"].append({
                 "type": "image_url",
                 "image_url": {
-                    "url": f"data:image/png;base64,{images[0]}",
+                    "url": images[0],
                     "detail": "high"
                 }
             })
@@ -520,23 +512,17 @@ Instructions:
                 "text": f"\n\nExtracted text content:\n{text_content[:8000]}"  # Limit text
             })
         
-        response = await self.client.post(
-            "/chat/completions",
-            json={
+        content = await chat_completion_content(
+            {
                 "model": "gpt-4o",
                 "messages": messages,
                 "response_format": {"type": "json_object"},
                 "temperature": 0.1,
                 "max_tokens": 4000
-            }
+            },
+            on_field
         )
         
-        if response.status_code != 200:
-            raise Exception(f"OpenAI API error: {response.status_code} - {response.text}")
-        
-        result = response.json()
-        content = result['choices'][0]['message']['content']
-        
         try:
             job_data = json.loads(content)
             # Add extraction metadata for vision processing
@@ -546,7 +532,7 @@ Instructions:
         except json.JSONDecodeError as e:
             raise Exception(f"Failed to parse OpenAI response as JSON: {str(e)}")
     
-    async def _process_job_with_text(self, text_content: str) -> Dict[str, Any]:
+    async def _process_job_with_text(self, text_content: str, on_field: Optional[FieldCallback] = None) -> Dict[str, Any]:
         """Process job description using text-only OpenAI processing"""
         
         messages = [{
@@ -554,23 +540,17 @@ Instructions:
             "content": f"{self._get_job_parsing_prompt()}\n\nJob Description Content:\n{text_content[:8000]}"
         }]
         
-        response = await self.client.post(
-            "/chat/completions",
-            json={
+        content = await chat_completion_content(
+            {
                 "model": "gpt-4o-mini",
                 "messages": messages,
                 "response_format": {"type": "json_object"},
                 "temperature": 0.1,
                 "max_tokens": 4000
-            }
+            },
+            on_field
         )
         
-        if response.status_code != 200:
-            raise Exception(f"OpenAI API error: {response.status_code} - {response.text}")
-        
-        result = response.json()
-        content = result['choices'][0]['message']['content']
-        
         try:
             job_data = json.loads(content)
             # Add extraction metadata for text processing
@@ -610,6 +590,17 @@ Extract structured information from this job posting. Return ONLY valid JSON:
     "source": "linkedin/indeed/company_website/other",
     "confidence_score": 0.0-1.0,
     "extraction_notes": "Any parsing issues or important notes"
+  },
+  "interview_process": {
+    "detected_stages": ["Interview stages or hiring steps the posting mentions, using its own names"],
+    "confidence_score": 0.0-1.0,
+    "raw_text": "Exact text from the posting describing the interview process",
+    "detection_method": "explicit/inferred/none",
+    "process_details": {
+      "total_rounds": 0,
+      "estimated_duration": "Timeline if mentioned (e.g. 2-3 weeks)",
+      "special_requirements": ["Any special prep mentioned (e.g. bring portfolio)"]
+    }
   }
 }
 
@@ -624,7 +615,9 @@ Instructions:
 4. Categorize requirements vs nice-to-haves based on keywords (required, must, preferred, bonus)
 5. Set confidence score based on information completeness
 6. Use empty strings for missing information, not null
-7. Return ONLY the JSON object
+7. """ + JOB_TITLE_INSTRUCTION + """
+8. """ + INTERVIEW_PROCESS_INSTRUCTION + """
+9. Return ONLY the JSON object
 """
     
     async def _validate_job_data(self, job_data: Dict[str, Any]) -> None:
@@ -646,7 +639,13 @@ Instructions:
             if 'job_description' not in job_data:
                 job_data['job_description'] = {}
         
-        # Clean the job title using LLM
+        # Interview process returned with the extraction, dropped unless it matches the schema
+        # so stage detection makes its own extract_interview_process call instead
+        interview_process = self._validate_extracted_interview_process(job_data.pop('interview_process', None))
+        if interview_process:
+            job_data['interview_process'] = interview_process
+        
+        # Clean the job title using LLM (no call when the extraction already returned a clean title)
         if job_data.get('role_title'):
             try:
                 cleaned_title = await self._clean_job_name(
@@ -733,9 +732,8 @@ Return only the cleaned job title. Examples:
 
 Cleaned title:"""
 
-            response = await self.client.post(
-                "/chat/completions",
-                json={
+            response = await post_chat_completion(
+                {
                     "model": "gpt-4o-mini",
                     "messages": [{"role": "user", "content": prompt}],
                     "temperature": 0.1,
@@ -810,11 +808,12 @@ Cleaned title:"""
                 logo_url = f"https://logo.clearbit.com/{domain}?size=200"
                 
                 # Test if the logo exists
-                async with httpx.AsyncClient(timeout=10.0) as client:
-                    response = await client.head(logo_url)
-                    if response.status_code == 200:
-                        print(f"Found Clearbit logo for {company_name}: {logo_url}")
-                        return logo_url
+                response = await http_clients.get('web').head(
+                    logo_url, timeout=10.0, follow_redirects=False
+                )
+                if response.status_code == 200:
+                    print(f"Found Clearbit logo for {company_name}: {logo_url}")
+                    return logo_url
                         
         except Exception as e:
             print(f"Clearbit logo fetch failed for {company_name}: {str(e)}")
@@ -888,9 +887,8 @@ Examples:
 
 Domain:"""
 
-            response = await self.client.post(
-                "/chat/completions",
-                json={
+            response = await post_chat_completion(
+                {
                     "model": "gpt-4o-mini",
                     "messages": [{"role": "user", "content": prompt}],
                     "temperature": 0.1,
@@ -960,7 +958,8 @@ Domain:"""
             - detected_stages: List of interview stage names found
             - confidence_score: How confident AI is in the detection (0.0-1.0)
             - raw_text: Raw text mentioning interview process
-            - detection_method: 'explicit' or 'inferred'
+            - detection_method: 'explicit', 'inferred', 'none', or 'failed' when
+              the OpenAI call or its response could not be used
         """
         print(f"Starting interview process extraction from job content ({len(job_content)} chars)")
         
@@ -1011,9 +1010,8 @@ Return ONLY the JSON object.
 """
 
             print("Calling OpenAI for interview process detection")
-            response = await self.client.post(
-                "/chat/completions",
-                json={
+            response = await post_chat_completion(
+                {
                     "model": "gpt-4o-mini",
                     "messages": [{"role": "user", "content": prompt}],
                     "response_format": {"type": "json_object"},
@@ -1042,7 +1040,7 @@ Return ONLY the JSON object.
                     "detected_stages": [],
                     "confidence_score": 0.0,
                     "raw_text": "",
-                    "detection_method": "none"
+                    "detection_method": "failed"
                 }
                 
         except Exception as e:
@@ -1051,9 +1049,29 @@ Return ONLY the JSON object.
                 "detected_stages": [],
                 "confidence_score": 0.0,
                 "raw_text": "",
-                "detection_method": "none"
+                "detection_method": "failed"
             }
     
+    def _validate_extracted_interview_process(self, data: Any) -> Optional[Dict[str, Any]]:
+        """
+        Validate the interview_process object returned with the job extraction
+        against the extract_interview_process schema, None if it does not match
+        """
+        if not isinstance(data, dict):
+            return None
+        stages = data.get("detected_stages")
+        confidence = data.get("confidence_score")
+        if (
+            not isinstance(stages, list)
+            or not all(isinstance(stage, str) for stage in stages)
+            or isinstance(confidence, bool)
+            or not isinstance(confidence, (int, float))
+            or data.get("detection_method") not in ("explicit", "inferred", "none")
+        ):
+            print(f"Ignoring interview process from job extraction, it does not match the schema: {str(data)[:200]}")
+            return None
+        return self._validate_interview_process_data(data)
+    
     def _validate_interview_process_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Validate and clean interview process extraction data"""
         
@@ -1100,5 +1118,5 @@ Return ONLY the JSON object.
         return validated_data
 
     async def close(self):
-        """Close the HTTP client"""
-        await self.client.aclose()
\ No newline at end of file
+        """The HTTP client is shared and closed with the app, nothing to release"""
+        pass
\ No newline at end of file
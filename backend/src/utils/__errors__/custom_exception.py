@@ -48,3 +48,10 @@ class LLMJsonResponseCustomException(CustomException):
         **kwargs
     ):
         super().__init__(**kwargs)
+
+class InvalidCursorCustomException(CustomException):
+    def __init__(
+        self,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
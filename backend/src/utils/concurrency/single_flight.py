@@ -0,0 +1,49 @@
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+T = TypeVar('T')
+
+
+def hash_payload(payload: Any) -> str:
+    """Stable key for a JSON-like request payload (dict key order does not matter)"""
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first caller starts the
+    work, callers arriving while it runs await the same task and get the same
+    result (or exception). Nothing is kept once the call finishes, this is
+    deduplication of in-flight work, not a cache.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.metrics: Dict[str, int] = {"calls": 0, "coalesced": 0}
+
+    def is_in_flight(self, key: str) -> bool:
+        return key in self._in_flight
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run fn() for key, or join the call already running for it"""
+        task = self._in_flight.get(key)
+        if task:
+            self.metrics["coalesced"] += 1
+        else:
+            self.metrics["calls"] += 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+
+            def _release(finished_task: asyncio.Task):
+                if self._in_flight.get(key) is finished_task:
+                    del self._in_flight[key]
+                # Mark the exception as retrieved in case every caller was cancelled
+                if not finished_task.cancelled():
+                    finished_task.exception()
+            task.add_done_callback(_release)
+
+        # A cancelled caller must not cancel the call the others are waiting on
+        return await asyncio.shield(task)
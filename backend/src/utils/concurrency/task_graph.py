@@ -0,0 +1,105 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass
+class Stage:
+    """
+    One step of a pipeline. run gets the results of the stages it depends
+    on by name. If it fails or runs past timeout seconds, fallback is called
+    with the same results and provides the result instead; without a
+    fallback the whole graph fails.
+    """
+    name: str
+    run: Callable[[Dict[str, Any]], Awaitable[Any]]
+    depends_on: List[str] = field(default_factory=list)
+    timeout: Optional[float] = None
+    fallback: Optional[Callable[[Dict[str, Any]], Any]] = None
+
+
+@dataclass
+class StageTiming:
+    start_ms: float     # since the graph started
+    duration_ms: float
+    status: str         # ok, timeout, failed
+
+
+async def run_task_graph(stages: List[Stage]) -> Tuple[Dict[str, Any], Dict[str, StageTiming]]:
+    """
+    Run stages as soon as the stages they depend on have finished, so
+    independent stages run concurrently. Returns the result and timing
+    of every stage by name.
+    """
+    by_name = {stage.name: stage for stage in stages}
+    for stage in stages:
+        missing = [name for name in stage.depends_on if name not in by_name]
+        if missing:
+            raise ValueError(f"Stage {stage.name} depends on unknown stages: {missing}")
+
+    results: Dict[str, Any] = {}
+    timings: Dict[str, StageTiming] = {}
+    tasks: Dict[str, asyncio.Task] = {}
+    graph_start = time.perf_counter()
+
+    async def run_stage(stage: Stage) -> Any:
+        for name in stage.depends_on:
+            await tasks[name]
+        dependencies = {name: results[name] for name in stage.depends_on}
+
+        started = time.perf_counter()
+        status = "ok"
+        try:
+            result = await asyncio.wait_for(stage.run(dependencies), stage.timeout)
+        except Exception as e:
+            status = "timeout" if isinstance(e, asyncio.TimeoutError) else "failed"
+            if stage.fallback is None:
+                raise
+            print(f"Stage {stage.name} {status}, using fallback: {str(e) or type(e).__name__}")
+            result = stage.fallback(dependencies)
+        finally:
+            timings[stage.name] = StageTiming(
+                start_ms=round((started - graph_start) * 1000, 1),
+                duration_ms=round((time.perf_counter() - started) * 1000, 1),
+                status=status
+            )
+        results[stage.name] = result
+        return result
+
+    # Every task exists before any of them runs, so dependencies can be awaited by name
+    for stage in _topological_order(stages, by_name):
+        tasks[stage.name] = asyncio.ensure_future(run_stage(stage))
+
+    try:
+        await asyncio.gather(*tasks.values())
+    finally:
+        for task in tasks.values():
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                # Stages failing on a failed dependency re-raise its error, only one is reported
+                task.exception()
+    return results, timings
+
+
+def _topological_order(stages: List[Stage], by_name: Dict[str, Stage]) -> List[Stage]:
+    ordered: List[Stage] = []
+    visiting: set = set()
+    done: set = set()
+
+    def visit(stage: Stage):
+        if stage.name in done:
+            return
+        if stage.name in visiting:
+            raise ValueError(f"Dependency cycle through stage {stage.name}")
+        visiting.add(stage.name)
+        for name in stage.depends_on:
+            visit(by_name[name])
+        visiting.discard(stage.name)
+        done.add(stage.name)
+        ordered.append(stage)
+
+    for stage in stages:
+        visit(stage)
+    return ordered
@@ -0,0 +1,98 @@
+import json
+from typing import Any, List, Optional, Tuple
+
+
+class PartialJsonObject:
+    """
+    Incremental parser for a streamed JSON object. Feed it text chunks as
+    they arrive; each feed returns the top-level (key, value) pairs that
+    were completed by that chunk, so the first fields of a model response
+    can be used before the rest of it has been generated.
+
+    Only the top level is tracked. Nested objects and arrays are returned
+    whole once their closing bracket arrives, and scalars once the
+    following comma or closing brace does.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.done = False
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key: Optional[str] = None
+        self._key_start: Optional[int] = None
+        self._value_start: Optional[int] = None
+        self._expecting_value = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Add a chunk and return the top-level fields it completed"""
+        self.buffer += chunk
+        completed: List[Tuple[str, Any]] = []
+
+        while self._pos < len(self.buffer) and not self.done:
+            char = self.buffer[self._pos]
+            position = self._pos
+            self._pos += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._string_closed(position, completed)
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1:
+                    if self._expecting_value:
+                        self._value_start = position
+                    else:
+                        self._key_start = position
+            elif char in '{[':
+                if self._depth == 1 and self._expecting_value and self._value_start is None:
+                    self._value_start = position
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+                if self._depth == 1 and self._value_start is not None:
+                    self._complete(self.buffer[self._value_start:position + 1], completed)
+                elif self._depth == 0:
+                    self._complete_scalar(position, completed)
+                    self.done = True
+            elif self._depth == 1:
+                if char == ':':
+                    self._expecting_value = True
+                elif char == ',':
+                    self._complete_scalar(position, completed)
+                    self._expecting_value = False
+                elif not char.isspace() and self._expecting_value and self._value_start is None:
+                    # Number, true, false or null
+                    self._value_start = position
+
+        return completed
+
+    def _string_closed(self, position: int, completed: List[Tuple[str, Any]]) -> None:
+        if self._expecting_value:
+            self._complete(self.buffer[self._value_start:position + 1], completed)
+        else:
+            self._key = json.loads(self.buffer[self._key_start:position + 1])
+
+    def _complete_scalar(self, position: int, completed: List[Tuple[str, Any]]) -> None:
+        if self._expecting_value and self._value_start is not None:
+            self._complete(self.buffer[self._value_start:position].strip(), completed)
+
+    def _complete(self, raw_value: str, completed: List[Tuple[str, Any]]) -> None:
+        try:
+            completed.append((self._key, json.loads(raw_value)))
+        except json.JSONDecodeError:
+            # Left for the final json.loads of the whole response to report
+            pass
+        self._key = None
+        self._value_start = None
+        self._expecting_value = False
@@ -0,0 +1,81 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Protocol, runtime_checkable
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+
+FieldCallback = Callable[[str, Any], Awaitable[None]]
+
+
+@runtime_checkable
+class ResettableFieldCallback(Protocol):
+    """FieldCallback that can also be told to drop every field reported so far"""
+
+    async def __call__(self, name: str, value: Any) -> None: ...
+
+    async def reset(self) -> None: ...
+
+
+async def reset_fields(on_field: Optional[FieldCallback]) -> None:
+    """
+    Before a retry streams the fields again, so a failed attempt's fields
+    are not kept. Plain FieldCallbacks keep no fields and are left alone.
+    """
+    if isinstance(on_field, ResettableFieldCallback):
+        await on_field.reset()
+
+
+def format_sse(event: str, data: Any) -> str:
+    """One server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+
+class FieldEvents:
+    """ResettableFieldCallback queueing a `field` event per field and a `reset` event per reset"""
+
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    async def __call__(self, name: str, value: Any) -> None:
+        await self.queue.put(format_sse("field", {"field": name, "value": value}))
+
+    async def reset(self) -> None:
+        await self.queue.put(format_sse("reset", {}))
+
+
+def field_event_stream(work: Callable[[FieldCallback], Awaitable[Dict[str, Any]]]) -> StreamingResponse:
+    """
+    Run work(on_field) and stream its progress as server-sent events:
+    a `field` event ({"field", "value"}) for every field it reports while
+    running, a `reset` event when it drops those fields to retry, then
+    `result` with its return value, or `error` with the status code and
+    detail it failed with. The work is cancelled if the client goes away.
+    """
+    on_field = FieldEvents()
+    queue = on_field.queue
+
+    async def events() -> AsyncIterator[str]:
+        task = asyncio.create_task(work(on_field))
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+        try:
+            while (event := await queue.get()) is not None:
+                yield event
+
+            try:
+                yield format_sse("result", task.result())
+            except HTTPException as e:
+                yield format_sse("error", {"status_code": e.status_code, "detail": e.detail})
+            except Exception as e:
+                print(f"Streamed request failed: {str(e)}")
+                yield format_sse("error", {"status_code": 500, "detail": "Processing failed. Please try again."})
+        finally:
+            if not task.done():
+                task.cancel()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Stop proxies buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,78 @@
+from typing import List, Optional, Tuple
+from fastapi import UploadFile, HTTPException
+from decouple import config
+
+# Largest document upload accepted (CVs and job descriptions)
+MAX_UPLOAD_BYTES = config('MAX_UPLOAD_MB', default=10, cast=int) * 1024 * 1024
+UPLOAD_CHUNK_BYTES = 64 * 1024
+
+PDF_CONTENT_TYPE = 'application/pdf'
+DOC_CONTENT_TYPE = 'application/msword'
+DOCX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+TEXT_CONTENT_TYPE = 'text/plain'
+DOCUMENT_UPLOAD_TYPES = [PDF_CONTENT_TYPE, TEXT_CONTENT_TYPE, DOC_CONTENT_TYPE, DOCX_CONTENT_TYPE]
+
+UNSUPPORTED_TYPE_DETAIL = "Unsupported file type. Please upload PDF, DOC, DOCX, or TXT files."
+
+
+def sniff_content_type(head: bytes) -> Optional[str]:
+    """Content type from the first bytes of a file, None if it isn't a supported document"""
+    if head.startswith(b'%PDF-'):
+        return PDF_CONTENT_TYPE
+    if head.startswith(b'PK\x03\x04'):
+        # Office Open XML is a zip, python-docx reads it whichever Word type the client sent
+        return DOCX_CONTENT_TYPE
+    if head.startswith(b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'):
+        return DOC_CONTENT_TYPE
+    if b'\x00' not in head:
+        # The chunk boundary may split a multi-byte character
+        for cut in range(4):
+            try:
+                head[:len(head) - cut].decode('utf-8')
+                return TEXT_CONTENT_TYPE
+            except UnicodeDecodeError:
+                continue
+    return None
+
+
+async def read_upload(
+    file: UploadFile,
+    allowed_types: List[str] = DOCUMENT_UPLOAD_TYPES,
+    max_bytes: int = MAX_UPLOAD_BYTES
+) -> Tuple[bytes, str]:
+    """
+    Read an uploaded document in chunks, stopping with a 413 as soon as it
+    goes over max_bytes instead of buffering all of it first. The content
+    type is sniffed from the first bytes rather than trusted from the
+    client. Returns (content, content_type).
+
+    Oversized request bodies are normally turned away earlier by
+    UploadSizeLimitMiddleware, this is the per-file check.
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise _too_large(max_bytes)
+
+    head = await file.read(UPLOAD_CHUNK_BYTES)
+    if not head:
+        raise HTTPException(status_code=400, detail="Empty file content")
+
+    content_type = sniff_content_type(head)
+    if content_type not in allowed_types:
+        raise HTTPException(status_code=400, detail=UNSUPPORTED_TYPE_DETAIL)
+
+    chunks = [head]
+    size = len(head)
+    while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+        size += len(chunk)
+        if size > max_bytes:
+            raise _too_large(max_bytes)
+        chunks.append(chunk)
+
+    return b''.join(chunks), content_type
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"File too large. Maximum size is {max_bytes // (1024 * 1024)}MB."
+    )
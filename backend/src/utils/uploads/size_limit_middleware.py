@@ -0,0 +1,66 @@
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from utils.uploads.read_upload import MAX_UPLOAD_BYTES
+
+# Room for the multipart boundaries and part headers around the file
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Rejects multipart request bodies over max_body_bytes with a 413 before
+    they are parsed. A declared Content-Length is checked up front; chunked
+    bodies are counted as they stream in and cut off once over the limit,
+    so an oversized upload is never fully received or spooled.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_bytes: int = MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES):
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._is_multipart(scope):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = self._header(scope, b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_body_bytes:
+            await self._reject(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_bytes:
+                    # Surfaces through the form parsing as a 413 response
+                    raise HTTPException(status_code=413, detail=self._detail())
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    @staticmethod
+    def _header(scope: Scope, name: bytes) -> str:
+        for key, value in scope.get("headers", []):
+            if key.lower() == name:
+                return value.decode("latin-1")
+        return ""
+
+    def _is_multipart(self, scope: Scope) -> bool:
+        return self._header(scope, b"content-type").lower().startswith("multipart/form-data")
+
+    def _detail(self) -> str:
+        return f"Request too large. Maximum upload size is {MAX_UPLOAD_BYTES // (1024 * 1024)}MB."
+
+    async def _reject(self, scope: Scope, receive: Receive, send: Send) -> None:
+        response = JSONResponse(
+            status_code=413,
+            content={"detail": self._detail()},
+            headers={"Connection": "close"}
+        )
+        await response(scope, receive, send)
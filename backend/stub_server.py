@@ -0,0 +1,137 @@
+"""
+Local HTTP stub server for the script-style tests.
+
+A ThreadingHTTPServer on a free port that answers every request with the
+StubResponse a test callback returns for it, plus openai_stub to point the
+shared openai client at one for the duration of a test.
+"""
+import json
+import threading
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field, replace
+from email.message import Message
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+@dataclass
+class StubRequest:
+    method: str
+    path: str
+    headers: Message
+    body: bytes
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+    @property
+    def prompt(self) -> str:
+        """Content of the first message of a chat completion request"""
+        return self.json()["messages"][0]["content"]
+
+
+@dataclass
+class StubResponse:
+    status: int = 200
+    body: Any = b""                 # bytes as is, anything else is sent as JSON
+    headers: Dict[str, str] = field(default_factory=dict)
+    # Streamed response: each chunk is written and flushed, then the connection is closed
+    chunks: Optional[Iterable[bytes]] = None
+
+
+def chat_completion(content: str, **fields) -> StubResponse:
+    """/chat/completions response with one message, fields such as usage are added as is"""
+    return StubResponse(body={"choices": [{"message": {"content": content}}], **fields})
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        self._respond()
+
+    def do_HEAD(self):
+        self._respond()
+
+    def do_POST(self):
+        self._respond()
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        request = StubRequest(self.command, self.path, self.headers, self.rfile.read(length))
+        with self.server.lock:
+            self.server.requests.append(request)
+        response = self.server.respond(request)
+
+        self.send_response(response.status)
+        for name, value in response.headers.items():
+            self.send_header(name, value)
+        if response.chunks is not None:
+            self.send_header("Connection", "close")
+            self.end_headers()
+            for chunk in response.chunks:
+                self.wfile.write(chunk)
+                self.wfile.flush()
+            self.close_connection = True
+            return
+
+        payload = response.body if isinstance(response.body, bytes) else json.dumps(response.body).encode()
+        if "Content-Type" not in response.headers:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    Stub server on 127.0.0.1 and a free port, serving from a background
+    thread while used as a context manager. Records the requests it got and
+    counts the TCP connections it accepted.
+    """
+
+    def __init__(self, respond: Callable[[StubRequest], StubResponse], request_queue_size: int = 5):
+        # Bursts of connects beyond the listen backlog get reset
+        self.request_queue_size = request_queue_size
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.respond = respond
+        self.lock = threading.Lock()
+        self.requests = []
+        self.connections = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+
+@asynccontextmanager
+async def openai_stub(respond: Callable[[StubRequest], StubResponse]):
+    """Point the shared openai client at a StubServer, whatever other tests configured"""
+    from services.http_clients import http_clients
+
+    configs = http_clients.configs
+    with StubServer(respond) as server:
+        await http_clients.close()
+        http_clients.configs = {**configs, "openai": replace(configs["openai"], base_url=f"{server.url}/v1")}
+        try:
+            yield server
+        finally:
+            await http_clients.close()
+            http_clients.configs = configs
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Long transcript grading test.
+
+Grades synthetic interview transcripts against a local stub of
+/chat/completions which scores each transcript segment by its part number
+and answers after a random delay. Checks that long transcripts are split
+into overlapping segments covering every turn, that no more than
+GRADING_MAX_PARALLEL_SEGMENTS segments are graded at a time, that the
+merged scores do not depend on the order the segments finish in, and that
+short transcripts are still graded with a single call.
+"""
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+import services.grading_service as grading
+from config.grading_prompts import get_grading_prompt
+from models.interviews.interview_types import InterviewType
+from stub_server import StubRequest, StubResponse, chat_completion, openai_stub
+
+INTERVIEW_TYPE = InterviewType.TECHNICAL_SCREENING_CALL
+SEGMENT_TOKENS = 500
+MAX_PARALLEL_SEGMENTS = 2
+
+stub_state = {"in_flight": 0, "max_in_flight": 0}
+stub_lock = threading.Lock()
+
+INTERVIEW = {
+    "interview_type": INTERVIEW_TYPE.value,
+    "role_title": "Backend Engineer",
+    "company": "Northwind",
+    "difficulty": "senior",
+    "job_description": {"requirements": ["Python", "Distributed systems"]}
+}
+
+
+def synthetic_transcript(questions: int) -> list:
+    transcript = []
+    for index in range(questions):
+        transcript.append({"role": "agent", "message": f"Question {index}: how would you design service {index}?"})
+        transcript.append({"role": "user", "message": f"Answer {index}: " + "I would split it into queues and workers. " * 8})
+    return transcript
+
+
+def part_score(part: int) -> int:
+    return 50 + (part * 7) % 50
+
+
+def segment_feedback(part: int) -> dict:
+    """Feedback the stub returns for part N of a transcript (part 1 for a whole one)"""
+    return {
+        "overall_score": part_score(part),
+        "rubric_scores": {key: part_score(part) - 10 for key in get_grading_prompt(INTERVIEW_TYPE).rubric_keys},
+        "strengths": [f"Clear answer in part {part}", "Structured thinking"],
+        "improvement_areas": [f"More depth in part {part}"],
+        "detailed_feedback": f"Feedback for part {part}."
+    }
+
+
+def respond(request: StubRequest) -> StubResponse:
+    """/chat/completions stub scoring each segment by its part number"""
+    with stub_lock:
+        stub_state["in_flight"] += 1
+        stub_state["max_in_flight"] = max(stub_state["max_in_flight"], stub_state["in_flight"])
+    time.sleep(random.uniform(0.05, 0.25))
+    with stub_lock:
+        stub_state["in_flight"] -= 1
+
+    part = re.search(r"\[Part (\d+) of \d+", request.prompt)
+    return chat_completion(json.dumps(segment_feedback(int(part.group(1)) if part else 1)),
+                           usage={"prompt_tokens": 10})
+
+
+def test_split_transcript_overlaps_and_covers_every_turn():
+    turns = grading.grading_service._format_turns(synthetic_transcript(30))
+    segments = grading.split_transcript(turns, SEGMENT_TOKENS, 2)
+    assert len(segments) > 1
+    assert all(grading._estimate_tokens(segment) <= SEGMENT_TOKENS + len(segment.split("\n")) for segment in segments)
+    for previous, segment in zip(segments, segments[1:]):
+        assert segment.split("\n")[:2] == previous.split("\n")[-2:]
+    covered = {turn for segment in segments for turn in segment.split("\n")}
+    assert covered == set(turns)
+    # A turn longer than a segment still gets graded, and the split still moves forward
+    assert grading.split_transcript(["USER: " + "x" * 4000, "AGENT: ok"], 100, 2) == ["USER: " + "x" * 4000, "AGENT: ok"]
+
+
+def test_merge_segment_feedback_is_weighted_and_ordered():
+    rubric_keys = ("communication", "technical_depth")
+    merged = grading.merge_segment_feedback([
+        {"overall_score": 60, "rubric_scores": {"communication": 50, "technical_depth": 200},
+         "strengths": ["Clear", "Calm"], "improvement_areas": ["Depth"], "detailed_feedback": "First."},
+        {"overall_score": 90, "rubric_scores": {"communication": 80},
+         "strengths": ["clear", "Examples"], "improvement_areas": [], "detailed_feedback": "Second."}
+    ], [100, 300], rubric_keys)
+    # Invalid and missing scores are left out of the mean, and out of the result when no segment has one
+    assert merged["overall_score"] == round((60 * 100 + 90 * 300) / 400)
+    assert merged["rubric_scores"] == {"communication": round((50 * 100 + 80 * 300) / 400)}
+    assert merged["strengths"] == ["Clear", "Calm", "Examples"]
+    assert merged["improvement_areas"] == ["Depth"]
+    assert merged["detailed_feedback"] == "First.\n\nSecond."
+
+
+async def grade(service: grading.InterviewGradingService, transcript: list) -> dict:
+    async def get_attempt_data(req, attempt_id):
+        return {"interview_id": "interview", "transcript": transcript}
+
+    async def get_interview_data(req, interview_id):
+        return INTERVIEW
+
+    async def save_feedback(*args):
+        pass
+
+    # Attempt and interview come from the test instead of MongoDB
+    service._get_attempt_data = get_attempt_data
+    service._get_interview_data = get_interview_data
+    service._save_feedback = save_feedback
+    return await service.grade_interview(None, "attempt", fallback_on_error=False)
+
+
+async def run():
+    service = grading.InterviewGradingService()
+    long_transcript = synthetic_transcript(30)
+    segments = grading.split_transcript(service._format_turns(long_transcript), SEGMENT_TOKENS, 2)
+    async with openai_stub(respond) as server:
+        results = []
+        for _ in range(3):
+            before = len(server.requests)
+            stub_state.update(max_in_flight=0)
+            results.append(await grade(service, long_transcript))
+            assert len(server.requests) - before == len(segments), stub_state
+            assert 1 < stub_state["max_in_flight"] <= MAX_PARALLEL_SEGMENTS, stub_state
+        assert results[0] == results[1] == results[2]
+
+        # Mean of the part scores weighted by segment length
+        weights = [grading._estimate_tokens(segment) for segment in segments]
+        expected = round(sum(part_score(part) * weight for part, weight in enumerate(weights, 1)) / sum(weights))
+        feedback = results[0]
+        assert feedback["overall_score"] == expected, (feedback["overall_score"], expected)
+        assert set(feedback["rubric_scores"]) == set(get_grading_prompt(INTERVIEW_TYPE).rubric_keys)
+        assert feedback["strengths"][:2] == ["Clear answer in part 1", "Clear answer in part 2"]
+        assert len(feedback["strengths"]) == grading.MERGED_FEEDBACK_ITEMS
+        assert feedback["detailed_feedback"].startswith("Feedback for part 1.")
+        print(f"{len(long_transcript)} turns -> {len(segments)} segments, "
+              f"at most {MAX_PARALLEL_SEGMENTS} at a time, overall score {feedback['overall_score']}")
+
+        before = len(server.requests)
+        feedback = await grade(service, synthetic_transcript(2))
+        assert len(server.requests) - before == 1
+        assert feedback["overall_score"] == part_score(1)
+
+
+def test_long_transcripts_are_graded_in_segments():
+    settings = (grading.GRADING_SEGMENT_TOKENS, grading.GRADING_MAX_PARALLEL_SEGMENTS, grading.OPENAI_API_KEY)
+    grading.GRADING_SEGMENT_TOKENS = SEGMENT_TOKENS
+    grading.GRADING_MAX_PARALLEL_SEGMENTS = MAX_PARALLEL_SEGMENTS
+    grading.OPENAI_API_KEY = grading.OPENAI_API_KEY or "test-key"
+    try:
+        asyncio.run(run())
+    finally:
+        grading.GRADING_SEGMENT_TOKENS, grading.GRADING_MAX_PARALLEL_SEGMENTS, grading.OPENAI_API_KEY = settings
+
+
+if __name__ == "__main__":
+    test_split_transcript_overlaps_and_covers_every_turn()
+    test_merge_segment_feedback_is_weighted_and_ordered()
+    test_long_transcripts_are_graded_in_segments()
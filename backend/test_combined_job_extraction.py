@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Combined job extraction test.
+
+Replays a small fixture corpus of job postings through a local stub of
+/chat/completions in two modes:
+- split: the extraction response has no interview_process, so the title is
+  cleaned and the interview process detected with calls of their own
+  (previous behaviour)
+- combined: the extraction response carries the cleaned title and the
+  interview process
+and checks that both give the same title and interview stages, with one
+OpenAI call per posting in combined mode unless the combined response does
+not match the schema, in which case the split calls are used.
+"""
+import asyncio
+import json
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from services.interview_stage_service import InterviewStageService
+from services.job_processing_service import JobProcessingService
+from stub_server import StubRequest, StubResponse, chat_completion, openai_stub
+
+FIXTURES = {
+    "explicit": {
+        "text": "Senior Backend Engineer at Northwind. Our interview process: recruiter phone screen, "
+                "technical interview, system design interview and a final round with the CTO.",
+        "raw_title": "Senior Backend Engineer",
+        "title": "Senior Backend Engineer",
+        "experience_level": "senior",
+        "interview_process": {
+            "detected_stages": ["phone screen", "technical interview", "system design", "final round"],
+            "confidence_score": 0.9,
+            "raw_text": "recruiter phone screen, technical interview, system design interview and a final round",
+            "detection_method": "explicit",
+            "process_details": {"total_rounds": 4, "estimated_duration": "", "special_requirements": []}
+        }
+    },
+    "promotional_title": {
+        "text": "Data Engineer | Top-Tier Fintech (£70K-£90K + Equity, Remote). "
+                "Process: recruiter call, take-home coding assignment, onsite technical interview.",
+        "raw_title": "Data Engineer | Top-Tier Fintech (£70K-£90K + Equity, Remote)",
+        "title": "Data Engineer",
+        "experience_level": "mid",
+        "interview_process": {
+            "detected_stages": ["recruiter call", "take-home assignment", "technical interview"],
+            "confidence_score": 0.85,
+            "raw_text": "recruiter call, take-home coding assignment, onsite technical interview",
+            "detection_method": "explicit",
+            "process_details": {}
+        }
+    },
+    "no_process": {
+        "text": "Account Executive at Contoso. Sell our platform to mid-market customers.",
+        "raw_title": "Account Executive",
+        "title": "Account Executive",
+        "experience_level": "mid",
+        "interview_process": {
+            "detected_stages": [],
+            "confidence_score": 0.1,
+            "raw_text": "",
+            "detection_method": "none",
+            "process_details": {}
+        }
+    },
+    "malformed_combined": {
+        "text": "Product Designer at Fabrikam. You'll have a portfolio review and a design challenge.",
+        "raw_title": "Product Designer",
+        "title": "Product Designer",
+        "experience_level": "mid",
+        "interview_process": {
+            "detected_stages": ["portfolio review", "design challenge"],
+            "confidence_score": 0.8,
+            "raw_text": "a portfolio review and a design challenge",
+            "detection_method": "explicit",
+            "process_details": {}
+        },
+        # The model returned a string instead of a list of stages
+        "combined_interview_process": {
+            "detected_stages": "portfolio review, design challenge",
+            "confidence_score": "high",
+            "detection_method": "explicit"
+        }
+    }
+}
+
+stub_state = {"mode": "split"}
+
+
+def fixture_for(prompt: str) -> dict:
+    if prompt.startswith("Clean this job title"):
+        return next(fixture for fixture in FIXTURES.values() if f'Job Title: "{fixture["raw_title"]}"' in prompt)
+    return next(fixture for fixture in FIXTURES.values() if fixture["text"][:40] in prompt)
+
+
+def respond(request: StubRequest) -> StubResponse:
+    """/chat/completions stub answering from the fixture corpus"""
+    prompt = request.prompt
+    fixture = fixture_for(prompt)
+
+    if prompt.startswith("Clean this job title"):
+        return chat_completion(fixture["title"])
+    if "detect specific interview stages" in prompt:
+        return chat_completion(json.dumps(fixture["interview_process"]))
+    job = {
+        "company": "Fixture Co",
+        "role_title": fixture["raw_title"],
+        "experience_level": fixture["experience_level"],
+        "job_description": {"summary": fixture["text"]}
+    }
+    if stub_state["mode"] == "combined":
+        job["role_title"] = fixture["title"]
+        job["interview_process"] = fixture.get("combined_interview_process", fixture["interview_process"])
+    return chat_completion(json.dumps(job))
+
+
+async def ingest(server, job_processor: JobProcessingService, name: str, fixture: dict) -> tuple:
+    """Title, stages and OpenAI calls for one posting, as the job pipeline runs them"""
+    before = len(server.requests)
+    job_data = await job_processor.process_job_url(
+        f"https://jobs.example.com/{name}", {"content": fixture["text"]}
+    )
+    raw_job_content = job_data.get("jd_raw", "") + "\n" + str(job_data.get("job_description", {}))
+    stages, _ = await InterviewStageService.determine_interview_stages_with_ai(
+        job_data=job_data,
+        job_processor=job_processor,
+        raw_job_content=raw_job_content
+    )
+    return job_data["role_title"], stages, len(server.requests) - before
+
+
+async def run():
+    job_processor = JobProcessingService()
+    async with openai_stub(respond) as server:
+        for name, fixture in FIXTURES.items():
+            stub_state["mode"] = "split"
+            split_title, split_stages, split_calls = await ingest(server, job_processor, name, fixture)
+            stub_state["mode"] = "combined"
+            combined_title, combined_stages, combined_calls = await ingest(server, job_processor, name, fixture)
+
+            assert combined_title == split_title == fixture["title"], (name, split_title, combined_title)
+            assert combined_stages == split_stages, (name, split_stages, combined_stages)
+            expected_calls = 2 if "combined_interview_process" in fixture else 1
+            assert combined_calls == expected_calls, (name, combined_calls)
+            assert split_calls > combined_calls or expected_calls == 2, (name, split_calls)
+            print(f"{name:<20} stages {[stage.value for stage in combined_stages]} "
+                  f"OpenAI calls {split_calls} -> {combined_calls}")
+
+
+def test_combined_extraction_matches_split_calls():
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_combined_extraction_matches_split_calls()
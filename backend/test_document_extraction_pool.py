@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Crash recovery test for the document extraction process pool.
+
+Crashes a worker mid-extraction and checks that the pool is replaced and
+keeps serving, and that a waiter on the crashed pool shutting it down late
+leaves the replacement alone.
+"""
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from services.document_extraction import DocumentExtractionPool
+
+
+async def run():
+    pool = DocumentExtractionPool(workers=1, max_queue=2)
+    try:
+        # A worker exiting mid-parse breaks the pool, the extraction fails
+        pool.start()
+        crashed = pool._executor
+        try:
+            await pool.run(os._exit, 1)
+            raise AssertionError("The crashed extraction should have failed")
+        except Exception as e:
+            assert "crashed" in str(e), e
+        assert pool._executor is None
+
+        # The next extraction starts a replacement pool
+        assert await pool.run(abs, -3) == 3
+        replacement = pool._executor
+        assert replacement is not None and replacement is not crashed
+
+        # Another waiter on the crashed pool only now gets its BrokenProcessPool
+        pool.stop(crashed)
+        assert pool._executor is replacement
+        assert await pool.run(abs, -4) == 4
+        assert pool.metrics["failed"] == 1 and pool.metrics["completed"] == 2
+    finally:
+        pool.stop()
+
+
+def test_crashed_pool_is_replaced_once():
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_crashed_pool_is_replaced_once()
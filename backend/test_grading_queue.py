@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Test for the background grading queue against a local mock of the
+OpenAI chat completions endpoint.
+
+The mock answers by transcript content:
+- FLAKY: fails twice with a 500, then returns a grade
+- BROKEN: always fails with a 500
+- SLOW: takes several lease lengths to return a grade, the worker must
+  keep its lease so no other worker grades the attempt again
+
+Also checks that a worker whose lease expired can't change the job once
+another worker claimed it.
+
+Requires a reachable MongoDB in CONNECTION_STRING_DB. Everything is written
+to a throwaway database which is dropped at the end.
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+from types import SimpleNamespace
+from datetime import timezone, datetime
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+import pytest
+from decouple import config
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from services.grading_queue import GradingQueue
+from crud.interviews.attempts import get_attempt_feedback, get_attempt
+from crud.interviews.grading_jobs import (
+    get_grading_job, enqueue_grading_job, claim_grading_job,
+    complete_grading_job, retry_grading_job, dead_letter_grading_job
+)
+from stub_server import StubRequest, StubResponse, chat_completion, openai_stub
+
+CONNECTION_STRING_DB = config("CONNECTION_STRING_DB", cast=str)
+TEST_DB_NAME = "test_grading_queue"
+MOCK_SCORE = 87
+LEASE_SECONDS = 1
+SLOW_SECONDS = 3 * LEASE_SECONDS
+
+mock_calls = {"FLAKY": 0, "BROKEN": 0, "SLOW": 0}
+
+
+def respond(request: StubRequest) -> StubResponse:
+    """Minimal /v1/chat/completions returning a fixed grade"""
+    marker = next((marker for marker in ("FLAKY", "SLOW") if marker in request.prompt), "BROKEN")
+    mock_calls[marker] += 1
+    if marker == "SLOW":
+        time.sleep(SLOW_SECONDS)
+
+    if marker == "BROKEN" or (marker == "FLAKY" and mock_calls[marker] <= 2):
+        return StubResponse(status=500)
+
+    return chat_completion(json.dumps({
+        "overall_score": MOCK_SCORE,
+        "strengths": ["Clear answers"],
+        "improvement_areas": ["More examples"],
+        "detailed_feedback": "Mock feedback",
+        "rubric_scores": {}
+    }))
+
+
+async def seed(db, attempt_id: str, marker: str):
+    now = datetime.now(timezone.utc)
+    await db.interviews.insert_one({
+        "_id": f"interview-{attempt_id}",
+        "user_id": "test-user",
+        "interview_type": "Behavioral Interview",
+        "company": "Test Co",
+        "role_title": "Engineer",
+        "created_at": now,
+        "updated_at": now
+    })
+    await db.interview_attempts.insert_one({
+        "_id": attempt_id,
+        "interview_id": f"interview-{attempt_id}",
+        "user_id": "test-user",
+        "status": "completed",
+        "transcript": [{"role": "user", "message": f"{marker} answer", "time_in_call_secs": 1}],
+        "created_at": now,
+        "updated_at": now
+    })
+
+
+async def wait_for_jobs(req, attempt_ids, timeout: float = 10.0):
+    """Wait until every job reaches done or dead"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        jobs = [await get_grading_job(req, attempt_id) for attempt_id in attempt_ids]
+        if all(job.status in ("done", "dead") for job in jobs):
+            return {job.attempt_id: job for job in jobs}
+        await asyncio.sleep(0.05)
+    raise AssertionError("Grading jobs did not finish in time")
+
+
+async def run_queue_test():
+    client = AsyncIOMotorClient(
+        CONNECTION_STRING_DB, tz_aware=True, tzinfo=timezone.utc,
+        serverSelectionTimeoutMS=2000
+    )
+    try:
+        await client.admin.command("ping")
+    except Exception:
+        client.close()
+        pytest.skip("MongoDB is not reachable")
+
+    db = client[TEST_DB_NAME]
+    app = SimpleNamespace(mongodb=db, mongodb_client=client)
+    req = SimpleNamespace(app=app)
+
+    try:
+        async with openai_stub(respond):
+            queue = GradingQueue(
+                workers=2, max_attempts=3, retry_base_seconds=0.05, poll_seconds=0.05,
+                lease_seconds=LEASE_SECONDS
+            )
+            try:
+                await seed(db, "attempt-flaky", "FLAKY")
+                await seed(db, "attempt-broken", "BROKEN")
+                await seed(db, "attempt-slow", "SLOW")
+                queue.start(app)
+
+                # Duplicate webhook deliveries share one job
+                first = await queue.enqueue(req, "attempt-flaky")
+                second = await queue.enqueue(req, "attempt-flaky")
+                assert first.id == second.id
+                await queue.enqueue(req, "attempt-broken")
+                await queue.enqueue(req, "attempt-slow")
+
+                jobs = await wait_for_jobs(req, ["attempt-flaky", "attempt-broken", "attempt-slow"])
+
+                # Retried with backoff until the mock succeeded
+                assert jobs["attempt-flaky"].status == "done"
+                assert jobs["attempt-flaky"].attempts == 3
+                feedback = await get_attempt_feedback(req, "attempt-flaky")
+                assert feedback.overall_score == MOCK_SCORE
+                assert (await get_attempt(req, "attempt-flaky")).status == "graded"
+
+                # Out of attempts: dead state with fallback feedback saved
+                assert jobs["attempt-broken"].status == "dead"
+                assert jobs["attempt-broken"].attempts == 3
+                assert "HTTPStatusError" in jobs["attempt-broken"].last_error
+                assert mock_calls["BROKEN"] == 3
+                assert await get_attempt_feedback(req, "attempt-broken") is not None
+
+                # Graded once by one worker that renewed its lease
+                assert jobs["attempt-slow"].status == "done"
+                assert jobs["attempt-slow"].attempts == 1
+                assert mock_calls["SLOW"] == 1
+                print("✅ Grading queue: retry, dead-letter and duplicate enqueue behave as expected")
+            finally:
+                await queue.stop()
+
+        # The first worker's lease expires and a second worker claims the job
+        await enqueue_grading_job(req, "attempt-lease")
+        stale = await claim_grading_job(req, lease_seconds=0)
+        current = await claim_grading_job(req, lease_seconds=60)
+        assert stale.attempt_id == current.attempt_id == "attempt-lease"
+        assert stale.lease_id != current.lease_id
+        assert await complete_grading_job(req, stale) is None
+        assert await retry_grading_job(req, stale, "late", 0) is None
+        assert await dead_letter_grading_job(req, stale, "late") is None
+        assert (await get_grading_job(req, "attempt-lease")).status == "running"
+        assert (await complete_grading_job(req, current)).status == "done"
+        print("✅ Grading queue: a worker that lost its lease leaves the job to its new owner")
+    finally:
+        await client.drop_database(TEST_DB_NAME)
+        client.close()
+
+
+def test_grading_queue():
+    asyncio.run(run_queue_test())
+
+
+if __name__ == "__main__":
+    test_grading_queue()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Connection reuse test for the shared HTTP client registry.
+
+Runs a concurrent burst of requests against a local stub server, once with
+a throwaway client per request (how the services used to call out) and once
+through the registry, and counts the TCP connections the stub accepted.
+Also checks that the shared web client never sends a cookie a site set
+during an earlier scrape.
+"""
+import asyncio
+import os
+import sys
+from dataclasses import replace
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+import httpx
+
+from services.http_clients import HttpClientConfigs, HttpClientRegistry, HttpClientConfig
+from stub_server import StubRequest, StubResponse, StubServer
+
+REQUESTS = 200
+MAX_CONNECTIONS = 10
+
+
+async def throwaway_clients(server: StubServer) -> int:
+    before = server.connections
+
+    async def call():
+        async with httpx.AsyncClient(base_url=server.url) as client:
+            (await client.get("/ping")).raise_for_status()
+
+    await asyncio.gather(*[call() for _ in range(REQUESTS)])
+    return server.connections - before
+
+
+async def shared_registry(server: StubServer) -> int:
+    before = server.connections
+    registry = HttpClientRegistry({
+        "stub": HttpClientConfig(
+            base_url=server.url,
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_CONNECTIONS
+        )
+    })
+    registry.open()
+    try:
+        # Two bursts, the second one should only reuse pooled connections
+        for _ in range(2):
+            responses = await asyncio.gather(*[
+                registry.get("stub").get("/ping") for _ in range(REQUESTS)
+            ])
+            assert all(response.status_code == 200 for response in responses)
+    finally:
+        await registry.close()
+    return server.connections - before
+
+
+def test_shared_clients_reuse_connections():
+    # The throwaway burst opens every connection at once, don't reset any of them
+    with StubServer(lambda request: StubResponse(body={"ok": True}), request_queue_size=REQUESTS) as server:
+        before = asyncio.run(throwaway_clients(server))
+        after = asyncio.run(shared_registry(server))
+
+    print(f"Connections for {REQUESTS} concurrent requests: throwaway clients {before}, "
+          f"shared registry {after} (for {REQUESTS * 2} requests)")
+    assert before == REQUESTS
+    assert after <= MAX_CONNECTIONS
+
+
+def set_cookie(request: StubRequest) -> StubResponse:
+    """/login sets a session cookie, /redirect sets one and redirects to /jobs"""
+    if request.path == "/login":
+        return StubResponse(headers={"Set-Cookie": "session=userA; Path=/"})
+    if request.path == "/redirect":
+        return StubResponse(status=302, headers={"Set-Cookie": "session=userB; Path=/", "Location": "/jobs/2"})
+    return StubResponse(body={"ok": True})
+
+
+async def cookies_sent(server: StubServer, client_config: HttpClientConfig) -> list:
+    """Cookie headers of the requests after a site set a cookie"""
+    registry = HttpClientRegistry({"web": client_config})
+    try:
+        (await registry.get("web").get(f"{server.url}/login")).raise_for_status()
+        (await registry.get("web").get(f"{server.url}/jobs/1")).raise_for_status()
+        (await registry.get("web").get(f"{server.url}/redirect")).raise_for_status()
+    finally:
+        await registry.close()
+    return [request.headers.get("Cookie") for request in server.requests[1:]]
+
+
+def test_web_client_sends_no_cookies():
+    with StubServer(set_cookie) as server:
+        assert asyncio.run(cookies_sent(server, HttpClientConfigs["web"])) == [None, None, None]
+    # A client that keeps cookies would have sent them
+    with StubServer(set_cookie) as server:
+        sent = asyncio.run(cookies_sent(server, replace(HttpClientConfigs["web"], store_cookies=True)))
+        assert sent == ["session=userA", "session=userA", "session=userB"], sent
+
+
+if __name__ == "__main__":
+    test_shared_clients_reuse_connections()
+    test_web_client_sends_no_cookies()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Interview stage detection fallback test for the job creation pipeline.
+
+Runs the pipeline against a local stub of /chat/completions and counts how
+often stage detection falls back to the business rules. With a working
+OpenAI every job must use the AI stages; when the API errors every job
+must fall back, and be counted as such instead of failing silently.
+"""
+import asyncio
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from crud.jobs.jobs import JobPipelineContext, JobPipelineMetrics, _run_job_pipeline
+from models.interviews.interview_types import InterviewType
+from stub_server import StubRequest, StubResponse, chat_completion, openai_stub
+
+JOBS = 5
+
+stub_state = {"status": 200}
+
+JOB_DATA = {
+    # No company name, so the Brandfetch stage returns without touching the database
+    "company": "",
+    "role_title": "Backend Engineer",
+    "experience_level": "senior",
+    "jd_raw": "Interview process: recruiter phone screen, technical interview, system design, final round.",
+    "job_description": {"summary": "Build APIs", "tech_stack": ["Python"]}
+}
+
+
+def respond(request: StubRequest) -> StubResponse:
+    """/chat/completions stub answering interview process detection"""
+    if stub_state["status"] != 200:
+        return StubResponse(status=stub_state["status"], body={"error": {"message": "Service unavailable"}})
+    return chat_completion(json.dumps({
+        "detected_stages": ["phone screen", "technical interview", "system design", "final round"],
+        "confidence_score": 0.9,
+        "raw_text": JOB_DATA["jd_raw"],
+        "detection_method": "explicit"
+    }))
+
+
+async def create_jobs() -> list:
+    jobs = []
+    for index in range(JOBS):
+        async with JobPipelineContext(SimpleNamespace()) as pipeline:
+            async def load_job_data(_, index=index):
+                # Distinct content per job so identical calls are not coalesced
+                return {**JOB_DATA, "jd_raw": f"{JOB_DATA['jd_raw']} (posting {index})"}
+            _, job = await _run_job_pipeline(
+                pipeline, load_job_data, use_company_website=False,
+                user_id="test-user", source_type="file"
+            )
+            jobs.append(job)
+    return jobs
+
+
+async def run():
+    async with openai_stub(respond) as server:
+        before = dict(JobPipelineMetrics)
+        jobs = await create_jobs()
+        counts = {key: JobPipelineMetrics[key] - before[key] for key in before}
+        assert counts == {"stage_detection.ai": JOBS, "stage_detection.rules": 0, "stage_detection.ai_failed": 0}, counts
+        assert len(server.requests) == JOBS
+        assert all(InterviewType.SYSTEM_DESIGN_INTERVIEW in job.interview_stages for job in jobs)
+        print(f"OpenAI up: {counts}")
+
+        stub_state["status"] = 503
+        before = dict(JobPipelineMetrics)
+        jobs = await create_jobs()
+        counts = {key: JobPipelineMetrics[key] - before[key] for key in before}
+        assert counts == {"stage_detection.ai": 0, "stage_detection.rules": 0, "stage_detection.ai_failed": JOBS}, counts
+        assert all(job.interview_stages for job in jobs)
+        print(f"OpenAI down: {counts}")
+
+
+def test_stage_detection_fallbacks_are_counted():
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_stage_detection_fallbacks_are_counted()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Request coalescing test for identical concurrent OpenAI calls.
+
+Points the shared openai client at a local stub of /chat/completions that
+counts requests, then fires concurrent bursts of identical and distinct
+calls through the job processing service.
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from services.job_processing_service import JobProcessingService
+from services.http_clients import openai_single_flight
+from stub_server import StubRequest, StubResponse, chat_completion, openai_stub
+
+STUB_DELAY_SECONDS = 0.3
+BURST = 20
+
+
+def respond(request: StubRequest) -> StubResponse:
+    """Slow /chat/completions stub"""
+    time.sleep(STUB_DELAY_SECONDS)
+    prompt = request.prompt
+    if "interview stages" in prompt:
+        return chat_completion(json.dumps({"detected_stages": ["Phone screen"], "confidence_score": 0.9,
+                                           "raw_text": "", "detection_method": "explicit"}))
+    if "website domain" in prompt:
+        return chat_completion("example.com")
+    return chat_completion("Junior Python Developer")
+
+
+async def burst(server, calls) -> tuple[list, int]:
+    before = len(server.requests)
+    results = await asyncio.gather(*[call() for call in calls])
+    return results, len(server.requests) - before
+
+
+async def run():
+    job_processor = JobProcessingService()
+    long_title = "Junior Python Developer – Elite Hedge Fund (up to £100K + Bonus + Hybrid)"
+    async with openai_stub(respond) as server:
+        # Identical concurrent calls share one request per method
+        results, count = await burst(
+            server,
+            [lambda: job_processor._clean_job_name(long_title, "Acme")] * BURST
+            + [lambda: job_processor._company_name_to_domain("Example Holdings")] * BURST
+            + [lambda: job_processor.extract_interview_process("Phone screen then onsite")] * BURST
+        )
+        assert count == 3, count
+        assert results[:BURST] == ["Junior Python Developer"] * BURST
+        assert results[BURST:2 * BURST] == ["example.com"] * BURST
+        assert all(result["detected_stages"] == ["Phone screen"] for result in results[2 * BURST:])
+        # Callers get their own parsed copy of the shared response
+        assert results[2 * BURST] is not results[2 * BURST + 1]
+        print(f"{BURST * 3} identical concurrent calls -> {count} requests")
+
+        # Distinct payloads are never coalesced
+        _, count = await burst(server, [
+            (lambda index=index: job_processor._company_name_to_domain(f"Example {index}"))
+            for index in range(BURST)
+        ])
+        assert count == BURST, count
+        print(f"{BURST} distinct concurrent calls -> {count} requests")
+
+        # Nothing is kept after the call, a later identical call goes out again
+        _, count = await burst(server, [lambda: job_processor._clean_job_name(long_title, "Acme")])
+        assert count == 1, count
+        print(f"Single-flight metrics: {openai_single_flight.metrics}")
+
+
+def test_identical_concurrent_calls_share_one_request():
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_identical_concurrent_calls_share_one_request()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Streaming extraction test.
+
+Replays a recorded-style SSE completion from a local stub of
+/chat/completions, split into small chunks that cut keys, strings and
+numbers mid-token, with a pause after role_title like a long completion
+would have. Checks that company and role_title reach on_field before the
+completion finishes, that the streamed fields match the parsed content,
+that a retried completion resets the fields it already streamed, and that
+field_event_stream turns them into server-sent events.
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from services.cv_processing_service import CVProcessingService
+from services.job_processing_service import JobProcessingService
+from stub_server import StubRequest, StubResponse, openai_stub
+from utils.streaming.partial_json import PartialJsonObject
+from utils.streaming.sse import field_event_stream, reset_fields
+
+CHUNK_CHARS = 7
+# Time the rest of the completion takes after role_title
+TAIL_DELAY_SECONDS = 0.5
+
+JOB_CONTENT = json.dumps({
+    "company": "Acme \"Rockets\" Ltd",
+    "role_title": "Senior Engineer, Backend",
+    "location": "London {hybrid}",
+    "salary_range": "",
+    "job_description": {
+        "summary": "Build the platform\nend to end.",
+        "requirements": ["Python", "FastAPI", "Mongo[DB]"],
+        "team_info": "8 engineers"
+    },
+    "metadata": {"confidence_score": 0.85, "remote": True, "visa": None}
+}, indent=2)
+
+
+def sse_chunks(content: str = JOB_CONTENT):
+    tail_start = JOB_CONTENT.index('"location"')
+    for start in range(0, len(content), CHUNK_CHARS):
+        if start <= tail_start < start + CHUNK_CHARS:
+            time.sleep(TAIL_DELAY_SECONDS)
+        chunk = {"choices": [{"index": 0, "delta": {"content": content[start:start + CHUNK_CHARS]}}]}
+        yield f"data: {json.dumps(chunk)}\n\n".encode()
+    yield b"data: [DONE]\n\n"
+
+
+def respond(request: StubRequest) -> StubResponse:
+    """/chat/completions stub answering stream=True requests with SSE chunks"""
+    assert request.json().get("stream") is True
+    return StubResponse(headers={"Content-Type": "text/event-stream"}, chunks=sse_chunks())
+
+
+def test_partial_json_matches_full_parse():
+    for chunk_chars in (1, 3, CHUNK_CHARS, len(JOB_CONTENT)):
+        parser = PartialJsonObject()
+        fields = []
+        for start in range(0, len(JOB_CONTENT), chunk_chars):
+            fields.extend(parser.feed(JOB_CONTENT[start:start + chunk_chars]))
+        assert parser.done
+        assert dict(fields) == json.loads(JOB_CONTENT), chunk_chars
+        assert [name for name, _ in fields] == list(json.loads(JOB_CONTENT))
+
+
+async def run_streamed_extraction():
+    arrivals = {}
+
+    async def on_field(name, value):
+        arrivals[name] = (time.perf_counter() - start, value)
+
+    async with openai_stub(respond):
+        start = time.perf_counter()
+        job_data = await JobProcessingService()._process_job_with_text("Senior Engineer at Acme", on_field)
+        finished = time.perf_counter() - start
+
+    for name in ("company", "role_title"):
+        assert finished - arrivals[name][0] >= TAIL_DELAY_SECONDS * 0.8, (name, arrivals[name][0], finished)
+    assert {name: value for name, (_, value) in arrivals.items()} == json.loads(JOB_CONTENT)
+    assert job_data["company"] == "Acme \"Rockets\" Ltd"
+    assert job_data["extraction_method"] == "text_processing"
+    print(f"company at {arrivals['company'][0] * 1000:.0f}ms, role_title at "
+          f"{arrivals['role_title'][0] * 1000:.0f}ms, completion at {finished * 1000:.0f}ms")
+
+
+def test_fields_arrive_before_completion_finishes():
+    asyncio.run(run_streamed_extraction())
+
+
+async def run_retried_extraction():
+    events = []
+
+    class RecordingFields:
+        async def __call__(self, name, value):
+            events.append(name)
+
+        async def reset(self):
+            events.append("reset")
+
+    on_field = RecordingFields()
+
+    def respond_cut_off(request: StubRequest) -> StubResponse:
+        """First completion stops after company and role_title, the retry is complete"""
+        content = JOB_CONTENT if len(server.requests) > 1 else JOB_CONTENT[:JOB_CONTENT.index('"location"')]
+        return StubResponse(headers={"Content-Type": "text/event-stream"}, chunks=sse_chunks(content))
+
+    async with openai_stub(respond_cut_off) as server:
+        cv_data = await CVProcessingService()._process_with_text_retry("Senior Engineer at Acme", on_field=on_field)
+
+    assert len(server.requests) == 2
+    assert events == ["company", "role_title", "reset", *json.loads(JOB_CONTENT)], events
+    assert cv_data == json.loads(JOB_CONTENT)
+
+
+def test_retry_resets_streamed_fields():
+    asyncio.run(run_retried_extraction())
+
+
+def test_field_event_stream():
+    app = FastAPI()
+
+    @app.get("/ok")
+    async def ok():
+        async def work(on_field):
+            await on_field("company", "Acme")
+            await on_field("role_title", "Engineer")
+            return {"job": {"company": "Acme"}}
+        return field_event_stream(work)
+
+    @app.get("/fails")
+    async def fails():
+        async def work(on_field):
+            await on_field("company", "Acme")
+            raise HTTPException(status_code=400, detail="No readable content found in the file.")
+        return field_event_stream(work)
+
+    @app.get("/retried")
+    async def retried():
+        async def work(on_field):
+            await on_field("company", "Acem")
+            await reset_fields(on_field)
+            await on_field("company", "Acme")
+            return {"job": {"company": "Acme"}}
+        return field_event_stream(work)
+
+    with TestClient(app) as client:
+        response = client.get("/ok")
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.text == (
+            'event: field\ndata: {"field": "company", "value": "Acme"}\n\n'
+            'event: field\ndata: {"field": "role_title", "value": "Engineer"}\n\n'
+            'event: result\ndata: {"job": {"company": "Acme"}}\n\n'
+        )
+
+        response = client.get("/retried")
+        assert response.text == (
+            'event: field\ndata: {"field": "company", "value": "Acem"}\n\n'
+            'event: reset\ndata: {}\n\n'
+            'event: field\ndata: {"field": "company", "value": "Acme"}\n\n'
+            'event: result\ndata: {"job": {"company": "Acme"}}\n\n'
+        )
+
+        response = client.get("/fails")
+        assert response.text.endswith(
+            'event: error\ndata: {"status_code": 400, "detail": "No readable content found in the file."}\n\n'
+        )
+
+
+if __name__ == "__main__":
+    test_partial_json_matches_full_parse()
+    test_fields_arrive_before_completion_finishes()
+    test_retry_resets_streamed_fields()
+    test_field_event_stream()
+    print("All streaming extraction tests passed")
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Size limit and content sniffing test for document uploads.
+
+Mounts read_upload behind UploadSizeLimitMiddleware on a small app and
+posts uploads over and under the limit, with a declared Content-Length
+and streamed chunked, plus files whose declared type is wrong.
+"""
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from fastapi import FastAPI, UploadFile, File
+from fastapi.testclient import TestClient
+from starlette.middleware import Middleware
+
+from utils.uploads.read_upload import read_upload
+from utils.uploads.size_limit_middleware import UploadSizeLimitMiddleware
+
+MAX_BYTES = 256 * 1024
+BOUNDARY = "test-boundary"
+
+received = {"bytes": 0}
+
+
+class CountingMiddleware:
+    """Counts the body bytes that reach the app behind the size limit"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        async def counting_receive():
+            message = await receive()
+            received["bytes"] += len(message.get("body", b""))
+            return message
+        await self.app(scope, counting_receive if scope["type"] == "http" else receive, send)
+
+
+app = FastAPI(middleware=[
+    Middleware(UploadSizeLimitMiddleware, max_body_bytes=MAX_BYTES + 1024),
+    Middleware(CountingMiddleware)
+])
+
+
+@app.post("/upload")
+async def upload(file: UploadFile = File(...)):
+    content, content_type = await read_upload(file, max_bytes=MAX_BYTES)
+    return {"size": len(content), "content_type": content_type}
+
+
+def multipart_body(content: bytes, declared_type: str) -> bytes:
+    return (
+        f"--{BOUNDARY}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="upload"\r\n'
+        f"Content-Type: {declared_type}\r\n\r\n"
+    ).encode() + content + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+def post(client: TestClient, content: bytes, declared_type: str = "application/pdf", chunked: bool = False):
+    received["bytes"] = 0
+    body = multipart_body(content, declared_type)
+    headers = {"Content-Type": f"multipart/form-data; boundary={BOUNDARY}"}
+    if chunked:
+        # A generator body has no Content-Length, the limit has to be enforced while streaming
+        def chunks():
+            for start in range(0, len(body), 64 * 1024):
+                yield body[start:start + 64 * 1024]
+        return client.post("/upload", content=chunks(), headers=headers)
+    return client.post("/upload", content=body, headers=headers)
+
+
+def test_upload_limits_and_sniffing():
+    client = TestClient(app)
+    pdf = b"%PDF-1.7\n" + b"0" * 1000
+
+    response = post(client, pdf)
+    assert response.status_code == 200, response.text
+    assert response.json() == {"size": len(pdf), "content_type": "application/pdf"}
+
+    # Declared type is ignored in favour of the content
+    response = post(client, b"PK\x03\x04" + b"0" * 100, declared_type="application/octet-stream")
+    assert response.json()["content_type"] == "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+    assert post(client, "Café résumé".encode(), declared_type="application/pdf").json()["content_type"] == "text/plain"
+    assert post(client, b"\x89PNG\r\n\x1a\n\x00\x00").status_code == 400
+    assert post(client, b"").status_code == 400
+
+    oversized = b"%PDF-1.7\n" + b"0" * (4 * 1024 * 1024)
+
+    # Declared Content-Length over the limit: rejected before any body is read
+    response = post(client, oversized)
+    assert response.status_code == 413, response.text
+    assert received["bytes"] == 0
+
+    # Chunked: cut off once the streamed body goes over the limit
+    response = post(client, oversized, chunked=True)
+    assert response.status_code == 413, response.text
+    assert received["bytes"] <= MAX_BYTES + 1024 + 64 * 1024
+
+    # Within the middleware allowance but over the per-file limit
+    response = post(client, b"%PDF-1.7\n" + b"0" * (MAX_BYTES + 10))
+    assert response.status_code == 413, response.text
+    print("Upload limits and sniffing OK")
+
+
+if __name__ == "__main__":
+    test_upload_limits_and_sniffing()